@@ -0,0 +1,92 @@
+"""add packed sensor readings
+
+Revision ID: 5b2e8d41c9a7
+Revises: 8312973d2015
+Create Date: 2026-10-16 09:12:40.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8d41c9a7'
+down_revision: Union[str, None] = '8312973d2015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('packed_sensor_readings',
+    sa.Column('recording_id', sa.Integer(), nullable=False),
+    sa.Column('frame_count', sa.Integer(), nullable=False),
+    sa.Column('hold_ids', sa.JSON(), nullable=False),
+    sa.Column('readings', sa.LargeBinary(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['recording_id'], ['recordings.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('recording_id')
+    )
+    op.create_index(op.f('ix_packed_sensor_readings_id'), 'packed_sensor_readings', ['id'], unique=False)
+
+    _backfill_packed_sensor_readings()
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_packed_sensor_readings_id'), table_name='packed_sensor_readings')
+    op.drop_table('packed_sensor_readings')
+
+
+def _backfill_packed_sensor_readings() -> None:
+    """Pack the existing row-per-reading data, one recording at a time."""
+    connection = op.get_bind()
+    packed_table = sa.table(
+        'packed_sensor_readings',
+        sa.column('recording_id', sa.Integer),
+        sa.column('frame_count', sa.Integer),
+        sa.column('hold_ids', sa.JSON),
+        sa.column('readings', sa.LargeBinary),
+    )
+
+    recording_ids = connection.execute(
+        sa.text('SELECT DISTINCT recording_id FROM sensor_readings WHERE recording_id IS NOT NULL')
+    ).scalars().all()
+
+    for recording_id in recording_ids:
+        rows = connection.execute(
+            sa.text(
+                'SELECT frame_index, hold_id, x, y FROM sensor_readings '
+                'WHERE recording_id = :recording_id ORDER BY frame_index, id'
+            ),
+            {'recording_id': recording_id},
+        ).all()
+
+        frame_indices = np.array([row[0] for row in rows], dtype=np.int64)
+        hold_ids = np.array([row[1] for row in rows], dtype=np.int64)
+        xy = np.array([(row[2], row[3]) for row in rows], dtype=np.float32)
+
+        # Holds keep the order they are first seen in, matching the DAO's packing
+        unique_hold_ids, first_seen, hold_columns = np.unique(
+            hold_ids, return_index=True, return_inverse=True
+        )
+        column_order = np.argsort(first_seen)
+        column_rank = np.empty_like(column_order)
+        column_rank[column_order] = np.arange(len(column_order))
+
+        # Frames are stored densely, so renumber any gaps in frame_index
+        unique_frames, frame_rows = np.unique(frame_indices, return_inverse=True)
+
+        readings = np.full((len(unique_frames), len(unique_hold_ids), 2), np.nan, dtype='<f4')
+        readings[frame_rows, column_rank[hold_columns]] = xy
+
+        connection.execute(
+            packed_table.insert().values(
+                recording_id=recording_id,
+                frame_count=len(unique_frames),
+                hold_ids=[int(hold_id) for hold_id in unique_hold_ids[column_order]],
+                readings=readings.tobytes(),
+            )
+        )
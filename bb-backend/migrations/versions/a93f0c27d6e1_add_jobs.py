@@ -0,0 +1,63 @@
+"""add jobs
+
+Revision ID: a93f0c27d6e1
+Revises: e41a6b5d2c08
+Create Date: 2026-10-16 15:36:52.918344
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93f0c27d6e1'
+down_revision: Union[str, None] = 'e41a6b5d2c08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Postgres before 12 cannot add enum values inside a transaction
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE recording_status ADD VALUE IF NOT EXISTS 'processing' AFTER 'recording'")
+
+    op.create_table('jobs',
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.Enum('queued', 'running', 'completed', 'failed', name='job_status'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('recording_id', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['recording_id'], ['recordings.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_jobs_id'), 'jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_jobs_recording_id'), 'jobs', ['recording_id'], unique=False)
+    op.create_index('ix_jobs_status_run_after', 'jobs', ['status', 'run_after'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_status_run_after', table_name='jobs')
+    op.drop_index(op.f('ix_jobs_recording_id'), table_name='jobs')
+    op.drop_index(op.f('ix_jobs_id'), table_name='jobs')
+    op.drop_table('jobs')
+    op.execute("DROP TYPE job_status")
+
+    # Enum values cannot be dropped, so recreate the type without 'processing'
+    op.execute("UPDATE recordings SET status = 'failed' WHERE status = 'processing'")
+    op.execute("ALTER TYPE recording_status RENAME TO recording_status_old")
+    op.execute("CREATE TYPE recording_status AS ENUM ('recording', 'completed', 'failed')")
+    op.execute("ALTER TABLE recordings ALTER COLUMN status DROP DEFAULT")
+    op.execute(
+        "ALTER TABLE recordings ALTER COLUMN status TYPE recording_status "
+        "USING status::text::recording_status"
+    )
+    op.execute("ALTER TABLE recordings ALTER COLUMN status SET DEFAULT 'recording'")
+    op.execute("DROP TYPE recording_status_old")
@@ -0,0 +1,81 @@
+"""pack hold masks
+
+Revision ID: b8e2d4f61a93
+Revises: f5c1e8a3b27d
+Create Date: 2026-10-16 18:41:27.905316
+
+"""
+import json
+import struct
+from typing import Sequence, Union
+import zlib
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2d4f61a93'
+down_revision: Union[str, None] = 'f5c1e8a3b27d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Version byte, uint32 height and width, then the mask's bits, matching `encoding.encode_mask`
+_MASK_FORMAT_VERSION = 1
+_MASK_HEADER = struct.Struct('<BII')
+_ZLIB_FIRST_BYTE = 0x78
+
+
+def upgrade() -> None:
+    _convert_masks(_pack_mask)
+
+
+def downgrade() -> None:
+    _convert_masks(_unpack_mask)
+
+
+def _pack_mask(mask_bytes: bytes) -> bytes:
+    """zlib compressed JSON lists to the binary mask format."""
+    if mask_bytes[0] != _ZLIB_FIRST_BYTE:
+        return mask_bytes
+    mask = np.array(json.loads(zlib.decompress(mask_bytes)), dtype=bool)
+    if mask.size == 0:
+        mask = mask.reshape(0, 0)
+    return _MASK_HEADER.pack(_MASK_FORMAT_VERSION, *mask.shape) + np.packbits(mask, axis=None).tobytes()
+
+
+def _unpack_mask(mask_bytes: bytes) -> bytes:
+    """The binary mask format to zlib compressed JSON lists."""
+    if mask_bytes[0] == _ZLIB_FIRST_BYTE:
+        return mask_bytes
+    _, height, width = _MASK_HEADER.unpack_from(mask_bytes)
+    bits = np.frombuffer(mask_bytes, dtype=np.uint8, offset=_MASK_HEADER.size)
+    mask = np.unpackbits(bits, count=height * width).reshape(height, width)
+    return zlib.compress(json.dumps(mask.tolist()).encode('utf-8'))
+
+
+def _convert_masks(convert) -> None:
+    """Re-encode every stored hold mask, one hold at a time."""
+    connection = op.get_bind()
+    hold_table = sa.table(
+        'holds',
+        sa.column('id', sa.Integer),
+        sa.column('mask', sa.LargeBinary),
+    )
+
+    hold_ids = connection.execute(
+        sa.select(hold_table.c.id).where(hold_table.c.mask.isnot(None))
+    ).scalars().all()
+
+    for hold_id in hold_ids:
+        mask_bytes = connection.execute(
+            sa.select(hold_table.c.mask).where(hold_table.c.id == hold_id)
+        ).scalar()
+        if not mask_bytes:
+            continue
+        connection.execute(
+            hold_table.update()
+                .where(hold_table.c.id == hold_id)
+                .values(mask=convert(bytes(mask_bytes)))
+        )
@@ -0,0 +1,77 @@
+"""add analytics rollups
+
+Revision ID: f5c1e8a3b27d
+Revises: a93f0c27d6e1
+Create Date: 2026-10-16 17:12:08.431907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c1e8a3b27d'
+down_revision: Union[str, None] = 'a93f0c27d6e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('recording_metric_summaries',
+    sa.Column('recording_id', sa.Integer(), nullable=False),
+    sa.Column('route_id', sa.Integer(), nullable=False),
+    sa.Column('active_duration', sa.Float(), nullable=False),
+    sa.Column('peak_load', sa.Float(), nullable=False),
+    sa.Column('energy_expenditure', sa.Float(), nullable=False),
+    sa.Column('overall_stability', sa.Float(), nullable=False),
+    sa.Column('hold_usage', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['recording_id'], ['recordings.id'], ),
+    sa.ForeignKeyConstraint(['route_id'], ['routes.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('recording_id')
+    )
+    op.create_index(op.f('ix_recording_metric_summaries_id'), 'recording_metric_summaries', ['id'], unique=False)
+    op.create_index(op.f('ix_recording_metric_summaries_route_id'), 'recording_metric_summaries', ['route_id'], unique=False)
+    op.create_table('route_analytics',
+    sa.Column('route_id', sa.Integer(), nullable=False),
+    sa.Column('attempt_count', sa.Integer(), nullable=False),
+    sa.Column('active_duration_sum', sa.Float(), nullable=False),
+    sa.Column('overall_stability_sum', sa.Float(), nullable=False),
+    sa.Column('peak_load', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['route_id'], ['routes.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('route_id')
+    )
+    op.create_index(op.f('ix_route_analytics_id'), 'route_analytics', ['id'], unique=False)
+    op.create_table('route_hold_analytics',
+    sa.Column('route_id', sa.Integer(), nullable=False),
+    sa.Column('hold_id', sa.Integer(), nullable=False),
+    sa.Column('attempt_count', sa.Integer(), nullable=False),
+    sa.Column('time_on_hold', sa.Float(), nullable=False),
+    sa.Column('load_sum', sa.Float(), nullable=False),
+    sa.Column('load_frames', sa.Integer(), nullable=False),
+    sa.Column('peak_load', sa.Float(), nullable=False),
+    sa.Column('load_histogram', sa.JSON(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['hold_id'], ['holds.id'], ),
+    sa.ForeignKeyConstraint(['route_id'], ['routes.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('route_id', 'hold_id')
+    )
+    op.create_index(op.f('ix_route_hold_analytics_id'), 'route_hold_analytics', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_route_hold_analytics_id'), table_name='route_hold_analytics')
+    op.drop_table('route_hold_analytics')
+    op.drop_index(op.f('ix_route_analytics_id'), table_name='route_analytics')
+    op.drop_table('route_analytics')
+    op.drop_index(op.f('ix_recording_metric_summaries_route_id'), table_name='recording_metric_summaries')
+    op.drop_index(op.f('ix_recording_metric_summaries_id'), table_name='recording_metric_summaries')
+    op.drop_table('recording_metric_summaries')
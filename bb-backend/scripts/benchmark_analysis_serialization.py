@@ -0,0 +1,94 @@
+"""
+Benchmark serializing analysis responses to JSON.
+
+Compares the previous recursive conversion to native Python types followed by Flask's default
+JSON provider with the orjson provider serializing the numpy values directly.
+
+Usage:
+    python scripts/benchmark_analysis_serialization.py
+"""
+import argparse
+import os
+import sys
+import time
+import typing
+
+import flask
+import flask.json.provider
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import betaboard.business.logic.recording_analysis.analysis as analysis
+import betaboard.business.models.recordings as recordings_model
+import betaboard.utils.json_provider as json_provider
+
+
+HOLD_COUNT = 20
+FRAME_RATE = 10
+REPEATS = 5
+
+
+def _convert_to_native_types(obj):
+    """The recursive conversion the analysis results and plots went through before serializing."""
+    if isinstance(obj, dict):
+        return {key: _convert_to_native_types(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [_convert_to_native_types(item) for item in obj]
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif hasattr(obj, 'dtype'):
+        return obj.item()
+    return obj
+
+
+def _make_analysis_response(frame_count: int) -> dict:
+    """Analyze random readings of `frame_count` frames into an analysis response."""
+    rng = np.random.default_rng(0)
+    hold_ids = [str(hold_id) for hold_id in range(1, HOLD_COUNT + 1)]
+    packed_readings = recordings_model.PackedSensorReadingsModel(
+        hold_ids=hold_ids,
+        x=rng.normal(0, 15, (frame_count, HOLD_COUNT)).astype(np.float32),
+        y=rng.normal(-300, 50, (frame_count, HOLD_COUNT)).astype(np.float32),
+    )
+    results = analysis._PIPELINE.run(
+        {
+            'recording': None,
+            'packed_readings': packed_readings,
+            'frame_rate': FRAME_RATE,
+            'hold_numbers': {hold_id: number for number, hold_id in enumerate(hold_ids, start=1)},
+        },
+        ['visualizations', 'key_metrics'],
+    )
+    return {'analysis_results': [results]}
+
+
+def _time(func: typing.Callable[[], typing.Any]) -> float:
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--frames', type=int, nargs='+', default=[600, 3_000, 12_000])
+    args = parser.parse_args()
+
+    app = flask.Flask(__name__)
+    default_provider = flask.json.provider.DefaultJSONProvider(app)
+
+    print(f"{'frames':>8} {'size (MB)':>10} {'before (s)':>11} {'after (s)':>10} {'speedup':>8}")
+    for frame_count in args.frames:
+        response = _make_analysis_response(frame_count)
+
+        before = _time(lambda: default_provider.dumps(_convert_to_native_types(response)))
+        after = _time(lambda: json_provider.dumps(response))
+        size = len(json_provider.dumps(response)) / 1024 ** 2
+        print(f"{frame_count:>8} {size:>10.2f} {before:>11.3f} {after:>10.3f} {before / after:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
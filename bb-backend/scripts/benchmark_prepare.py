@@ -0,0 +1,81 @@
+"""
+Benchmark building the base sensor analysis DataFrame.
+
+Compares the previous row-dict construction with `prepare.prepare_sensor_dataframe`
+fed either sensor reading frames or packed readings.
+
+Usage:
+    python scripts/benchmark_prepare.py
+"""
+import argparse
+import os
+import sys
+import time
+import typing
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import betaboard.business.logic.recording_analysis.prepare as prepare
+import betaboard.business.models.recordings as recordings_model
+
+
+HOLD_COUNT = 20
+FRAME_RATE = 10
+
+
+def _prepare_with_row_dicts(sensor_readings, frame_rate) -> pd.DataFrame:
+    """The row-dict construction `prepare_sensor_dataframe` used before it was vectorized."""
+    data = []
+    for frame_index, frame in enumerate(sensor_readings):
+        for reading in frame:
+            data.append({
+                'frame': frame_index,
+                'time': frame_index / frame_rate,
+                'hold_id': reading.hold_id,
+                'x': reading.x,
+                'y': reading.y,
+                'force_magnitude': np.sqrt(reading.x ** 2 + reading.y ** 2),
+            })
+    df = pd.DataFrame(data)
+    df.fillna(0, inplace=True)
+    return df
+
+
+def _make_readings(reading_count: int) -> recordings_model.PackedSensorReadingsModel:
+    """Generate random packed readings with `reading_count` readings in total."""
+    frame_count = reading_count // HOLD_COUNT
+    rng = np.random.default_rng(0)
+    return recordings_model.PackedSensorReadingsModel(
+        hold_ids=[str(hold_id) for hold_id in range(1, HOLD_COUNT + 1)],
+        x=rng.normal(0, 15, (frame_count, HOLD_COUNT)).astype(np.float32),
+        y=rng.normal(-300, 50, (frame_count, HOLD_COUNT)).astype(np.float32),
+    )
+
+
+def _time(func: typing.Callable[[], pd.DataFrame]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'readings':>10} {'row dicts (s)':>14} {'frames (s)':>11} {'packed (s)':>11}")
+    for reading_count in args.counts:
+        packed_readings = _make_readings(reading_count)
+        frames = packed_readings.to_frames()
+
+        row_dicts = _time(lambda: _prepare_with_row_dicts(frames, FRAME_RATE))
+        from_frames = _time(lambda: prepare.prepare_sensor_dataframe(frames, FRAME_RATE))
+        from_packed = _time(lambda: prepare.prepare_sensor_dataframe(packed_readings, FRAME_RATE))
+        print(f"{reading_count:>10} {row_dicts:>14.3f} {from_frames:>11.3f} {from_packed:>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Check the streaming key metrics against the batch analysis.
+
+Feeds random recordings, with missing readings, frame by frame to `streaming.StreamingMetrics`
+and compares its key metrics with `metrics.compute_key_metrics` over the same readings. The two
+only differ in floating point summation order, so every metric must agree to within the relative
+tolerance.
+
+Usage:
+    python scripts/check_streaming_metrics.py
+"""
+import argparse
+import os
+import sys
+import typing
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import betaboard.business.logic.recording_analysis.metrics as metrics
+import betaboard.business.logic.recording_analysis.prepare as prepare
+import betaboard.business.logic.recording_analysis.streaming as streaming
+import betaboard.business.models.recordings as recordings_model
+
+
+HOLD_COUNT = 20
+FRAME_RATE = 10
+# Fraction of readings missing, as when a hold is not touched
+MISSING_FRACTION = 0.3
+
+
+def _make_packed_readings(frame_count: int, rng: np.random.Generator) -> recordings_model.PackedSensorReadingsModel:
+    """Random packed readings of `frame_count` frames, with missing readings as NaN."""
+    shape = (frame_count, HOLD_COUNT)
+    x = rng.normal(0, 15, shape).astype(np.float32)
+    y = rng.normal(-300, 50, shape).astype(np.float32)
+    missing = rng.random(shape) < MISSING_FRACTION
+    x[missing] = np.nan
+    y[missing] = np.nan
+    return recordings_model.PackedSensorReadingsModel(
+        hold_ids=[str(hold_id) for hold_id in range(1, HOLD_COUNT + 1)],
+        x=x,
+        y=y,
+    )
+
+
+def _relative_differences(batch: dict, streamed: dict) -> typing.Dict[str, float]:
+    """Largest relative difference of each key metric, the per hold loads taken together."""
+    def difference(expected: float, actual: float) -> float:
+        if np.isnan(expected) and np.isnan(actual):
+            return 0.0
+        return abs(actual - expected) / max(abs(expected), np.finfo(np.float64).tiny)
+
+    differences = {
+        name: difference(value, streamed[name])
+        for name, value in batch.items()
+        if name != 'average_load_per_hold'
+    }
+
+    batch_holds = {hold['hold_id']: hold for hold in batch['average_load_per_hold']}
+    streamed_holds = {hold['hold_id']: hold for hold in streamed['average_load_per_hold']}
+    if batch_holds.keys() != streamed_holds.keys() or any(
+        batch_holds[hold_id]['hold_number'] != streamed_holds[hold_id]['hold_number'] for hold_id in batch_holds
+    ):
+        differences['average_load_per_hold'] = float('inf')
+    else:
+        differences['average_load_per_hold'] = max(
+            difference(batch_holds[hold_id]['force_magnitude'], streamed_holds[hold_id]['force_magnitude'])
+            for hold_id in batch_holds
+        )
+    return differences
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--frames', type=int, nargs='+', default=[1, 50, 600, 3_000, 12_000])
+    parser.add_argument('--tolerance', type=float, default=1e-12)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    hold_numbers = {str(hold_id): hold_id for hold_id in range(1, HOLD_COUNT + 1)}
+
+    worst = 0.0
+    print(f"{'frames':>8} {'metric':<24} {'relative difference':>20}")
+    for frame_count in args.frames:
+        packed_readings = _make_packed_readings(frame_count, rng)
+
+        df = prepare.prepare_sensor_dataframe(packed_readings, FRAME_RATE)
+        batch = metrics.compute_key_metrics(df, FRAME_RATE, hold_numbers)
+
+        streamed_metrics = streaming.StreamingMetrics(FRAME_RATE, hold_ids=packed_readings.hold_ids)
+        streamed_metrics.add_packed_readings(packed_readings)
+        streamed = streamed_metrics.key_metrics(hold_numbers)
+
+        for name, difference in _relative_differences(batch, streamed).items():
+            print(f"{frame_count:>8} {name:<24} {difference:>20.3e}")
+            worst = max(worst, difference)
+
+    print(f"Largest relative difference {worst:.3e}, tolerance {args.tolerance:.0e}")
+    if worst > args.tolerance:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,11 +3,14 @@ from flask import Flask, g, jsonify
 import betaboard.db.session_manager as db_session_manager
 import betaboard.utils.config as config_utils
 import betaboard.utils.errors as errors_utils
+import betaboard.utils.json_provider as json_provider
+import betaboard.utils.responses as responses_utils
 import betaboard.services as services
 import flask_cors
 
 def create_app():
     app = Flask(__name__)
+    app.json = json_provider.OrjsonProvider(app)
     app.config.from_object(config_utils.Config)
 
     with app.app_context():
@@ -20,8 +23,7 @@ def create_app():
     from betaboard.routes import blueprints
     for blueprint in blueprints:
         app.register_blueprint(blueprint, url_prefix='/api')
-
-    app.json.mimetype = 'application/json'
+    responses_utils.init_app(app)
 
     # Registering the error handler for ValidationError
     @app.errorhandler(errors_utils.ValidationError)
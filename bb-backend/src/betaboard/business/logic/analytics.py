@@ -0,0 +1,91 @@
+import numpy as np
+
+import betaboard.business.logic.jobs as jobs
+import betaboard.business.logic.recordings as recordings_logic
+import betaboard.business.logic.recording_analysis.comparison as comparison
+import betaboard.business.models.analytics as analytics_model
+import betaboard.business.models.recordings as recordings_model
+import betaboard.db.dao.analytics_dao as analytics_dao
+
+# Hold load histograms count engaged frames in bins of this width, the last bin being open ended
+LOAD_HISTOGRAM_BIN_WIDTH = 50.0  # N
+LOAD_HISTOGRAM_BINS = 20
+
+def summarize_recording(
+    recording: recordings_model.RecordingModel,
+    key_metrics: dict,
+    force_profile: recordings_model.ForceProfileModel,
+) -> analytics_model.RecordingMetricSummaryModel:
+    """
+    Summarizes the metrics of a recording from its key metrics and force profile.
+
+    Hold usage only counts the frames a hold is engaged, as defined by the comparison.
+    """
+    force = force_profile.force.astype(np.float64)
+    engaged = comparison.engaged_frames(force)
+    load_bins = np.minimum(force // LOAD_HISTOGRAM_BIN_WIDTH, LOAD_HISTOGRAM_BINS - 1).astype(np.int64)
+
+    holds = []
+    for column in np.flatnonzero(engaged.any(axis=0)):
+        hold_engaged = engaged[:, column]
+        load = force[hold_engaged, column]
+        holds.append(analytics_model.HoldUsageModel(
+            hold_id=force_profile.hold_ids[column],
+            time_on_hold=float(hold_engaged.sum() / force_profile.frame_rate),
+            load_sum=float(load.sum()),
+            load_frames=int(hold_engaged.sum()),
+            peak_load=float(load.max()),
+            load_histogram=np.bincount(load_bins[hold_engaged, column], minlength=LOAD_HISTOGRAM_BINS).tolist(),
+        ))
+
+    return analytics_model.RecordingMetricSummaryModel(
+        recording_id=recording.id,
+        route_id=recording.route_id,
+        active_duration=key_metrics['active_duration'],
+        peak_load=key_metrics['peak_load'],
+        energy_expenditure=key_metrics['energy_expenditure'],
+        overall_stability=key_metrics['overall_stability'],
+        holds=holds,
+    )
+
+def record_recording_summary(
+    recording: recordings_model.RecordingModel,
+    key_metrics: dict,
+    force_profile: recordings_model.ForceProfileModel,
+) -> bool:
+    """
+    Stores the metric summary of a completed recording and adds it to its route's analytics.
+
+    Returns:
+        bool: False if the recording was already summarized, e.g. by an earlier attempt of a job.
+    """
+    summary = summarize_recording(recording, key_metrics, force_profile)
+    return analytics_dao.AnalyticsDAO.save_recording_summary(summary)
+
+def get_route_analytics(route_id: str) -> analytics_model.AnalyticsModel:
+    """Get the aggregated analytics of every summarized attempt of a route."""
+    return analytics_dao.AnalyticsDAO.get_analytics(LOAD_HISTOGRAM_BIN_WIDTH, route_id=route_id)
+
+def get_wall_analytics(wall_id: str) -> analytics_model.AnalyticsModel:
+    """
+    Get the aggregated analytics of every summarized attempt of every route on a wall.
+
+    Hold usage over the whole wall, e.g. for a heatmap, is merged from the route aggregates.
+    """
+    return analytics_dao.AnalyticsDAO.get_analytics(LOAD_HISTOGRAM_BIN_WIDTH, wall_id=wall_id)
+
+def enqueue_missing_summaries() -> int:
+    """
+    Queues the analysis of every completed recording without a metric summary, which summarizes it.
+
+    Returns:
+        int: Number of recordings queued.
+    """
+    recording_ids = analytics_dao.AnalyticsDAO.get_unsummarized_recording_ids()
+    for recording_id in recording_ids:
+        jobs.enqueue(
+            recordings_logic.PRECOMPUTE_ANALYSIS_JOB,
+            {'recording_id': recording_id},
+            recording_id=recording_id,
+        )
+    return len(recording_ids)
@@ -1,5 +1,7 @@
 import typing
 
+import numpy as np
+
 import betaboard.business.models.holds as holds_model
 import betaboard.db.dao.hold_dao as hold_dao
 import betaboard.services.imaging_service as imaging_service
@@ -8,7 +10,7 @@ import betaboard.services.imaging_service as imaging_service
 def create_hold_from_segment(segment: imaging_service.Segment):
     hold_model = holds_model.HoldModel(
         bbox=segment.bbox,
-        mask=segment.mask,
+        mask=np.asarray(segment.mask, dtype=bool),
     )
     hold_dao.HoldDAO.save_hold(hold_model)
     return hold_model
@@ -0,0 +1,192 @@
+import contextlib
+import dataclasses
+import datetime
+import threading
+import time
+import traceback
+import typing
+
+import betaboard.business.models.jobs as jobs_model
+import betaboard.db.dao.job_dao as job_dao
+
+DEFAULT_MAX_ATTEMPTS = 3
+# Delay before the first retry, doubled for each further attempt
+RETRY_BASE_DELAY = datetime.timedelta(seconds=10)
+# Time after which a running job is assumed abandoned by its worker
+JOB_LEASE = datetime.timedelta(minutes=30)
+# Workers renew the lease of the job they run this often, so long jobs are not claimed again
+LEASE_RENEWAL_INTERVAL = datetime.timedelta(minutes=5)
+POLL_INTERVAL = 2.0  # seconds
+
+@dataclasses.dataclass(frozen=True)
+class _Handler:
+    func: typing.Callable[..., None]
+    max_attempts: int
+    on_failure: typing.Optional[typing.Callable[[jobs_model.JobModel], None]]
+
+_handlers: typing.Dict[str, _Handler] = {}
+
+def register_handler(
+    kind: str,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    on_failure: typing.Optional[typing.Callable[[jobs_model.JobModel], None]] = None,
+):
+    """
+    Registers the decorated function as the handler of a job kind.
+
+    The handler is called with the job payload as keyword arguments. Raising marks the attempt
+    failed, and the job is retried with exponential backoff until it runs out of attempts.
+
+    Args:
+        kind: Name of the job kind.
+        max_attempts: Number of attempts after which a failing job is no longer retried.
+        on_failure: Called with the job once it has failed its last attempt.
+    """
+    def decorator(func):
+        if kind in _handlers:
+            raise ValueError(f"Job handler already registered for {kind}")
+        _handlers[kind] = _Handler(func=func, max_attempts=max_attempts, on_failure=on_failure)
+        return func
+    return decorator
+
+def enqueue(
+    kind: str,
+    payload: dict,
+    recording_id: typing.Optional[str] = None,
+) -> jobs_model.JobModel:
+    """
+    Queues a job for a worker.
+
+    Args:
+        kind: Name of a registered job kind.
+        payload: JSON arguments passed to the handler.
+        recording_id: ID of the recording the job processes, if any.
+
+    Returns:
+        JobModel: The queued job.
+
+    Raises:
+        ValueError: If no handler is registered for the kind.
+    """
+    if kind not in _handlers:
+        raise ValueError(f"No job handler registered for {kind}")
+
+    return job_dao.JobDAO.enqueue_job(
+        kind=kind,
+        payload=payload,
+        max_attempts=_handlers[kind].max_attempts,
+        recording_id=recording_id,
+    )
+
+def get_recording_jobs(recording_id: str) -> typing.List[jobs_model.JobModel]:
+    """Get every job of a recording, oldest first."""
+    return job_dao.JobDAO.get_jobs_by_recording_id(recording_id)
+
+def run_next_job(
+    kinds: typing.Optional[typing.List[str]] = None,
+) -> typing.Optional[jobs_model.JobModel]:
+    """
+    Claims and runs the next due job.
+
+    A job abandoned on its last attempt is marked failed when claimed, and only its failure
+    handler is run.
+
+    Args:
+        kinds: Only run jobs of these kinds, defaults to every registered kind.
+
+    Returns:
+        Optional[JobModel]: The job that was run, or None if no job was due.
+    """
+    job = job_dao.JobDAO.claim_next_job(lease=JOB_LEASE, kinds=kinds or list(_handlers))
+    if job is None:
+        return None
+
+    handler = _handlers[job.kind]
+    if job.status == 'failed':
+        print(f"Job {job.id} ({job.kind}) failed: {job.last_error}")
+        if handler.on_failure is not None:
+            handler.on_failure(job)
+        return job
+
+    try:
+        with _renewing_lease(job):
+            handler.func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        print(f"Job {job.id} ({job.kind}) failed attempt {job.attempts}:\n{error}")
+
+        retry_delay = RETRY_BASE_DELAY * 2 ** (job.attempts - 1)
+        failed_job = job_dao.JobDAO.fail_job(job.id, job.attempts, error, retry_delay)
+        if failed_job is None:
+            print(f"Job {job.id} ({job.kind}) attempt {job.attempts} was claimed again, ignoring its failure")
+            return job
+        if failed_job.status == 'failed' and handler.on_failure is not None:
+            handler.on_failure(failed_job)
+        return failed_job
+
+    if not job_dao.JobDAO.complete_job(job.id, job.attempts):
+        print(f"Job {job.id} ({job.kind}) attempt {job.attempts} was claimed again, ignoring its completion")
+        return job
+    job.status = 'completed'
+    return job
+
+@contextlib.contextmanager
+def _renewing_lease(job: jobs_model.JobModel):
+    """Renews the lease of a running job attempt every LEASE_RENEWAL_INTERVAL until exited."""
+    stopped = threading.Event()
+
+    def renew():
+        while not stopped.wait(LEASE_RENEWAL_INTERVAL.total_seconds()):
+            try:
+                if not job_dao.JobDAO.renew_lease(job.id, job.attempts):
+                    return
+            except Exception:
+                # Retried at the next interval, the lease is much longer
+                print(f"Renewing the lease of job {job.id} failed:\n{traceback.format_exc()}")
+
+    thread = threading.Thread(target=renew, name=f'job-{job.id}-lease', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+def run_pending_jobs(
+    kinds: typing.Optional[typing.List[str]] = None,
+    max_jobs: typing.Optional[int] = None,
+) -> int:
+    """
+    Runs due jobs in the calling process until none are left.
+
+    Intended for tests and local development, where no worker is running. Retries that are not
+    due yet are left queued.
+
+    Args:
+        kinds: Only run jobs of these kinds, defaults to every registered kind.
+        max_jobs: Stop after running this many jobs, defaults to no limit.
+
+    Returns:
+        int: Number of jobs run.
+    """
+    job_count = 0
+    while max_jobs is None or job_count < max_jobs:
+        if run_next_job(kinds) is None:
+            break
+        job_count += 1
+    return job_count
+
+def run_worker(
+    kinds: typing.Optional[typing.List[str]] = None,
+    poll_interval: float = POLL_INTERVAL,
+) -> None:
+    """
+    Runs jobs forever, polling the queue whenever it is empty.
+
+    Args:
+        kinds: Only run jobs of these kinds, defaults to every registered kind.
+        poll_interval: Seconds to wait between polls of an empty queue.
+    """
+    while True:
+        if run_next_job(kinds) is None:
+            time.sleep(poll_interval)
@@ -1,126 +1,471 @@
+import concurrent.futures
+import concurrent.futures.process
+import contextlib
+import dataclasses
+import hashlib
+import multiprocessing
+import multiprocessing.shared_memory
+import threading
+import typing
+
 import flask
+import numpy as np
 
+import betaboard.business.models.kinematics as kinematics_model
 import betaboard.business.models.recordings as recordings_model
-import betaboard.business.models.holds as holds_model
+import betaboard.business.logic.recording_analysis.comparison as comparison
+import betaboard.business.logic.recording_analysis.pipeline as pipeline
 import betaboard.business.logic.recording_analysis.plots as plots
 import betaboard.business.logic.recording_analysis.prepare as prepare
-import betaboard.business.logic.recording_analysis.calculations as calculations
+import betaboard.business.logic.recording_analysis.stored_results as stored_results
+import betaboard.business.logic.recording_analysis.metrics as metrics
 import betaboard.business.logic.recording_analysis.kinematics as kinematics
-import betaboard.business.logic.route as route_logic
+import betaboard.business.logic.recording_analysis.landmarks as landmarks
+import betaboard.business.logic.analytics as analytics
+import betaboard.business.logic.jobs as jobs
+import betaboard.business.logic.recordings as recordings_logic
+import betaboard.db.dao.recording_dao as recording_dao
+
+RESULT_OUTPUTS = ('kinematics', 'visualizations', 'key_metrics')
+# Cross-recording output, computed from the recordings' force profiles
+COMPARISON_OUTPUT = 'comparison'
+ANALYSIS_OUTPUTS = RESULT_OUTPUTS + (COMPARISON_OUTPUT,)
+
+# Bump whenever a change to how stored results are encoded in responses alters them, to
+# invalidate the ETags of cached responses
+RESPONSE_VERSION = 2
+
+# Pipeline products that need the database, S3 or the app config. They are resolved in the
+# calling process, so that the rest of the pipeline can run in worker processes
+_APP_PRODUCTS = ('hold_numbers', 'packed_readings', 'video_path', 'kinematics_workers')
 
-def analyze_recordings(recordings: list[recordings_model.RecordingModel]):
+# Process pool shared by every analysis of the process, created on first use. Its workers are
+# started by a fork server rather than forked from the threaded app and its database connections
+_executor: typing.Optional[concurrent.futures.ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+def analyze_recordings(
+    recordings: list[recordings_model.RecordingModel],
+    outputs: typing.Optional[typing.Iterable[str]] = None,
+    kinematics_format: str = 'dict',
+):
     """
     Analyzes a list of recordings and returns a dictionary with the analysis results.
 
     Args:
         recordings (list[recordings_model.RecordingModel]): A list of recordings to analyze.
+        outputs (Optional[Iterable[str]]): The results to compute, a subset of ANALYSIS_OUTPUTS.
+            Defaults to all of them.
+        kinematics_format (str): Encoding of the kinematics, one of kinematics.KINEMATICS_FORMATS.
 
     Returns:
         dict: A dictionary with the analysis results.
     """
+    outputs = list(ANALYSIS_OUTPUTS if outputs is None else outputs)
+    unknown_outputs = set(outputs) - set(ANALYSIS_OUTPUTS)
+    if unknown_outputs:
+        raise ValueError(f"Unknown analysis outputs: {sorted(unknown_outputs)}")
+    if kinematics_format not in kinematics.KINEMATICS_FORMATS:
+        raise ValueError(f"Unknown kinematics format: {kinematics_format}")
+
+    recording_outputs = [output for output in outputs if output in RESULT_OUTPUTS]
+    compare = COMPARISON_OUTPUT in outputs and len(recordings) > 1
+    if compare:
+        recording_outputs.append('force_profile')
+
     analysis_results = {
-        'recordings': [],
+        'recordings': _get_recording_analyses(recordings, recording_outputs, kinematics_format),
+        'comparison': None,
     }
-    
-    # Perform analysis for each recording
-    for recording in recordings:
-        recording_result = _analyze_single_recording(recording)
-        analysis_results['recordings'].append(recording_result)
-    
-    # TODO: Perform cross-recording analyses and populate 'comparison' field
 
-    # Then before returning analysis_results:
-    analysis_results = _convert_to_native_types(analysis_results)
+    if compare:
+        profiles = [results.pop('force_profile') for results in analysis_results['recordings']]
+        analysis_results['comparison'] = _compare_recordings(recordings, profiles)
+
     return analysis_results
 
-def _analyze_single_recording(recording: recordings_model.RecordingModel):
-    # Get route and holds
-    route = route_logic.get_route(recording.route_id)
-    holds = route.holds
-    hold_numbers = _get_hold_numbers(holds)
-    
-    # Prepare sensor readings
-    frame_rate = 10  # Hz
-    sensor_readings = recording.sensor_readings
-    if not sensor_readings:
-        raise ValueError(f"No sensor data for recording ID {recording.id}")
-    
-    # Base DataFrame
-    base_df = prepare.prepare_sensor_dataframe(sensor_readings, frame_rate)
-    base_df['hold_number'] = base_df['hold_id'].astype(str).map(hold_numbers)
-    
-    # Compute key metrics using existing functions
-    key_metrics = {
-        'active_duration': calculations.calculate_active_duration(base_df, frame_rate),
-        'energy_expenditure': calculations.calculate_energy_expenditure(base_df, frame_rate),
-        'energy_expenditure_rate': calculations.calculate_energy_expenditure_rate(base_df, frame_rate),
-        'peak_load': calculations.calculate_peak_load(base_df),
-        'peak_load_rate': calculations.calculate_peak_load_rate(base_df, frame_rate),
-        'average_load_per_hold': calculations.calculate_average_load_per_hold(base_df, hold_numbers),
-        'overall_stability': calculations.calculate_overall_stability(base_df, frame_rate),
+def get_analysis_etag(
+    recording_ids: typing.List[str],
+    recordings: typing.List[recordings_model.RecordingSummaryModel],
+    outputs: typing.Optional[typing.Iterable[str]] = None,
+    kinematics_format: str = 'dict',
+) -> typing.Optional[str]:
+    """
+    ETag of the analysis of recordings, known without analyzing them.
+
+    Completed recordings are immutable, so their analysis only changes with ANALYSIS_VERSION,
+    RESPONSE_VERSION and the hold numbering of their routes. The response also depends on the
+    order of the requested IDs, as the first recording is the comparison's reference.
+
+    Args:
+        recording_ids: IDs of the recordings, in the order requested.
+        recordings: Summaries of the recordings, in any order.
+
+    Returns:
+        Optional[str]: The ETag, or None if any recording is not found or not completed.
+    """
+    recordings_by_id = {str(recording.id): recording for recording in recordings}
+    if not recording_ids or any(str(recording_id) not in recordings_by_id for recording_id in recording_ids):
+        return None
+    recordings = [recordings_by_id[str(recording_id)] for recording_id in recording_ids]
+    if any(recording.status != 'completed' for recording in recordings):
+        return None
+
+    holds_revisions = {
+        route_id: stored_results.holds_revision(stored_results.load_hold_numbers(route_id))
+        for route_id in {recording.route_id for recording in recordings}
     }
-    
-    # Prepare DataFrames for each visualization
-    df_time_series = base_df.copy()
-    df_load_distribution = prepare.prepare_load_percentage(base_df)
-    df_load_velocity = prepare.prepare_load_velocity(base_df, frame_rate)
-    # Generate plots
-    load_time_series_plot = plots.generate_load_time_series_plot(df_time_series)
-    load_distribution_plot = plots.generate_load_distribution_plot(df_load_distribution)
-    load_velocity_plot = plots.generate_load_stability_plot(df_load_velocity)
+    outputs = list(ANALYSIS_OUTPUTS if outputs is None else outputs)
+    key = repr((
+        stored_results.ANALYSIS_VERSION,
+        RESPONSE_VERSION,
+        [(recording.id, holds_revisions[recording.route_id]) for recording in recordings],
+        outputs,
+        kinematics_format,
+    ))
+    return f'analysis-{hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()}'
 
-    # Build VisualizationData structures
-    load_time_series_visualization = _build_visualization_data(
-        df=df_time_series,
-        frame_rate=frame_rate,
-        y_column='force_magnitude',
-        plot=load_time_series_plot
+def _compare_recordings(recordings: list[recordings_model.RecordingModel], profiles: list[dict]) -> dict:
+    """Compares the recordings of the first recording's route, against the first recording."""
+    route_id = recordings[0].route_id
+    same_route = [index for index, recording in enumerate(recordings) if recording.route_id == route_id]
+    return comparison.compare_recordings(
+        [recordings[index].id for index in same_route],
+        [comparison.decode_force_profile(profiles[index]) for index in same_route],
     )
 
-    load_distribution_visualization = _build_visualization_data(
-        df=df_load_distribution,
-        frame_rate=frame_rate,
-        y_column='load_percentage',
-        plot=load_distribution_plot
+def get_recording_kinematics(
+    recording: recordings_model.RecordingModel,
+) -> typing.Optional[kinematics_model.KinematicsModel]:
+    """
+    Gets the kinematics of a recording, reading through the stored results.
+
+    Returns:
+        Optional[KinematicsModel]: The kinematics, or None if the recording has no video.
+    """
+    results = _get_recording_analysis(recording, ['kinematics'], 'binary')
+    if results['kinematics'] is None:
+        return None
+    return kinematics.decode_kinematics(results['kinematics'])
+
+def _get_recording_analysis(
+    recording: recordings_model.RecordingModel,
+    outputs: typing.List[str],
+    kinematics_format: str = 'dict',
+) -> dict:
+    """Gets the analysis results of a recording, reading through the stored results."""
+    return _get_recording_analyses([recording], outputs, kinematics_format)[0]
+
+def _get_recording_analyses(
+    recordings: typing.List[recordings_model.RecordingModel],
+    outputs: typing.List[str],
+    kinematics_format: str = 'dict',
+) -> typing.List[dict]:
+    """
+    Gets the analysis results of recordings, reading through the stored results.
+
+    Completed recordings are immutable, so their results are stored per ANALYSIS_VERSION and only
+    the outputs not stored yet are computed. Outputs numbering the holds are also recomputed once
+    the route's holds are edited. Other recordings are always analyzed afresh.
+
+    Returns:
+        List[dict]: The results of each recording, in the order of `recordings`.
+    """
+    route_hold_numbers = {
+        route_id: stored_results.load_hold_numbers(route_id)
+        for route_id in {recording.route_id for recording in recordings}
+    }
+    route_holds_revisions = {
+        route_id: stored_results.holds_revision(hold_numbers)
+        for route_id, hold_numbers in route_hold_numbers.items()
+    }
+    recording_results = [
+        _get_stored_results(recording, route_holds_revisions[recording.route_id])
+        for recording in recordings
+    ]
+
+    pending = []
+    for recording, results in zip(recordings, recording_results):
+        missing_outputs = [output for output in outputs if output not in results]
+        if missing_outputs:
+            pending.append((recording, missing_outputs, results))
+
+    computed_results = _analyze_recordings([
+        (recording, missing, route_hold_numbers[recording.route_id])
+        for recording, missing, _ in pending
+    ])
+    for (recording, _, results), computed in zip(pending, computed_results):
+        results.update(computed)
+        if recording.status == 'completed':
+            results[stored_results.HOLDS_REVISION_KEY] = route_holds_revisions[recording.route_id]
+            recording_dao.RecordingDAO.save_analysis_results(recording.id, stored_results.ANALYSIS_VERSION, results)
+
+    return [
+        _from_stored_results({output: results[output] for output in outputs}, kinematics_format)
+        for results in recording_results
+    ]
+
+def _get_stored_results(recording: recordings_model.RecordingModel, holds_revision: str) -> dict:
+    """
+    Gets the stored results of a completed recording, without the outputs numbering the holds if
+    they were computed with another hold numbering than `holds_revision`.
+    """
+    if recording.status != 'completed':
+        return {}
+
+    results = recording_dao.RecordingDAO.get_analysis_results(recording.id, stored_results.ANALYSIS_VERSION) or {}
+    if results.pop(stored_results.HOLDS_REVISION_KEY, None) == holds_revision:
+        return results
+    return {
+        output: value
+        for output, value in results.items()
+        if 'hold_numbers' not in _PIPELINE.dependencies([output])
+    }
+
+def _to_stored_results(results: dict) -> dict:
+    """
+    Converts pipeline outputs to the form they are stored in, serializable by `json_provider.dumps`.
+
+    Kinematics are stored in the compact binary format, and force profiles as base64 arrays.
+    """
+    results = dict(results)
+    if results.get('kinematics') is not None:
+        results['kinematics'] = kinematics.encode_kinematics(results['kinematics'], 'binary')
+    if results.get('force_profile') is not None:
+        results['force_profile'] = comparison.encode_force_profile(results['force_profile'])
+    return results
+
+def _from_stored_results(results: dict, kinematics_format: str) -> dict:
+    """
+    Converts stored results to their response form, re-encoding kinematics in the requested format.
+    """
+    if results.get('kinematics') is not None and kinematics_format != 'binary':
+        results = dict(results)
+        results['kinematics'] = kinematics.encode_kinematics(
+            kinematics.decode_kinematics(results['kinematics']),
+            kinematics_format,
+        )
+    return results
+
+@jobs.register_handler(recordings_logic.PRECOMPUTE_ANALYSIS_JOB)
+def _precompute_analysis(recording_id: str) -> None:
+    """
+    Store the sensor analysis of a completed recording and add it to the route analytics, then
+    queue its kinematics.
+    """
+    recording = recordings_logic.get_recording(recording_id)
+    results = _get_recording_analysis(recording, ['key_metrics', 'visualizations', 'force_profile'])
+    analytics.record_recording_summary(
+        recording,
+        results['key_metrics'],
+        comparison.decode_force_profile(results['force_profile']),
     )
 
-    load_stability_visualization = _build_visualization_data(
-        df=df_load_velocity,
-        frame_rate=frame_rate,
-        y_column='load_velocity',
-        plot=load_velocity_plot
+    jobs.enqueue(
+        recordings_logic.ANALYZE_KINEMATICS_JOB,
+        {'recording_id': recording_id},
+        recording_id=recording_id,
     )
 
-    # Collect all visualizations
-    visualizations = {
-        'load_time_series': load_time_series_visualization,
-        'load_distribution': load_distribution_visualization,
-        'load_stability': load_stability_visualization,
+@jobs.register_handler(recordings_logic.ANALYZE_KINEMATICS_JOB)
+def _precompute_kinematics(recording_id: str) -> None:
+    """Store the video kinematics of a completed recording."""
+    recording = recordings_logic.get_recording(recording_id)
+    _get_recording_analysis(recording, ['kinematics'])
+
+def _analyze_recordings(
+    tasks: typing.List[typing.Tuple[recordings_model.RecordingModel, typing.List[str], dict]],
+) -> typing.List[dict]:
+    """
+    Runs the analysis pipeline for each (recording, outputs, hold numbers) task, computing only
+    what its outputs need.
+
+    Independent recordings are analyzed in the shared process pool, with their sensor arrays
+    handed to the workers through shared memory rather than pickled.
+
+    Returns:
+        List[dict]: The stored form of the results of each task, in the order of `tasks`.
+    """
+    task_sources = [
+        _resolve_app_products(recording, outputs, hold_numbers)
+        for recording, outputs, hold_numbers in tasks
+    ]
+
+    workers = flask.current_app.config['ANALYSIS']['WORKERS']
+    if min(len(tasks), workers) <= 1:
+        return [
+            _to_stored_results(_PIPELINE.run(sources, outputs))
+            for sources, (_, outputs, _) in zip(task_sources, tasks)
+        ]
+
+    executor = _get_executor(workers)
+    with contextlib.ExitStack() as stack:
+        futures = []
+        for sources, (_, outputs, _) in zip(task_sources, tasks):
+            shared_readings = None
+            if sources.get('packed_readings') is not None and sources['packed_readings'].frame_count:
+                shared_readings = _share_readings(sources.pop('packed_readings'), stack)
+            sources['recording'] = dataclasses.replace(sources['recording'], packed_readings=None)
+            if 'kinematics_workers' in sources:
+                # Pool workers do not start pools of their own
+                sources['kinematics_workers'] = 1
+            futures.append(executor.submit(_analyze_in_worker, sources, outputs, shared_readings))
+
+        # Every worker is done with the shared memory before the stack releases it, even if one
+        # of them failed
+        concurrent.futures.wait(futures)
+        try:
+            return [future.result() for future in futures]
+        except concurrent.futures.process.BrokenProcessPool:
+            _discard_executor(executor)
+            raise
+
+def _get_executor(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """Gets the shared process pool, creating it with `workers` processes if needed."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('forkserver'),
+            )
+            _executor_workers = workers
+        return _executor
+
+def _discard_executor(executor: concurrent.futures.ProcessPoolExecutor) -> None:
+    """Drops a broken shared process pool, so the next analysis creates a new one."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+
+def _resolve_app_products(
+    recording: recordings_model.RecordingModel,
+    outputs: typing.List[str],
+    hold_numbers: dict,
+) -> dict:
+    """Gets the pipeline sources of a recording, with the app products `outputs` need resolved."""
+    sources = {
+        'recording': recording,
+        'frame_rate': recordings_logic.SENSOR_FRAME_RATE,
+        'hold_numbers': hold_numbers,
     }
+    required = _PIPELINE.dependencies(outputs)
+    sources.update(_PIPELINE.run(sources, [name for name in _APP_PRODUCTS if name in required]))
+    return sources
+
+def _share_readings(
+    packed_readings: recordings_model.PackedSensorReadingsModel,
+    stack: contextlib.ExitStack,
+) -> dict:
+    """
+    Copies packed readings into a shared memory block, released when `stack` exits.
+
+    Returns:
+        dict: Description of the block, to attach to it with `_attach_readings`.
+    """
+    shape = packed_readings.x.shape
+    block = multiprocessing.shared_memory.SharedMemory(create=True, size=2 * packed_readings.x.nbytes)
+    stack.callback(block.unlink)
+    stack.callback(block.close)
 
-    # Get video data from S3 if available
-    kinematics_data = None
-    if recording.video_s3_key:
-        s3_client = flask.current_app.extensions['s3']
-        video_data = s3_client.get_file(recording.video_s3_key)
-        
-        # Analyze kinematics
-        kinematics_data = kinematics.analyze_video(video_data)
-
-    recording_result = {
-        'kinematics': kinematics_data,
-        'visualizations': visualizations,
-        'key_metrics': key_metrics,
+    for index, array in enumerate((packed_readings.x, packed_readings.y)):
+        np.ndarray(shape, dtype=np.float32, buffer=block.buf, offset=index * array.nbytes)[:] = array
+
+    return {
+        'name': block.name,
+        'shape': shape,
+        'hold_ids': packed_readings.hold_ids,
+        'start_frame': packed_readings.start_frame,
     }
 
-    return recording_result
+@contextlib.contextmanager
+def _attach_readings(shared_readings: dict):
+    """Attaches to packed readings shared by `_share_readings`, without copying them."""
+    block = multiprocessing.shared_memory.SharedMemory(name=shared_readings['name'])
+    try:
+        shape = shared_readings['shape']
+        nbytes = int(np.prod(shape)) * np.dtype(np.float32).itemsize
+        yield recordings_model.PackedSensorReadingsModel(
+            hold_ids=shared_readings['hold_ids'],
+            x=np.ndarray(shape, dtype=np.float32, buffer=block.buf),
+            y=np.ndarray(shape, dtype=np.float32, buffer=block.buf, offset=nbytes),
+            start_frame=shared_readings['start_frame'],
+        )
+    finally:
+        block.close()
+
+def _analyze_in_worker(sources: dict, outputs: typing.List[str], shared_readings: typing.Optional[dict]) -> dict:
+    """Runs the analysis pipeline in a worker process, returning the stored form of the results."""
+    if shared_readings is None:
+        return _to_stored_results(_PIPELINE.run(sources, outputs))
+
+    with _attach_readings(shared_readings) as packed_readings:
+        return _to_stored_results(_PIPELINE.run({**sources, 'packed_readings': packed_readings}, outputs))
+
+def _load_hold_numbers(recording: recordings_model.RecordingModel):
+    return stored_results.load_hold_numbers(recording.route_id)
+
+def _prepare_base_df(
+    recording: recordings_model.RecordingModel,
+    sensor_readings: typing.Optional[recordings_model.PackedSensorReadingsModel],
+    frame_rate,
+    hold_numbers,
+):
+    if sensor_readings is None or sensor_readings.frame_count == 0:
+        raise ValueError(f"No sensor data for recording ID {recording.id}")
+
+    base_df = prepare.prepare_sensor_dataframe(sensor_readings, frame_rate)
+    base_df['hold_number'] = base_df['hold_id'].astype(str).map(hold_numbers)
+    return base_df
+
+def _calculate_load_velocity(base_df, frame_rate):
+    return metrics.calculate_load_velocity(metrics.SensorArrays.from_dataframe(base_df), frame_rate)
+
+def _fetch_video(recording: recordings_model.RecordingModel) -> typing.Optional[str]:
+    # Get a local copy of the video if available, streamed from S3 on first use
+    if not recording.video_s3_key:
+        return None
+
+    s3_client = flask.current_app.extensions['s3']
+    video_path = s3_client.get_cached_file(recording.video_s3_key)
+    if video_path is None:
+        raise ValueError(f"Video not found for recording ID {recording.id}")
+    return video_path
+
+def _analyze_kinematics(video_path: typing.Optional[str], frame_rate, kinematics_workers: int):
+    if video_path is None:
+        return None
 
-def _get_hold_numbers(holds: list[holds_model.HoldModel]):
-    # Assign numbers to holds based on their position
-    holds.sort(key=lambda x: (x.bbox[1], x.bbox[0]), reverse=True)
-    hold_numbers = {hold.id: index + 1 for index, hold in enumerate(holds)}
-    return hold_numbers
+    # Sample the video no finer than the sensors
+    return kinematics.analyze_video(video_path, target_fps=frame_rate, workers=kinematics_workers)
 
+def _postprocess_kinematics(raw_kinematics: typing.Optional[kinematics_model.KinematicsModel]):
+    if raw_kinematics is None:
+        return None
+    return landmarks.postprocess_kinematics(raw_kinematics)
+
+def _collect_visualizations(load_time_series, load_distribution, load_stability):
+    return {
+        'load_time_series': load_time_series,
+        'load_distribution': load_distribution,
+        'load_stability': load_stability,
+    }
+
+def _visualization_stage(name: str, df_name: str, y_column: str, plot_name: str) -> pipeline.Stage:
+    return pipeline.Stage(
+        name,
+        (df_name, 'frame_rate', plot_name),
+        lambda df, frame_rate, plot: _build_visualization_data(
+            df=df,
+            frame_rate=frame_rate,
+            y_column=y_column,
+            plot=plot,
+        ),
+    )
 
 def _build_visualization_data(df, frame_rate, y_column, plot):
     """
@@ -156,11 +501,53 @@ def _build_visualization_data(df, frame_rate, y_column, plot):
 
     return visualization_data
 
-def _convert_to_native_types(obj):
-    if isinstance(obj, dict):
-        return {key: _convert_to_native_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [_convert_to_native_types(item) for item in obj]
-    elif hasattr(obj, 'dtype'):  # Check if it's a numpy type
-        return obj.item()  # Convert to native Python type
-    return obj
+_PIPELINE = pipeline.Pipeline([
+    pipeline.Stage('hold_numbers', ('recording',), _load_hold_numbers),
+    pipeline.Stage('packed_readings', ('recording',), lambda recording: recording.packed_readings),
+    pipeline.Stage('base_df', ('recording', 'packed_readings', 'frame_rate', 'hold_numbers'), _prepare_base_df),
+    pipeline.Stage('load_velocity', ('base_df', 'frame_rate'), _calculate_load_velocity),
+    pipeline.Stage(
+        'key_metrics',
+        ('base_df', 'frame_rate', 'hold_numbers', 'load_velocity'),
+        lambda base_df, frame_rate, hold_numbers, load_velocity: metrics.compute_key_metrics(
+            base_df,
+            frame_rate,
+            hold_numbers,
+            load_velocity=load_velocity,
+        ),
+    ),
+
+    pipeline.Stage('force_profile', ('base_df', 'frame_rate', 'hold_numbers'), comparison.build_force_profile),
+
+    # Prepare DataFrames for each visualization
+    pipeline.Stage('load_distribution_df', ('base_df',), prepare.prepare_load_percentage),
+    pipeline.Stage(
+        'load_velocity_df',
+        ('base_df', 'frame_rate', 'load_velocity'),
+        lambda base_df, frame_rate, load_velocity: prepare.prepare_load_velocity(
+            base_df,
+            frame_rate,
+            load_velocity=load_velocity,
+        ),
+    ),
+
+    # Generate plots
+    pipeline.Stage('load_time_series_plot', ('base_df',), plots.generate_load_time_series_plot),
+    pipeline.Stage('load_distribution_plot', ('load_distribution_df',), plots.generate_load_distribution_plot),
+    pipeline.Stage('load_stability_plot', ('load_velocity_df',), plots.generate_load_stability_plot),
+
+    # Build VisualizationData structures
+    _visualization_stage('load_time_series', 'base_df', 'force_magnitude', 'load_time_series_plot'),
+    _visualization_stage('load_distribution', 'load_distribution_df', 'load_percentage', 'load_distribution_plot'),
+    _visualization_stage('load_stability', 'load_velocity_df', 'load_velocity', 'load_stability_plot'),
+    pipeline.Stage(
+        'visualizations',
+        ('load_time_series', 'load_distribution', 'load_stability'),
+        _collect_visualizations,
+    ),
+
+    pipeline.Stage('video_path', ('recording',), _fetch_video),
+    pipeline.Stage('kinematics_workers', (), lambda: flask.current_app.config['KINEMATICS']['WORKERS']),
+    pipeline.Stage('raw_kinematics', ('video_path', 'frame_rate', 'kinematics_workers'), _analyze_kinematics),
+    pipeline.Stage('kinematics', ('raw_kinematics',), _postprocess_kinematics),
+])
@@ -0,0 +1,250 @@
+import base64
+import typing
+
+import numpy as np
+import pandas as pd
+
+import betaboard.business.logic.recording_analysis.metrics as metrics
+import betaboard.business.models.recordings as recordings_model
+
+# A hold is engaged while its load exceeds this fraction of its peak load in the recording,
+# and at least MIN_ENGAGEMENT_LOAD so that noise on an unused hold is not an engagement
+ENGAGEMENT_FRACTION = 0.1
+MIN_ENGAGEMENT_LOAD = 10.0  # N
+# Half width of the DTW band around the diagonal, as a fraction of the longer climb
+DTW_BAND_FRACTION = 0.1
+FORCE_PROFILE_DTYPE = np.dtype('<f4')
+
+def build_force_profile(
+    base_df: pd.DataFrame,
+    frame_rate: float,
+    hold_numbers: dict,
+) -> recordings_model.ForceProfileModel:
+    """
+    Builds the dense per-hold load curves of a recording from its base sensor DataFrame.
+    """
+    arrays = metrics.SensorArrays.from_dataframe(base_df)
+    start_frame = int(arrays.frame.min()) if arrays.frame.size else 0
+    frame_count = int(arrays.frame.max()) - start_frame + 1 if arrays.frame.size else 0
+
+    force = np.zeros((frame_count, len(arrays.hold_ids)), dtype=np.float32)
+    force[arrays.frame - start_frame, arrays.hold_codes] = arrays.force_magnitude
+
+    return recordings_model.ForceProfileModel(
+        hold_ids=arrays.hold_ids,
+        hold_numbers=[hold_numbers.get(hold_id) for hold_id in arrays.hold_ids],
+        force=force,
+        frame_rate=frame_rate,
+        start_frame=start_frame,
+    )
+
+def encode_force_profile(profile: recordings_model.ForceProfileModel) -> dict:
+    """
+    Encodes a force profile in a JSON serializable form, with the force array as base64 float32.
+    """
+    return {
+        'hold_ids': profile.hold_ids,
+        'hold_numbers': [int(number) if number is not None else None for number in profile.hold_numbers],
+        'shape': list(profile.force.shape),
+        'force_dtype': FORCE_PROFILE_DTYPE.str,
+        'force': base64.b64encode(profile.force.astype(FORCE_PROFILE_DTYPE).tobytes()).decode('ascii'),
+        'frame_rate': float(profile.frame_rate),
+        'start_frame': int(profile.start_frame),
+    }
+
+def decode_force_profile(encoded: dict) -> recordings_model.ForceProfileModel:
+    """Decodes a force profile encoded by `encode_force_profile`."""
+    force = np.frombuffer(base64.b64decode(encoded['force']), dtype=np.dtype(encoded['force_dtype']))
+    return recordings_model.ForceProfileModel(
+        hold_ids=list(encoded['hold_ids']),
+        hold_numbers=list(encoded['hold_numbers']),
+        force=force.reshape(tuple(encoded['shape'])).astype(np.float32),
+        frame_rate=encoded['frame_rate'],
+        start_frame=encoded['start_frame'],
+    )
+
+def compare_recordings(
+    recording_ids: typing.List[str],
+    profiles: typing.List[recordings_model.ForceProfileModel],
+) -> dict:
+    """
+    Compares attempts of the same route against the first one.
+
+    Each attempt is aligned to the reference by its hold engagement events, trimming both to the
+    climb from the first hold engaged to the last hold released, then by dynamic time warping over
+    the per-hold load curves. Holds are matched by ID.
+
+    Args:
+        recording_ids: IDs of the recordings, the first being the reference.
+        profiles: Force profile of each recording.
+
+    Returns:
+        dict: The reference recording ID, and for every other attempt its alignment and per-hold
+            deltas against the reference (attempt minus reference).
+    """
+    reference = profiles[0]
+    return {
+        'reference_recording_id': recording_ids[0],
+        'attempts': [
+            {'recording_id': recording_id, **_compare_attempt(reference, profile)}
+            for recording_id, profile in zip(recording_ids[1:], profiles[1:])
+        ],
+    }
+
+def _compare_attempt(
+    reference: recordings_model.ForceProfileModel,
+    attempt: recordings_model.ForceProfileModel,
+) -> dict:
+    # Put both recordings on the same hold columns
+    hold_ids = list(reference.hold_ids) + [hold_id for hold_id in attempt.hold_ids if hold_id not in reference.hold_ids]
+    hold_numbers = dict(zip(attempt.hold_ids, attempt.hold_numbers))
+    hold_numbers.update(zip(reference.hold_ids, reference.hold_numbers))
+    reference_force = _hold_columns(reference, hold_ids)
+    attempt_force = _hold_columns(attempt, hold_ids)
+
+    reference_engaged = engaged_frames(reference_force)
+    attempt_engaged = engaged_frames(attempt_force)
+    reference_window = _climb_window(reference_engaged)
+    attempt_window = _climb_window(attempt_engaged)
+    if reference_window is None or attempt_window is None:
+        return {'duration_delta': None, 'alignment_cost': None, 'holds': []}
+
+    reference_force, reference_engaged = (array[slice(*reference_window)] for array in (reference_force, reference_engaged))
+    attempt_force, attempt_engaged = (array[slice(*attempt_window)] for array in (attempt_force, attempt_engaged))
+
+    reference_path, attempt_path, alignment_cost = banded_dtw(reference_force, attempt_force)
+
+    # Signed load difference over aligned frames where either recording engages the hold
+    aligned_engaged = reference_engaged[reference_path] | attempt_engaged[attempt_path]
+    aligned_difference = attempt_force[attempt_path] - reference_force[reference_path]
+    aligned_frames = aligned_engaged.sum(axis=0)
+    aligned_load_delta = np.where(aligned_engaged, aligned_difference, 0).sum(axis=0) / np.maximum(aligned_frames, 1)
+
+    reference_first = _first_engaged(reference_engaged)
+    attempt_first = _first_engaged(attempt_engaged)
+    reference_stability = _hold_stability(reference_force, reference_engaged, reference.frame_rate)
+    attempt_stability = _hold_stability(attempt_force, attempt_engaged, attempt.frame_rate)
+    peak_load_delta = attempt_force.max(axis=0) - reference_force.max(axis=0)
+
+    holds = []
+    for column, hold_id in enumerate(hold_ids):
+        in_reference = reference_first[column] >= 0
+        in_attempt = attempt_first[column] >= 0
+        if not in_reference and not in_attempt:
+            continue
+
+        both = in_reference and in_attempt
+        holds.append({
+            'hold_id': hold_id,
+            'hold_number': hold_numbers[hold_id],
+            'reference_engaged': bool(in_reference),
+            'engaged': bool(in_attempt),
+            # Time of first engagement from the start of each climb
+            'engage_time_delta': float(
+                attempt_first[column] / attempt.frame_rate - reference_first[column] / reference.frame_rate
+            ) if both else None,
+            'peak_load_delta': float(peak_load_delta[column]),
+            'stability_delta': float(attempt_stability[column] - reference_stability[column]) if both else None,
+            'aligned_load_delta': float(aligned_load_delta[column]),
+        })
+    holds.sort(key=lambda hold: (hold['hold_number'] is None, hold['hold_number'] or 0))
+
+    return {
+        'duration_delta': float(len(attempt_force) / attempt.frame_rate - len(reference_force) / reference.frame_rate),
+        'alignment_cost': alignment_cost,
+        'holds': holds,
+    }
+
+def banded_dtw(
+    reference: np.ndarray,
+    attempt: np.ndarray,
+    band_fraction: float = DTW_BAND_FRACTION,
+) -> typing.Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Dynamic time warping of two (frames, features) series within a Sakoe-Chiba band.
+
+    Only cells within the band around the (scaled) diagonal are computed, and each row is computed
+    at once: with X the best predecessor from the previous row and C the cumulative cost along the
+    row, D[i, j] = C[j] + min over k <= j of (X[k] - C[k - 1]), a running minimum.
+
+    Args:
+        reference: (n, features) array.
+        attempt: (m, features) array.
+        band_fraction: Half width of the band as a fraction of the longer series.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, float]: Reference and attempt frame index of each step of
+            the warping path from the start, and the mean Euclidean distance along it.
+    """
+    n, m = len(reference), len(attempt)
+    reference = reference.astype(np.float64)
+    attempt = attempt.astype(np.float64)
+
+    # Wide enough for consecutive rows to overlap however unequal the lengths
+    radius = max(int(np.ceil(band_fraction * max(n, m))), int(np.ceil((m - 1) / max(n - 1, 1))), 1)
+    centre = np.arange(n) * ((m - 1) / max(n - 1, 1))
+    lo = np.clip(np.floor(centre - radius), 0, m - 1).astype(np.int64)
+    hi = np.clip(np.ceil(centre + radius), 0, m - 1).astype(np.int64) + 1
+
+    accumulated = np.full((n, int((hi - lo).max())), np.inf)
+    for i in range(n):
+        width = hi[i] - lo[i]
+        cost = np.sqrt(((attempt[lo[i]:hi[i]] - reference[i]) ** 2).sum(axis=1))
+        cumulative = np.cumsum(cost)
+        if i == 0:
+            accumulated[i, :width] = cumulative
+            continue
+
+        # previous[k] = D[i - 1, lo[i] - 1 + k]
+        previous = np.full(width + 1, np.inf)
+        start = max(lo[i] - 1, lo[i - 1])
+        stop = min(hi[i], hi[i - 1])
+        previous[start - lo[i] + 1:stop - lo[i] + 1] = accumulated[i - 1, start - lo[i - 1]:stop - lo[i - 1]]
+        best_previous = np.minimum(previous[:-1], previous[1:])
+
+        accumulated[i, :width] = cumulative + np.minimum.accumulate(best_previous - (cumulative - cost))
+
+    def accumulated_at(i, j):
+        if i < 0 or j < lo[i] or j >= hi[i]:
+            return np.inf
+        return accumulated[i, j - lo[i]]
+
+    # Backtrack from the end along the cheapest predecessors
+    path = [(n - 1, m - 1)]
+    i, j = n - 1, m - 1
+    while i > 0 or j > 0:
+        i, j = min(((i - 1, j - 1), (i - 1, j), (i, j - 1)), key=lambda cell: accumulated_at(*cell))
+        path.append((i, j))
+
+    reference_path, attempt_path = np.array(path[::-1]).T
+    return reference_path, attempt_path, float(accumulated_at(n - 1, m - 1) / len(path))
+
+def engaged_frames(force: np.ndarray) -> np.ndarray:
+    """(frames, holds) mask of the frames each hold of a (frames, holds) load array is engaged."""
+    peak = force.max(axis=0) if len(force) else np.zeros(force.shape[1])
+    return force > np.maximum(MIN_ENGAGEMENT_LOAD, ENGAGEMENT_FRACTION * peak)
+
+def _hold_columns(profile: recordings_model.ForceProfileModel, hold_ids: typing.List[str]) -> np.ndarray:
+    """Reorders the force columns of a profile to `hold_ids`, with zeros for holds it lacks."""
+    columns = {hold_id: column for column, hold_id in enumerate(profile.hold_ids)}
+    force = np.zeros((profile.frame_count, len(hold_ids)), dtype=np.float64)
+    for column, hold_id in enumerate(hold_ids):
+        if hold_id in columns:
+            force[:, column] = profile.force[:, columns[hold_id]]
+    return force
+
+def _climb_window(engaged: np.ndarray) -> typing.Optional[typing.Tuple[int, int]]:
+    """Frames from the first hold engaged to the last hold released, None if no hold is engaged."""
+    frames = np.flatnonzero(engaged.any(axis=1))
+    if frames.size == 0:
+        return None
+    return int(frames[0]), int(frames[-1]) + 1
+
+def _first_engaged(engaged: np.ndarray) -> np.ndarray:
+    """First engaged frame of each hold, -1 for holds never engaged."""
+    return np.where(engaged.any(axis=0), engaged.argmax(axis=0), -1)
+
+def _hold_stability(force: np.ndarray, engaged: np.ndarray, frame_rate: float) -> np.ndarray:
+    """Mean absolute load velocity of each hold while engaged in N/s, lower being more stable."""
+    velocity = np.abs(np.diff(force, axis=0, prepend=force[:1])) * frame_rate
+    return np.where(engaged, velocity, 0).sum(axis=0) / np.maximum(engaged.sum(axis=0), 1)
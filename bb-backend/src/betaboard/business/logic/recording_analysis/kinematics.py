@@ -1,117 +1,500 @@
-import tempfile
-from typing import Dict
+import base64
+import concurrent.futures
+import multiprocessing
+from typing import Dict, List, Optional, Tuple
 
 import cv2
 import mediapipe as mp
+import numpy as np
 
+import betaboard.business.models.kinematics as kinematics_model
 
-def analyze_video(video_data: bytes) -> Dict:
+# Analyze video at the sensor frame rate by default, as finer kinematics add no analysis resolution
+DEFAULT_TARGET_FPS = 10.0  # Hz
+# Pose inference runs on a small input, so full HD frames only cost decode and conversion time
+DEFAULT_MAX_WIDTH = 960  # px
+DEFAULT_MODEL_COMPLEXITY = 1
+# Videos are only split into segments at least this long, so warmup stays a small overhead
+MIN_SEGMENT_SECONDS = 10.0
+# Frames analyzed before each segment so pose tracking has warmed up at its first frame
+SEGMENT_WARMUP_SECONDS = 1.0
+# Climber region of interest, padded on each side by this fraction of the pose's extent
+ROI_PADDING = 0.5
+# Smallest region of interest side, as a fraction of the shorter frame side
+ROI_MIN_SIZE = 0.2
+# The region of interest is kept while the pose stays this fraction of its size inside its edges
+ROI_MARGIN = 0.1
+
+# Encodings of kinematics for storage and responses
+KINEMATICS_FORMATS = ('dict', 'columnar', 'binary')
+# Landmarks are normalized, so half precision is well below pose estimation error
+BINARY_LANDMARKS_DTYPE = np.dtype('<f2')
+BINARY_TIMESTAMPS_DTYPE = np.dtype('<f4')
+
+
+def analyze_video(
+    video_path: str,
+    target_fps: Optional[float] = DEFAULT_TARGET_FPS,
+    frame_stride: Optional[int] = None,
+    max_width: Optional[int] = DEFAULT_MAX_WIDTH,
+    model_complexity: int = DEFAULT_MODEL_COMPLEXITY,
+    workers: int = 1,
+    roi_tracking: bool = True,
+) -> kinematics_model.KinematicsModel:
     """
     Analyze climbing kinematics from video data using MediaPipe.
 
+    Only every `frame_stride`-th frame is decoded and analyzed; skipped frames are grabbed without
+    being decoded. Timestamps are those of the analyzed frames in the original video.
+
+    With ROI tracking, each frame is cropped to a padded box around the previous frame's pose
+    before inference, falling back to the full frame when the pose is lost. Landmarks are always
+    returned in full frame coordinates.
+
+    With more than one worker, the video is split into one segment per worker, each analyzed in
+    its own process with its own MediaPipe Pose. Each segment starts analyzing a little before its
+    first frame to warm up pose tracking, and those warmup frames are discarded.
+
     Args:
-        video_data: Raw video bytes from the recording.
+        video_path: Path of the recording's video file.
+        target_fps: Rate to analyze frames at, used to pick the stride when `frame_stride` is not
+            given. None analyzes every frame.
+        frame_stride: Analyze every Nth frame. Takes precedence over `target_fps`.
+        max_width: Downscale frames wider than this before inference, None to keep full resolution.
+        model_complexity: MediaPipe Pose model complexity, 0 (fastest), 1 or 2 (most accurate).
+        workers: Number of processes to analyze segments of the video in.
+        roi_tracking: Crop frames to the climber's region of interest before inference.
 
     Returns:
-        Dict containing:
-            - frames: List of frame data, each containing:
-                - timestamp: Frame timestamp in seconds
-                - landmarks: Dict of landmark positions and confidence
-            - metadata: Dict containing:
-                - frame_count: Total number of frames analyzed
+        KinematicsModel: Landmarks of every analyzed frame, NaN where no pose was detected, with
+            metadata containing:
+                - frame_count: Total number of frames in the video
                 - duration: Video duration in seconds
                 - fps: Frames per second
                 - resolution: Video resolution (width, height)
+                - frame_stride: Number of video frames per analyzed frame
+                - analyzed_fps: Rate frames were analyzed at
+    """
+    if frame_stride is not None and frame_stride < 1:
+        raise ValueError("frame_stride must be at least 1")
+
+    # Get video metadata
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError("Failed to open video file")
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    finally:
+        cap.release()
+
+    if frame_stride is None:
+        frame_stride = _frame_stride(fps, target_fps)
+
+    segments = _split_segments(frame_count, fps, frame_stride, workers)
+    warmup_frames = int(SEGMENT_WARMUP_SECONDS * fps)
+    segment_args = [
+        (
+            video_path,
+            start_frame,
+            end_frame,
+            warmup_frames,
+            frame_stride,
+            max_width,
+            model_complexity,
+            roi_tracking,
+        )
+        for start_frame, end_frame in segments
+    ]
+
+    if len(segments) == 1:
+        segment_results = [_analyze_segment(*segment_args[0])]
+    else:
+        # Started by a fork server rather than forked from a threaded app
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=len(segments),
+            mp_context=multiprocessing.get_context('forkserver'),
+        ) as executor:
+            futures = [executor.submit(_analyze_segment, *args) for args in segment_args]
+            segment_results = [future.result() for future in futures]
+
+    # Segments are disjoint and in order, so stitching is concatenation
+    return kinematics_model.KinematicsModel(
+        landmark_names=_landmark_names(),
+        timestamps=np.concatenate([timestamps for timestamps, _ in segment_results]),
+        landmarks=np.concatenate([landmarks for _, landmarks in segment_results]),
+        metadata={
+            'frame_count': frame_count,
+            'duration': frame_count / fps,
+            'fps': fps,
+            'resolution': {
+                'width': width,
+                'height': height
+            },
+            'frame_stride': frame_stride,
+            'analyzed_fps': fps / frame_stride,
+        },
+    )
+
+
+def _split_segments(
+    frame_count: int,
+    fps: float,
+    frame_stride: int,
+    workers: int,
+) -> List[Tuple[int, Optional[int]]]:
+    """
+    Split a video into up to `workers` contiguous (start_frame, end_frame) segments.
+
+    Boundaries fall on analyzed frames so segmenting does not change which frames are analyzed.
+    The last segment is open ended, as container frame counts can be inexact.
+    """
+    min_segment_frames = max(int(MIN_SEGMENT_SECONDS * fps), 1)
+    segment_count = min(workers, frame_count // min_segment_frames)
+    if segment_count <= 1:
+        return [(0, None)]
+
+    segment_frames = -(-frame_count // segment_count)
+    segment_frames = -(-segment_frames // frame_stride) * frame_stride
+    starts = list(range(0, frame_count, segment_frames))[:segment_count]
+    return [
+        (start_frame, starts[index + 1] if index + 1 < len(starts) else None)
+        for index, start_frame in enumerate(starts)
+    ]
+
+
+def _analyze_segment(
+    video_path: str,
+    start_frame: int,
+    end_frame: Optional[int],
+    warmup_frames: int,
+    frame_stride: int,
+    max_width: Optional[int],
+    model_complexity: int,
+    roi_tracking: bool,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Analyze the frames of a video from `start_frame` up to `end_frame` (None for the end).
+
+    Analysis starts `warmup_frames` earlier to warm up pose tracking, without returning those
+    frames. Runs in worker processes, so it opens the video and creates the Pose itself.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Timestamps and (frames, landmarks, fields) landmarks of the
+            analyzed frames.
     """
     mp_pose = mp.solutions.pose
     pose = mp_pose.Pose(
         static_image_mode=False,
+        model_complexity=model_complexity,
         min_detection_confidence=0.5,
         min_tracking_confidence=0.5
     )
 
-    # Write video data to temporary file
-    with tempfile.NamedTemporaryFile(suffix='.mp4') as temp_video:
-        temp_video.write(video_data)
-        temp_video.flush()
-        
-        # Open video file
-        cap = cv2.VideoCapture(temp_video.name)
-        
-        if not cap.isOpened():
-            raise ValueError("Failed to open video file")
-
-        try:
-            # Get video metadata
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            
-            frames_data = []
-            frame_idx = 0
+    # Open video file
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        pose.close()
+        raise ValueError("Failed to open video file")
 
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+
+        # Start on an analyzed frame. Seeking decodes forward from the preceding keyframe
+        frame_idx = max(start_frame - warmup_frames, 0) // frame_stride * frame_stride
+        if frame_idx > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
 
-                # Convert BGR to RGB
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Process frame with MediaPipe
-                results = pose.process(rgb_frame)
-                
-                if results.pose_landmarks:
-                    # Convert landmarks to a more frontend-friendly format
-                    landmarks = _process_landmarks(results.pose_landmarks, mp_pose)
-                    
-                    frames_data.append({
-                        'timestamp': frame_idx / fps,
-                        'landmarks': landmarks
-                    })
-                
+        timestamps = []
+        frame_landmarks = []
+        # Pixel box (x0, y0, x1, y1) the next frame is cropped to, None for the full frame
+        roi = None
+        missing_landmarks = np.full(
+            (len(_landmark_names()), len(kinematics_model.LANDMARK_FIELDS)),
+            np.nan,
+            dtype=np.float32,
+        )
+
+        while end_frame is None or frame_idx < end_frame:
+            # Skipped frames are only demuxed, not decoded
+            if frame_idx % frame_stride != 0:
+                if not cap.grab():
+                    break
                 frame_idx += 1
+                continue
 
-            return {
-                'frames': frames_data,
-                'metadata': {
-                    'frame_count': frame_count,
-                    'duration': frame_count / fps,
-                    'fps': fps,
-                    'resolution': {
-                        'width': width,
-                        'height': height
-                    }
-                }
-            }
-        finally:
-            cap.release()
-            pose.close()
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            frame_height, frame_width = frame.shape[:2]
+
+            # Crop at full resolution, so the climber keeps as many pixels as possible
+            if roi is not None:
+                x0, y0, x1, y1 = roi
+                image = frame[y0:y1, x0:x1]
+            else:
+                image = frame
+
+            if max_width and image.shape[1] > max_width:
+                scale = max_width / image.shape[1]
+                image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+            # Convert BGR to RGB
+            rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            
+            # Process frame with MediaPipe
+            results = pose.process(rgb_frame)
+
+            landmarks = missing_landmarks
+            if results.pose_landmarks:
+                landmarks = _landmark_array(results.pose_landmarks)
+                if roi is not None:
+                    landmarks = _roi_to_frame(landmarks, roi, frame_width, frame_height)
+                if roi_tracking and not _roi_contains(roi, landmarks, frame_width, frame_height):
+                    roi = _roi_from_landmarks(landmarks, frame_width, frame_height)
+            else:
+                # Pose lost, search the full frame
+                roi = None
+            
+            if frame_idx >= start_frame:
+                timestamps.append(frame_idx / fps)
+                frame_landmarks.append(landmarks)
+            
+            frame_idx += 1
+
+        return (
+            np.array(timestamps, dtype=np.float64),
+            np.array(frame_landmarks, dtype=np.float32).reshape((-1,) + missing_landmarks.shape),
+        )
+    finally:
+        cap.release()
+        pose.close()
+
+
+def _roi_from_landmarks(landmarks: np.ndarray, width: int, height: int) -> Tuple[int, int, int, int]:
+    """
+    Padded pixel box (x0, y0, x1, y1) around full frame landmarks, clipped to the frame.
+    """
+    xs = landmarks[:, 0] * width
+    ys = landmarks[:, 1] * height
+    pad = ROI_PADDING * max(xs.max() - xs.min(), ys.max() - ys.min())
+    min_half_size = ROI_MIN_SIZE * min(width, height) / 2
+
+    center_x = (xs.min() + xs.max()) / 2
+    center_y = (ys.min() + ys.max()) / 2
+    half_width = max((xs.max() - xs.min()) / 2 + pad, min_half_size)
+    half_height = max((ys.max() - ys.min()) / 2 + pad, min_half_size)
+
+    x0 = int(np.clip(center_x - half_width, 0, width - 1))
+    y0 = int(np.clip(center_y - half_height, 0, height - 1))
+    x1 = int(np.clip(np.ceil(center_x + half_width), x0 + 1, width))
+    y1 = int(np.clip(np.ceil(center_y + half_height), y0 + 1, height))
+    return x0, y0, x1, y1
 
 
-def _process_landmarks(pose_landmarks, mp_pose) -> Dict:
+def _roi_contains(
+    roi: Optional[Tuple[int, int, int, int]],
+    landmarks: np.ndarray,
+    width: int,
+    height: int,
+) -> bool:
     """
-    Convert MediaPipe landmarks to a frontend-friendly format.
-    
+    Whether full frame landmarks lie inside the box, away from any edge not on the frame border.
+
+    Keeping the box while this holds avoids moving the crop, and so the tracker's input, every frame.
+    """
+    if roi is None:
+        return False
+
+    x0, y0, x1, y1 = roi
+    margin_x = ROI_MARGIN * (x1 - x0)
+    margin_y = ROI_MARGIN * (y1 - y0)
+    xs = landmarks[:, 0] * width
+    ys = landmarks[:, 1] * height
+    return bool(
+        (x0 == 0 or xs.min() >= x0 + margin_x)
+        and (y0 == 0 or ys.min() >= y0 + margin_y)
+        and (x1 == width or xs.max() <= x1 - margin_x)
+        and (y1 == height or ys.max() <= y1 - margin_y)
+    )
+
+
+def _roi_to_frame(
+    landmarks: np.ndarray,
+    roi: Tuple[int, int, int, int],
+    width: int,
+    height: int,
+) -> np.ndarray:
+    """
+    Map landmarks normalized to a crop back to full frame normalized coordinates.
+    """
+    x0, y0, x1, y1 = roi
+    frame_landmarks = landmarks.copy()
+    frame_landmarks[:, 0] = (x0 + landmarks[:, 0] * (x1 - x0)) / width
+    frame_landmarks[:, 1] = (y0 + landmarks[:, 1] * (y1 - y0)) / height
+    # Depth is on the same scale as x
+    frame_landmarks[:, 2] = landmarks[:, 2] * (x1 - x0) / width
+    return frame_landmarks
+
+
+def _frame_stride(fps: float, target_fps: Optional[float]) -> int:
+    """
+    Stride that analyzes frames closest to `target_fps`, or every frame if either rate is unknown.
+    """
+    if not target_fps or fps <= 0:
+        return 1
+    # Rounded so e.g. 29.97 fps video is sampled every 3rd frame for 10 Hz
+    return max(1, round(fps / target_fps))
+
+
+def _landmark_names() -> List[str]:
+    """Names of the MediaPipe Pose landmarks, in landmark index order."""
+    return [landmark.name.lower() for landmark in mp.solutions.pose.PoseLandmark]
+
+
+def _landmark_array(pose_landmarks) -> np.ndarray:
+    """
+    Convert MediaPipe landmarks to a (landmarks, fields) array.
+
     Args:
         pose_landmarks: MediaPipe pose landmarks.
-        mp_pose: MediaPipe pose module.
 
     Returns:
-        Dict containing normalized coordinates and visibility for each landmark.
-    """
-    landmarks = {}
-    
-    # Convert each landmark to a dict with normalized coordinates
-    for idx, landmark in enumerate(pose_landmarks.landmark):
-        landmark_name = mp_pose.PoseLandmark(idx).name.lower()
-        landmarks[landmark_name] = {
-            'x': landmark.x,  # Normalized coordinates (0.0 - 1.0)
-            'y': landmark.y,
-            'z': landmark.z,
-            'visibility': landmark.visibility
+        np.ndarray: Normalized coordinates (0.0 - 1.0), depth and visibility of each landmark.
+    """
+    return np.array(
+        [
+            (landmark.x, landmark.y, landmark.z, landmark.visibility)
+            for landmark in pose_landmarks.landmark
+        ],
+        dtype=np.float32,
+    )
+
+
+def encode_kinematics(kinematics: kinematics_model.KinematicsModel, kinematics_format: str) -> Dict:
+    """
+    Encode kinematics into a format serializable by the app's JSON provider.
+
+    Formats:
+        - dict: Per-frame landmark dicts keyed by landmark name, for every frame so that frame i
+            is at `start_time + i * frame_interval` once post-processed. Fields are null in frames
+            without a pose.
+        - columnar: Timestamps plus one series per landmark field, null where no pose was detected.
+            The series are numpy arrays.
+        - binary: Base64 little-endian arrays, float32 timestamps and (frames, landmarks, fields)
+            float16 landmarks, with the landmark names and fields as header.
+
+    Post-processed kinematics also carry their visibility mask: a 'visible' flag per landmark
+    (dict), a 'visible' series per landmark (columnar) or the base64 bit-packed (frames, landmarks)
+    mask (binary).
+
+    Args:
+        kinematics: The kinematics to encode.
+        kinematics_format: One of KINEMATICS_FORMATS.
+
+    Returns:
+        Dict: The encoded kinematics, with the video metadata.
+    """
+    visible = kinematics.visible
+
+    if kinematics_format == 'dict':
+        # NaN marks frames without a pose, which the app's JSON provider sends as null
+        frames = []
+        for frame_index in range(len(kinematics.timestamps)):
+            landmarks = {
+                name: dict(zip(kinematics_model.LANDMARK_FIELDS, map(float, values)))
+                for name, values in zip(kinematics.landmark_names, kinematics.landmarks[frame_index])
+            }
+            if visible is not None:
+                for name, is_visible in zip(kinematics.landmark_names, visible[frame_index]):
+                    landmarks[name]['visible'] = bool(is_visible)
+            frames.append({
+                'timestamp': float(kinematics.timestamps[frame_index]),
+                'landmarks': landmarks,
+            })
+        return {
+            'frames': frames,
+            'metadata': kinematics.metadata,
+        }
+
+    if kinematics_format == 'columnar':
+        # NaN marks frames without a pose, which the app's JSON provider sends as null
+        columns = {
+            name: {
+                field: kinematics.landmarks[:, landmark_index, field_index]
+                for field_index, field in enumerate(kinematics_model.LANDMARK_FIELDS)
+            }
+            for landmark_index, name in enumerate(kinematics.landmark_names)
+        }
+        if visible is not None:
+            for landmark_index, name in enumerate(kinematics.landmark_names):
+                columns[name]['visible'] = visible[:, landmark_index]
+        return {
+            'format': 'columnar',
+            'timestamps': kinematics.timestamps,
+            'landmarks': columns,
+            'metadata': kinematics.metadata,
         }
-    
-    return landmarks
 
+    if kinematics_format == 'binary':
+        encoded = {
+            'format': 'binary',
+            'landmark_names': list(kinematics.landmark_names),
+            'fields': list(kinematics_model.LANDMARK_FIELDS),
+            'shape': list(kinematics.landmarks.shape),
+            'timestamps_dtype': BINARY_TIMESTAMPS_DTYPE.str,
+            'landmarks_dtype': BINARY_LANDMARKS_DTYPE.str,
+            'timestamps': base64.b64encode(
+                kinematics.timestamps.astype(BINARY_TIMESTAMPS_DTYPE).tobytes()
+            ).decode('ascii'),
+            'landmarks': base64.b64encode(
+                kinematics.landmarks.astype(BINARY_LANDMARKS_DTYPE).tobytes()
+            ).decode('ascii'),
+            'metadata': kinematics.metadata,
+        }
+        if visible is not None:
+            encoded['visible'] = base64.b64encode(np.packbits(visible).tobytes()).decode('ascii')
+        return encoded
+
+    raise ValueError(f"Unknown kinematics format: {kinematics_format}")
+
+
+def kinematics_to_bytes(kinematics: kinematics_model.KinematicsModel) -> bytes:
+    """
+    Raw binary kinematics: the binary format's timestamps array followed by its landmarks array.
+    """
+    return (
+        kinematics.timestamps.astype(BINARY_TIMESTAMPS_DTYPE).tobytes()
+        + kinematics.landmarks.astype(BINARY_LANDMARKS_DTYPE).tobytes()
+    )
+
+
+def decode_kinematics(encoded: Dict) -> kinematics_model.KinematicsModel:
+    """
+    Decode kinematics encoded in the binary format by `encode_kinematics`.
+    """
+    shape = tuple(encoded['shape'])
+    timestamps = np.frombuffer(
+        base64.b64decode(encoded['timestamps']),
+        dtype=np.dtype(encoded['timestamps_dtype']),
+    )
+    landmarks = np.frombuffer(
+        base64.b64decode(encoded['landmarks']),
+        dtype=np.dtype(encoded['landmarks_dtype']),
+    ).reshape(shape)
+
+    visible = None
+    if encoded.get('visible') is not None:
+        visible_bits = np.frombuffer(base64.b64decode(encoded['visible']), dtype=np.uint8)
+        visible = np.unpackbits(visible_bits, count=shape[0] * shape[1]).reshape(shape[:2]).astype(bool)
+
+    return kinematics_model.KinematicsModel(
+        landmark_names=list(encoded['landmark_names']),
+        timestamps=timestamps.astype(np.float64),
+        landmarks=landmarks.astype(np.float32),
+        metadata=encoded['metadata'],
+        visible=visible,
+    )
@@ -0,0 +1,146 @@
+import dataclasses
+import typing
+
+import numpy as np
+
+import betaboard.business.models.kinematics as kinematics_model
+
+# Gaps in pose detection up to this long are interpolated, longer ones stay missing
+DEFAULT_MAX_GAP_SECONDS = 0.5
+# Savitzky-Golay window length in frames (odd) and polynomial order
+DEFAULT_WINDOW_LENGTH = 5
+DEFAULT_POLYORDER = 2
+# Landmarks with a MediaPipe visibility below this are marked not visible
+DEFAULT_VISIBILITY_THRESHOLD = 0.5
+
+_COORDINATE_FIELDS = [kinematics_model.LANDMARK_FIELDS.index(field) for field in ('x', 'y', 'z')]
+_VISIBILITY_FIELD = kinematics_model.LANDMARK_FIELDS.index('visibility')
+
+def postprocess_kinematics(
+    kinematics: kinematics_model.KinematicsModel,
+    max_gap_seconds: float = DEFAULT_MAX_GAP_SECONDS,
+    window_length: int = DEFAULT_WINDOW_LENGTH,
+    polyorder: int = DEFAULT_POLYORDER,
+    visibility_threshold: float = DEFAULT_VISIBILITY_THRESHOLD,
+) -> kinematics_model.KinematicsModel:
+    """
+    Cleans up raw pose landmarks for playback and analysis.
+
+    Frames are placed on a uniform timeline, short detection gaps are linearly interpolated, the
+    coordinates of all landmarks are smoothed at once with a Savitzky-Golay filter, and landmarks
+    below the visibility threshold are marked not visible.
+
+    Args:
+        kinematics: Raw kinematics, as returned by `kinematics.analyze_video`.
+        max_gap_seconds: Longest run of missing frames to interpolate.
+        window_length: Savitzky-Golay window length in frames, odd.
+        polyorder: Savitzky-Golay polynomial order, less than `window_length`.
+        visibility_threshold: Visibility below which a landmark is marked not visible.
+
+    Returns:
+        KinematicsModel: The processed kinematics, with timestamps `start_time + i * frame_interval`
+            (both added to the metadata) and the visibility mask set.
+    """
+    if window_length % 2 == 0 or polyorder >= window_length:
+        raise ValueError("window_length must be odd and greater than polyorder")
+
+    frame_interval = kinematics.metadata['frame_stride'] / kinematics.metadata['fps']
+    timestamps, landmarks = uniform_timeline(kinematics.timestamps, kinematics.landmarks, frame_interval)
+
+    landmarks = interpolate_gaps(landmarks, int(round(max_gap_seconds / frame_interval)))
+    landmarks[..., _COORDINATE_FIELDS] = savgol_filter(
+        landmarks[..., _COORDINATE_FIELDS],
+        window_length,
+        polyorder,
+    )
+
+    visibility = landmarks[..., _VISIBILITY_FIELD]
+    # NaN compares False, so missing frames are not visible
+    visible = visibility >= visibility_threshold
+
+    metadata = dict(kinematics.metadata)
+    metadata['start_time'] = float(timestamps[0]) if len(timestamps) else 0.0
+    metadata['frame_interval'] = frame_interval
+
+    return dataclasses.replace(
+        kinematics,
+        timestamps=timestamps,
+        landmarks=landmarks,
+        metadata=metadata,
+        visible=visible,
+    )
+
+def uniform_timeline(
+    timestamps: np.ndarray,
+    landmarks: np.ndarray,
+    frame_interval: float,
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Places frames on a timeline with one slot every `frame_interval` from the first frame.
+
+    Slots without a frame are NaN. Frames landing in the same slot keep the last one.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Uniform timestamps and (slots, ...) landmarks.
+    """
+    if len(timestamps) == 0:
+        return timestamps.astype(np.float64), landmarks.astype(np.float32)
+
+    slots = np.rint((timestamps - timestamps[0]) / frame_interval).astype(np.int64)
+    uniform = np.full((slots[-1] + 1,) + landmarks.shape[1:], np.nan, dtype=np.float32)
+    uniform[slots] = landmarks
+    uniform_timestamps = timestamps[0] + np.arange(len(uniform)) * frame_interval
+    return uniform_timestamps, uniform
+
+def interpolate_gaps(landmarks: np.ndarray, max_gap_frames: int) -> np.ndarray:
+    """
+    Linearly interpolates every value over runs of up to `max_gap_frames` missing frames.
+
+    A frame is missing when all its values are NaN. Runs at either end of the recording or longer
+    than `max_gap_frames` stay NaN.
+    """
+    landmarks = landmarks.copy()
+    frame_count = len(landmarks)
+    missing = np.isnan(landmarks.reshape(frame_count, -1)).all(axis=1)
+    if not missing.any() or missing.all() or max_gap_frames <= 0:
+        return landmarks
+
+    # Nearest detected frame before and after each frame
+    frame_indices = np.arange(frame_count)
+    previous = np.maximum.accumulate(np.where(missing, -1, frame_indices))
+    following = np.minimum.accumulate(np.where(missing, frame_count, frame_indices)[::-1])[::-1]
+
+    fill = missing & (previous >= 0) & (following < frame_count) & (following - previous - 1 <= max_gap_frames)
+    if not fill.any():
+        return landmarks
+
+    fill_previous = previous[fill]
+    fill_following = following[fill]
+    weights = (frame_indices[fill] - fill_previous) / (fill_following - fill_previous)
+    weights = weights.reshape((-1,) + (1,) * (landmarks.ndim - 1))
+    landmarks[fill] = (1 - weights) * landmarks[fill_previous] + weights * landmarks[fill_following]
+    return landmarks
+
+def savgol_filter(values: np.ndarray, window_length: int, polyorder: int) -> np.ndarray:
+    """
+    Smooths every series along the first axis with a Savitzky-Golay filter.
+
+    Frames whose window is not complete, at either end or next to missing frames, keep their value.
+    """
+    frame_count = len(values)
+    if frame_count < window_length:
+        return values.copy()
+
+    # Least squares polynomial fit evaluated at the window centre
+    half_window = window_length // 2
+    offsets = np.arange(-half_window, half_window + 1)
+    coefficients = np.linalg.pinv(np.vander(offsets, polyorder + 1, increasing=True))[0]
+
+    windows = np.lib.stride_tricks.sliding_window_view(values, window_length, axis=0)
+    smoothed_inner = windows @ coefficients.astype(values.dtype)
+
+    smoothed = values.copy()
+    inner = smoothed[half_window:frame_count - half_window]
+    complete = ~np.isnan(smoothed_inner)
+    inner[complete] = smoothed_inner[complete]
+    return smoothed
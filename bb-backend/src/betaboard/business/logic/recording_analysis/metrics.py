@@ -0,0 +1,164 @@
+import dataclasses
+import typing
+
+import numpy as np
+import pandas as pd
+
+GRAVITY = 9.81  # m/s²
+DEFAULT_CLIMBER_MASS = 60.0  # kg
+
+@dataclasses.dataclass
+class SensorArrays:
+    """
+    Contiguous column arrays of a sensor DataFrame, one element per reading in row order.
+
+    Args:
+        frame: Frame index of each reading
+        hold_codes: Index into `hold_ids` of each reading
+        hold_ids: Hold ID of each hold code
+        y: Vertical load of each reading, NaN filled with 0
+        force_magnitude: Load magnitude of each reading, NaN filled with 0
+    """
+    frame: np.ndarray
+    hold_codes: np.ndarray
+    hold_ids: typing.List[str]
+    y: np.ndarray
+    force_magnitude: np.ndarray
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'SensorArrays':
+        """
+        Extracts the arrays from a DataFrame built by `prepare.prepare_sensor_dataframe`.
+        """
+        if isinstance(df['hold_id'].dtype, pd.CategoricalDtype):
+            hold_codes = df['hold_id'].cat.codes.to_numpy()
+            hold_ids = [str(hold_id) for hold_id in df['hold_id'].cat.categories]
+        else:
+            hold_codes, categories = pd.factorize(df['hold_id'], sort=True)
+            hold_ids = [str(hold_id) for hold_id in categories]
+
+        return cls(
+            frame=df['frame'].fillna(0).to_numpy(),
+            hold_codes=hold_codes,
+            hold_ids=hold_ids,
+            y=df['y'].fillna(0).to_numpy(dtype=np.float64),
+            force_magnitude=df['force_magnitude'].fillna(0).to_numpy(dtype=np.float64),
+        )
+
+def compute_key_metrics(
+    df: pd.DataFrame,
+    frame_rate: float,
+    hold_numbers: dict,
+    climber_mass: float = DEFAULT_CLIMBER_MASS,
+    load_velocity: typing.Optional[np.ndarray] = None,
+) -> dict:
+    """
+    Computes all key metrics of a recording in one pass over its sensor arrays.
+
+    Shared intermediates (active duration, energy, peak load, load velocity) are computed once.
+    The `calculations.calculate_*` functions wrap the same kernels, so both give the same numbers.
+
+    Args:
+        df: Base sensor DataFrame.
+        frame_rate: Sensor frame rate in Hz.
+        hold_numbers: Hold number of each hold ID.
+        climber_mass: Climber mass in kg.
+        load_velocity: Signed per-hold load velocity of each row if already computed, as returned
+            by `calculate_load_velocity`.
+
+    Returns:
+        dict: The key metrics, keyed by name.
+    """
+    arrays = SensorArrays.from_dataframe(df)
+    if load_velocity is None:
+        load_velocity = calculate_load_velocity(arrays, frame_rate)
+
+    duration = active_duration(arrays, frame_rate)
+    energy = energy_expenditure(arrays, frame_rate, climber_mass)
+    peak = peak_load(arrays)
+
+    return {
+        'active_duration': duration,
+        'energy_expenditure': energy,
+        'energy_expenditure_rate': energy / duration if duration > 0 else 0.0,
+        'peak_load': peak,
+        'peak_load_rate': peak / frame_rate if frame_rate > 0 else 0.0,
+        'average_load_per_hold': average_load_per_hold(arrays, hold_numbers),
+        'overall_stability': overall_stability(load_velocity),
+    }
+
+def total_load(arrays: SensorArrays) -> float:
+    """Sum of load magnitude over every reading."""
+    return float(arrays.force_magnitude.sum())
+
+def active_duration(arrays: SensorArrays, frame_rate: float) -> float:
+    """Duration covered by the frames that have readings, in seconds."""
+    return float(len(np.unique(arrays.frame)) * (1 / frame_rate))
+
+def peak_load(arrays: SensorArrays) -> float:
+    """Highest load magnitude of any reading."""
+    if arrays.force_magnitude.size == 0:
+        return float('nan')
+    return float(arrays.force_magnitude.max())
+
+def energy_expenditure(
+    arrays: SensorArrays,
+    frame_rate: float,
+    climber_mass: float = DEFAULT_CLIMBER_MASS,
+) -> float:
+    """
+    Total energy expenditure in Joules, as work against gravity plus the force-time integral.
+    """
+    dt = 1.0 / frame_rate
+
+    # Vertical displacement from the vertical force: a = F/m, d = 1/2 * a * t²
+    vertical_displacement = 0.5 * (arrays.y / climber_mass) * (dt ** 2)
+    potential_energy = climber_mass * GRAVITY * vertical_displacement.sum()
+
+    hold_work = arrays.force_magnitude.sum() * dt
+    return float(potential_energy + hold_work)
+
+def average_load_per_hold(arrays: SensorArrays, hold_numbers: dict) -> typing.List[dict]:
+    """
+    Mean load magnitude of each hold with readings, in hold code order.
+    """
+    # Same reduction as a groupby mean over the DataFrame, which sums with Kahan summation
+    means = pd.Series(arrays.force_magnitude).groupby(arrays.hold_codes).mean()
+
+    records = []
+    for hold_code, mean in means.items():
+        hold_id = arrays.hold_ids[hold_code]
+        hold_number = hold_numbers.get(hold_id)
+        records.append({
+            'hold_id': hold_id,
+            'force_magnitude': float(mean),
+            'hold_number': int(hold_number) if hold_number is not None else None,
+        })
+    return records
+
+def calculate_load_velocity(arrays: SensorArrays, frame_rate: float) -> np.ndarray:
+    """
+    Signed rate of change of load magnitude per hold, in row order.
+
+    Each reading is differenced against the previous reading of the same hold. The first reading
+    of every hold is NaN.
+    """
+    # Stable sort keeps each hold's readings in row order
+    order = np.argsort(arrays.hold_codes, kind='stable')
+    sorted_codes = arrays.hold_codes[order]
+    sorted_force = arrays.force_magnitude[order]
+
+    sorted_velocity = np.empty(len(order), dtype=np.float64)
+    sorted_velocity[1:] = np.diff(sorted_force)
+    sorted_velocity[:1] = np.nan
+    sorted_velocity[1:][sorted_codes[1:] != sorted_codes[:-1]] = np.nan
+
+    velocity = np.empty_like(sorted_velocity)
+    velocity[order] = sorted_velocity * frame_rate
+    return velocity
+
+def overall_stability(load_velocity: np.ndarray) -> float:
+    """
+    Mean absolute load velocity over every reading in N/s, lower being more stable.
+    """
+    return float(np.abs(np.nan_to_num(load_velocity)).mean())
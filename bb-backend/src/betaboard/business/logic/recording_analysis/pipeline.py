@@ -0,0 +1,95 @@
+import dataclasses
+import typing
+
+@dataclasses.dataclass(frozen=True)
+class Stage:
+    """
+    A product of the analysis pipeline and how to compute it.
+
+    Args:
+        name: Name of the product
+        inputs: Names of the products passed positionally to `func`
+        func: Computes the product from its inputs
+    """
+    name: str
+    inputs: typing.Tuple[str, ...]
+    func: typing.Callable[..., typing.Any]
+
+class Pipeline:
+    """
+    Declarative stage graph that computes each requested product at most once per run.
+
+    Products are computed on demand, so requesting a subset of outputs only runs the stages
+    those outputs depend on.
+    """
+    def __init__(self, stages: typing.Iterable[Stage]):
+        self._stages = {}
+        for stage in stages:
+            if stage.name in self._stages:
+                raise ValueError(f"Duplicate pipeline stage: {stage.name}")
+            self._stages[stage.name] = stage
+
+    @property
+    def products(self) -> typing.List[str]:
+        """Names of every product the pipeline can compute."""
+        return list(self._stages)
+
+    def dependencies(self, outputs: typing.Iterable[str]) -> typing.Set[str]:
+        """
+        Names of every product computing `outputs` requires, including the outputs themselves.
+
+        Products without a stage are expected as sources and included without their inputs.
+        """
+        required = set()
+        pending = list(outputs)
+        while pending:
+            name = pending.pop()
+            if name in required:
+                continue
+            required.add(name)
+            if name in self._stages:
+                pending.extend(self._stages[name].inputs)
+        return required
+
+    def run(
+        self,
+        sources: typing.Dict[str, typing.Any],
+        outputs: typing.Iterable[str],
+    ) -> typing.Dict[str, typing.Any]:
+        """
+        Computes the requested outputs.
+
+        Args:
+            sources: Products that are given rather than computed, keyed by name.
+            outputs: Names of the products to return.
+
+        Returns:
+            Dict[str, Any]: The requested products, keyed by name.
+
+        Raises:
+            ValueError: If a product is unknown or the stages form a cycle.
+        """
+        products = dict(sources)
+        outputs = list(outputs)
+        for output in outputs:
+            self._resolve(output, products, visiting=())
+        return {output: products[output] for output in outputs}
+
+    def _resolve(
+        self,
+        name: str,
+        products: typing.Dict[str, typing.Any],
+        visiting: typing.Tuple[str, ...],
+    ) -> None:
+        """Computes a product and its missing inputs depth first, memoizing into `products`."""
+        if name in products:
+            return
+        if name in visiting:
+            raise ValueError(f"Pipeline cycle: {' -> '.join(visiting + (name,))}")
+        if name not in self._stages:
+            raise ValueError(f"Unknown pipeline product: {name}")
+
+        stage = self._stages[name]
+        for input_name in stage.inputs:
+            self._resolve(input_name, products, visiting + (name,))
+        products[name] = stage.func(*(products[input_name] for input_name in stage.inputs))
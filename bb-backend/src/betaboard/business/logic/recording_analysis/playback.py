@@ -0,0 +1,116 @@
+import typing
+import warnings
+
+import numpy as np
+
+import betaboard.business.models.recordings as recordings_model
+
+PYRAMID_FACTORS = (1, 4, 16, 64)
+
+def build_playback_pyramid(
+    packed_readings: recordings_model.PackedSensorReadingsModel,
+    factors: typing.Sequence[int] = PYRAMID_FACTORS,
+) -> typing.List[recordings_model.PlaybackLevelModel]:
+    """
+    Builds a min/max/mean decimation pyramid of the hold force vectors.
+
+    Each level aggregates `factor` consecutive frames per bin, for the x, y and force magnitude
+    channels of every hold. The last bin of a level may cover fewer frames.
+
+    Args:
+        packed_readings: The recording's packed sensor readings.
+        factors: The decimation factor of each level.
+
+    Returns:
+        List[PlaybackLevelModel]: One level per factor, in the order given.
+    """
+    x = packed_readings.x.astype(np.float32)
+    y = packed_readings.y.astype(np.float32)
+    channels = np.stack([x, y, np.hypot(x, y)], axis=-1)
+
+    return [
+        recordings_model.PlaybackLevelModel(
+            factor=factor,
+            hold_ids=list(packed_readings.hold_ids),
+            stats=_decimate(channels, factor),
+        )
+        for factor in factors
+    ]
+
+def select_factor(
+    levels: typing.Dict[int, int],
+    max_bins: typing.Optional[int] = None,
+) -> int:
+    """
+    Selects the finest pyramid level that fits within a bin budget.
+
+    Args:
+        levels: Bin count of each available level, keyed by factor.
+        max_bins: Maximum number of bins the caller can use, or None for full resolution.
+
+    Returns:
+        int: The selected factor, or the coarsest one if none fit.
+    """
+    factors = sorted(levels)
+    if max_bins is None:
+        return factors[0]
+    for factor in factors:
+        if levels[factor] <= max_bins:
+            return factor
+    return factors[-1]
+
+def to_playbacks(
+    level: recordings_model.PlaybackLevelModel,
+    frame_rate: float,
+) -> typing.List[dict]:
+    """
+    Converts a pyramid level into per-hold playbacks.
+
+    Args:
+        level: The pyramid level (or window of one) to convert.
+        frame_rate: Sensor frame rate of the recording in Hz.
+
+    Returns:
+        List[dict]: One playback per hold, each channel holding min, max and mean series.
+    """
+    # NaN marks bins without readings, which the app's JSON provider sends as null
+    stats = level.stats
+    return [
+        {
+            'hold_id': hold_id,
+            'frequency': frame_rate / level.factor,
+            'factor': level.factor,
+            'start_bin': level.start_bin,
+            'data': {
+                channel: {
+                    stat: stats[:, hold_index, channel_index, stat_index]
+                    for stat_index, stat in enumerate(recordings_model.PLAYBACK_STATS)
+                }
+                for channel_index, channel in enumerate(recordings_model.PLAYBACK_CHANNELS)
+            },
+        }
+        for hold_index, hold_id in enumerate(level.hold_ids)
+    ]
+
+def _decimate(channels: np.ndarray, factor: int) -> np.ndarray:
+    """
+    Aggregates (frames, holds, channels) into (bins, holds, channels, stats) with `factor` frames per bin.
+    """
+    frame_count, hold_count, channel_count = channels.shape
+    bin_count = -(-frame_count // factor)
+
+    # Pad the last bin with NaN so the frames reshape into whole bins
+    padded = np.full((bin_count * factor, hold_count, channel_count), np.nan, dtype=np.float32)
+    padded[:frame_count] = channels
+    bins = padded.reshape(bin_count, factor, hold_count, channel_count)
+
+    # Bins where a hold has no readings are expected and stay NaN
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        stats = np.stack([
+            np.nanmin(bins, axis=1),
+            np.nanmax(bins, axis=1),
+            np.nanmean(bins, axis=1),
+        ], axis=-1)
+
+    return stats.astype(np.float32)
@@ -2,11 +2,19 @@ import pandas as pd
 import plotly.express as px
 import numpy as np
 
-def generate_load_time_series_plot(df: pd.DataFrame) -> dict:
+DEFAULT_MAX_POINTS_PER_TRACE = 1000
+
+def generate_load_time_series_plot(
+    df: pd.DataFrame,
+    max_points_per_trace: int = DEFAULT_MAX_POINTS_PER_TRACE
+) -> dict:
     """
     Generates a Plotly figure showing the load over time per hold.
+
+    Each hold's trace is downsampled to at most `max_points_per_trace` points (None to disable).
     """
     df = df.fillna(0)
+    df = _downsample_traces(df, 'force_magnitude', max_points_per_trace)
     fig = px.line(
         df,
         x='time',
@@ -19,18 +27,24 @@ def generate_load_time_series_plot(df: pd.DataFrame) -> dict:
         },
     )
     fig = _update_plot_style(fig)
-    fig_dict = fig.to_dict()
-    return _convert_plotly_dict_to_native(fig_dict)
+    return fig.to_dict()
 
-def generate_load_distribution_plot(df: pd.DataFrame) -> dict:
+def generate_load_distribution_plot(
+    df: pd.DataFrame,
+    max_points_per_trace: int = DEFAULT_MAX_POINTS_PER_TRACE
+) -> dict:
     """
     Generates a Plotly figure showing the load distribution over time per hold.
+
+    The traces are stacked, so they are downsampled to a shared set of at most
+    `max_points_per_trace` frames (None to disable).
     """
     df_total_force = df.groupby('frame')['force_magnitude'].sum().reset_index()
     
     df = df.merge(df_total_force, on='frame', suffixes=('', '_total'))
     df['load_percentage'] = (df['force_magnitude'] / df['force_magnitude_total']) * 100
     df = df.fillna(0)
+    df = _downsample_frames(df, 'load_percentage', max_points_per_trace)
     
     fig = px.area(
         df,
@@ -44,14 +58,19 @@ def generate_load_distribution_plot(df: pd.DataFrame) -> dict:
         },
     )
     fig = _update_plot_style(fig)
-    fig_dict = fig.to_dict()
-    return _convert_plotly_dict_to_native(fig_dict)
+    return fig.to_dict()
 
-def generate_load_stability_plot(df: pd.DataFrame) -> dict:
+def generate_load_stability_plot(
+    df: pd.DataFrame,
+    max_points_per_trace: int = DEFAULT_MAX_POINTS_PER_TRACE
+) -> dict:
     """
     Generates a Plotly figure showing load velocity over time per hold.
+
+    Each hold's trace is downsampled to at most `max_points_per_trace` points (None to disable).
     """
     df = df.fillna(0)
+    df = _downsample_traces(df, 'load_velocity', max_points_per_trace)
     fig = px.line(
         df,
         x='time',
@@ -64,8 +83,95 @@ def generate_load_stability_plot(df: pd.DataFrame) -> dict:
         },
     )
     fig = _update_plot_style(fig)
-    fig_dict = fig.to_dict()
-    return _convert_plotly_dict_to_native(fig_dict)
+    return fig.to_dict()
+
+def _downsample_traces(df: pd.DataFrame, y_column: str, max_points: int) -> pd.DataFrame:
+    """
+    Downsamples each hold's time series to at most `max_points` rows using LTTB.
+    """
+    if max_points is None:
+        return df
+
+    times = df['time'].to_numpy(dtype=float)
+    values = df[y_column].to_numpy(dtype=float)
+    keep = np.zeros(len(df), dtype=bool)
+    for positions in df.groupby('hold_number', sort=False, dropna=False).indices.values():
+        keep[positions[_lttb_indices(times[positions], values[positions], max_points)]] = True
+    return df[keep]
+
+def _downsample_frames(df: pd.DataFrame, y_column: str, max_points: int) -> pd.DataFrame:
+    """
+    Downsamples all holds to a shared set of at most `max_points` frames.
+
+    Every hold picks its most significant frames with LTTB from an equal share of the budget,
+    and all holds keep the union of those frames so stacked traces stay aligned.
+    """
+    if max_points is None:
+        return df
+
+    groups = df.groupby('hold_number', sort=False, dropna=False).indices
+    points_per_hold = max(max_points // max(len(groups), 1), 3)
+
+    times = df['time'].to_numpy(dtype=float)
+    values = df[y_column].to_numpy(dtype=float)
+    frames = df['frame'].to_numpy()
+    keep_frames = [
+        frames[positions[_lttb_indices(times[positions], values[positions], points_per_hold)]]
+        for positions in groups.values()
+    ]
+    if not keep_frames:
+        return df
+    return df[np.isin(frames, np.concatenate(keep_frames))]
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Selects `n_out` indices of a series with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. Interior points are split into `n_out - 2` buckets,
+    and each bucket keeps the point forming the largest triangle with its neighbouring buckets.
+    The previous bucket's average stands in for its selected point, so all buckets are scored in
+    one vectorized pass.
+
+    Args:
+        x: Monotonically increasing x values.
+        y: y values.
+        n_out: Number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket boundaries over the interior points [1, n - 1)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    starts = edges[:-1]
+    sizes = np.diff(edges)
+
+    # Pad the buckets into a (buckets, max size) grid of indices
+    offsets = np.arange(sizes.max())
+    valid = offsets[None, :] < sizes[:, None]
+    indices = np.where(valid, starts[:, None] + offsets[None, :], starts[:, None])
+    bucket_x = x[indices]
+    bucket_y = y[indices]
+
+    # Average of every bucket, with the fixed endpoints around them
+    counts = np.maximum(sizes, 1)
+    mean_x = np.where(valid, bucket_x, 0).sum(axis=1) / counts
+    mean_y = np.where(valid, bucket_y, 0).sum(axis=1) / counts
+    anchor_x = np.concatenate([[x[0]], mean_x, [x[-1]]])
+    anchor_y = np.concatenate([[y[0]], mean_y, [y[-1]]])
+    prev_x, prev_y = anchor_x[:-2, None], anchor_y[:-2, None]
+    next_x, next_y = anchor_x[2:, None], anchor_y[2:, None]
+
+    areas = np.abs(
+        (prev_x - next_x) * (bucket_y - prev_y) - (prev_x - bucket_x) * (next_y - prev_y)
+    )
+    areas = np.where(valid, areas, -np.inf)
+    selected = indices[np.arange(len(starts)), areas.argmax(axis=1)]
+
+    return np.concatenate([[0], selected, [n - 1]])
 
 def _update_plot_style(fig):
     fig.update_layout(
@@ -100,19 +206,3 @@ def _update_plot_style(fig):
         ticklen=5
     )
     return fig
-
-
-def _convert_plotly_dict_to_native(d: dict) -> dict:
-    """
-    Recursively convert all numpy/pandas types to native Python types.
-    """
-    if isinstance(d, dict):
-        return {k: _convert_plotly_dict_to_native(v) for k, v in d.items()}
-    elif isinstance(d, list):
-        return [_convert_plotly_dict_to_native(v) for v in d]
-    elif isinstance(d, (np.integer, np.floating)):
-        return float(d)
-    elif isinstance(d, np.ndarray):
-        return d.tolist()
-    else:
-        return d
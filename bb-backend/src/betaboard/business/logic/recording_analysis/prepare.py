@@ -1,25 +1,74 @@
+import typing
+
 import pandas as pd
 import numpy as np
 
-def prepare_sensor_dataframe(sensor_readings, frame_rate):
+import betaboard.business.logic.recording_analysis.metrics as metrics
+import betaboard.business.models.recordings as recordings_model
+
+SensorReadings = typing.Union[
+    typing.List[typing.List[recordings_model.SensorReadingModel]],
+    recordings_model.PackedSensorReadingsModel,
+]
+
+def prepare_sensor_dataframe(sensor_readings: SensorReadings, frame_rate):
     """
     Prepares the base DataFrame for sensor analysis.
+
+    Accepts either a list of sensor reading frames or packed frame-major readings, and builds
+    the frame straight from contiguous column arrays with one row per reading.
     """
-    data = []
-    for frame_index, frame in enumerate(sensor_readings):
-        for reading in frame:
-            data.append({
-                'frame': frame_index,
-                'time': frame_index / frame_rate,
-                'hold_id': reading.hold_id,
-                'x': reading.x,
-                'y': reading.y,
-                'force_magnitude': np.sqrt(reading.x ** 2 + reading.y ** 2),
-            })
-    df = pd.DataFrame(data)
-    df.fillna(0, inplace=True)
+    if isinstance(sensor_readings, recordings_model.PackedSensorReadingsModel):
+        frame, hold_index, x, y = _columns_from_packed(sensor_readings)
+        hold_ids = [str(hold_id) for hold_id in sensor_readings.hold_ids]
+    else:
+        frame, hold_index, x, y, hold_ids = _columns_from_frames(sensor_readings)
+
+    df = pd.DataFrame({
+        'frame': frame,
+        'time': frame / frame_rate,
+        'hold_id': pd.Categorical.from_codes(hold_index, categories=hold_ids),
+        'x': x,
+        'y': y,
+        'force_magnitude': np.hypot(x, y),
+    })
+    df.fillna({'x': 0, 'y': 0, 'force_magnitude': 0}, inplace=True)
     return df
 
+def _columns_from_packed(packed_readings: recordings_model.PackedSensorReadingsModel):
+    """
+    Flattens packed (frames, holds) readings into frame-major columns, skipping missing readings.
+    """
+    present = ~(np.isnan(packed_readings.x) | np.isnan(packed_readings.y))
+    frame, hold_index = np.nonzero(present)
+    return (
+        frame + packed_readings.start_frame,
+        hold_index,
+        packed_readings.x[present].astype(np.float64),
+        packed_readings.y[present].astype(np.float64),
+    )
+
+def _columns_from_frames(sensor_readings: typing.List[typing.List[recordings_model.SensorReadingModel]]):
+    """
+    Flattens sensor reading frames into frame-major columns.
+    """
+    frame_sizes = np.fromiter((len(frame) for frame in sensor_readings), dtype=np.int64, count=len(sensor_readings))
+    readings = [reading for frame in sensor_readings for reading in frame]
+
+    hold_codes = {}
+    hold_index = np.fromiter(
+        (hold_codes.setdefault(str(reading.hold_id), len(hold_codes)) for reading in readings),
+        dtype=np.int64,
+        count=len(readings),
+    )
+    return (
+        np.repeat(np.arange(len(sensor_readings)), frame_sizes),
+        hold_index,
+        np.fromiter((reading.x for reading in readings), dtype=np.float64, count=len(readings)),
+        np.fromiter((reading.y for reading in readings), dtype=np.float64, count=len(readings)),
+        list(hold_codes),
+    )
+
 def prepare_load_percentage(df):
     """
     Prepares the DataFrame for the load percentage visualization.
@@ -30,14 +79,15 @@ def prepare_load_percentage(df):
     df['load_percentage'] = df['load_percentage'].fillna(0).astype(float)
     return df
 
-def prepare_load_velocity(df, frame_rate):
+def prepare_load_velocity(df, frame_rate, load_velocity=None):
     """
     Prepares a DataFrame with a new 'load_velocity' column.
 
     This is done by calculating the absolute rate of change of force magnitude (load velocity) per hold.
+    A signed load velocity already computed by `metrics.calculate_load_velocity` can be passed in.
     """
     df = df.copy()
-    df['load_velocity'] = df.groupby('hold_id')['force_magnitude'].diff() * frame_rate
-    df['load_velocity'] = df['load_velocity'].fillna(0).astype(float)
-    df['load_velocity'] = df['load_velocity'].abs()
+    if load_velocity is None:
+        load_velocity = metrics.calculate_load_velocity(metrics.SensorArrays.from_dataframe(df), frame_rate)
+    df['load_velocity'] = np.abs(np.nan_to_num(load_velocity))
     return df
\ No newline at end of file
@@ -0,0 +1,42 @@
+import hashlib
+
+import betaboard.business.logic.route as route_logic
+import betaboard.business.models.holds as holds_model
+import betaboard.db.dao.recording_dao as recording_dao
+
+# Bump whenever a change to the analysis alters its results, to invalidate cached results
+ANALYSIS_VERSION = 5
+
+# Key of stored results holding the revision of the route's hold numbering they were computed with
+HOLDS_REVISION_KEY = 'holds_revision'
+
+def get_hold_numbers(holds: list[holds_model.HoldModel]):
+    # Assign numbers to holds based on their position
+    holds.sort(key=lambda x: (x.bbox[1], x.bbox[0]), reverse=True)
+    hold_numbers = {hold.id: index + 1 for index, hold in enumerate(holds)}
+    return hold_numbers
+
+def load_hold_numbers(route_id: str):
+    # Get route and holds
+    route = route_logic.get_route(route_id)
+    return get_hold_numbers(route.holds)
+
+def holds_revision(hold_numbers: dict) -> str:
+    """Revision of a route's hold numbering, which changes when its holds are edited."""
+    key = repr(sorted((str(hold_id), number) for hold_id, number in hold_numbers.items()))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+def save_key_metrics(recording_id: str, key_metrics: dict, hold_numbers: dict) -> None:
+    """
+    Stores key metrics computed outside the analysis pipeline as a recording's only results, so
+    the analysis does not compute them again.
+
+    Args:
+        recording_id: ID of the recording.
+        key_metrics: The key metrics, as `metrics.compute_key_metrics` returns them.
+        hold_numbers: Hold number of each hold ID the key metrics were computed with.
+    """
+    recording_dao.RecordingDAO.save_analysis_results(recording_id, ANALYSIS_VERSION, {
+        'key_metrics': key_metrics,
+        HOLDS_REVISION_KEY: holds_revision(hold_numbers),
+    })
@@ -0,0 +1,197 @@
+import typing
+
+import numpy as np
+
+import betaboard.business.logic.recording_analysis.comparison as comparison
+import betaboard.business.logic.recording_analysis.metrics as metrics
+import betaboard.business.models.recordings as recordings_model
+
+class StreamingMetrics:
+    """
+    Incremental key metrics of a recording, consuming sensor frames one at a time.
+
+    Only running totals are kept: reading and active frame counts, load sums, the running peak,
+    Welford running mean and variance of each hold's load and of its load velocity, and the last
+    load of each hold to difference the next reading against. `key_metrics` gives the same
+    metrics as `metrics.compute_key_metrics` over the frames added so far, up to floating point
+    summation order, so it can be read live during an attempt.
+
+    A frame holds at most one reading per hold. Holds are numbered in the order of `hold_ids`,
+    then in the order they are first seen, as in `prepare.prepare_sensor_dataframe`.
+    """
+    def __init__(
+        self,
+        frame_rate: float,
+        hold_ids: typing.Optional[typing.List[str]] = None,
+        climber_mass: float = metrics.DEFAULT_CLIMBER_MASS,
+    ):
+        self.frame_rate = frame_rate
+        self.climber_mass = climber_mass
+        self.frame_count = 0
+        self.active_frame_count = 0
+        self.reading_count = 0
+        self.peak_load = float('nan')
+
+        self._hold_codes: typing.Dict[str, int] = {}
+        self._potential_energy = 0.0
+        self._load_sum = 0.0
+        self._abs_load_velocity_sum = 0.0
+
+        # Per hold running statistics, indexed by hold code
+        self._load_counts = np.zeros(0, dtype=np.int64)
+        self._load_means = np.zeros(0)
+        self._load_m2 = np.zeros(0)
+        self._load_peaks = np.zeros(0)
+        self._loaded_frames = np.zeros(0, dtype=np.int64)
+        self._last_loads = np.zeros(0)
+        self._velocity_counts = np.zeros(0, dtype=np.int64)
+        self._velocity_means = np.zeros(0)
+        self._velocity_m2 = np.zeros(0)
+
+        for hold_id in hold_ids or []:
+            self._hold_code(hold_id)
+
+    @property
+    def hold_ids(self) -> typing.List[str]:
+        return list(self._hold_codes)
+
+    def add_frame(self, readings: typing.Iterable[recordings_model.SensorReadingModel]) -> None:
+        """Adds the next sensor frame."""
+        readings = list(readings)
+        self._add(
+            np.fromiter((self._hold_code(str(reading.hold_id)) for reading in readings), dtype=np.int64, count=len(readings)),
+            np.fromiter((reading.x for reading in readings), dtype=np.float64, count=len(readings)),
+            np.fromiter((reading.y for reading in readings), dtype=np.float64, count=len(readings)),
+        )
+
+    def add_packed_readings(self, packed_readings: recordings_model.PackedSensorReadingsModel) -> None:
+        """Adds every frame of packed readings in order, NaN readings being missing."""
+        hold_codes = np.array([self._hold_code(str(hold_id)) for hold_id in packed_readings.hold_ids], dtype=np.int64)
+        present = ~(np.isnan(packed_readings.x) | np.isnan(packed_readings.y))
+        for x_row, y_row, present_row in zip(packed_readings.x, packed_readings.y, present):
+            self._add(
+                hold_codes[present_row],
+                x_row[present_row].astype(np.float64),
+                y_row[present_row].astype(np.float64),
+            )
+
+    def key_metrics(self, hold_numbers: dict) -> dict:
+        """
+        The key metrics of the frames added so far, as computed by `metrics.compute_key_metrics`.
+
+        Args:
+            hold_numbers: Hold number of each hold ID.
+        """
+        duration = self.active_frame_count * (1 / self.frame_rate)
+        energy = self._potential_energy + self._load_sum * (1.0 / self.frame_rate)
+
+        average_load_per_hold = []
+        for hold_id, hold_code in self._hold_codes.items():
+            if self._load_counts[hold_code] == 0:
+                continue
+            hold_number = hold_numbers.get(hold_id)
+            average_load_per_hold.append({
+                'hold_id': hold_id,
+                'force_magnitude': float(self._load_means[hold_code]),
+                'hold_number': int(hold_number) if hold_number is not None else None,
+            })
+
+        return {
+            'active_duration': float(duration),
+            'energy_expenditure': float(energy),
+            'energy_expenditure_rate': float(energy / duration) if duration > 0 else 0.0,
+            'peak_load': self.peak_load,
+            'peak_load_rate': self.peak_load / self.frame_rate if self.frame_rate > 0 else 0.0,
+            'average_load_per_hold': average_load_per_hold,
+            'overall_stability': (
+                self._abs_load_velocity_sum / self.reading_count if self.reading_count else float('nan')
+            ),
+        }
+
+    def hold_statistics(self) -> typing.List[dict]:
+        """
+        Running statistics of each hold with readings.
+
+        Time loaded counts the frames above `comparison.MIN_ENGAGEMENT_LOAD`, as the comparison's
+        relative engagement threshold needs the hold's final peak.
+        """
+        statistics = []
+        for hold_id, hold_code in self._hold_codes.items():
+            load_count = self._load_counts[hold_code]
+            if load_count == 0:
+                continue
+            velocity_count = self._velocity_counts[hold_code]
+            statistics.append({
+                'hold_id': hold_id,
+                'reading_count': int(load_count),
+                'mean_load': float(self._load_means[hold_code]),
+                'load_variance': float(self._load_m2[hold_code] / load_count),
+                'peak_load': float(self._load_peaks[hold_code]),
+                'time_loaded': float(self._loaded_frames[hold_code] / self.frame_rate),
+                'mean_load_velocity': float(self._velocity_means[hold_code]) if velocity_count else None,
+                'load_velocity_variance': (
+                    float(self._velocity_m2[hold_code] / velocity_count) if velocity_count else None
+                ),
+            })
+        return statistics
+
+    def _hold_code(self, hold_id: str) -> int:
+        hold_code = self._hold_codes.setdefault(hold_id, len(self._hold_codes))
+        if hold_code == len(self._load_counts):
+            self._grow(max(2 * len(self._load_counts), 8))
+        return hold_code
+
+    def _grow(self, size: int) -> None:
+        """Extends the per hold arrays to `size` holds."""
+        def extend(array):
+            return np.concatenate([array, np.zeros(size - len(array), dtype=array.dtype)])
+
+        self._load_counts = extend(self._load_counts)
+        self._load_means = extend(self._load_means)
+        self._load_m2 = extend(self._load_m2)
+        self._load_peaks = extend(self._load_peaks)
+        self._loaded_frames = extend(self._loaded_frames)
+        self._last_loads = extend(self._last_loads)
+        self._velocity_counts = extend(self._velocity_counts)
+        self._velocity_means = extend(self._velocity_means)
+        self._velocity_m2 = extend(self._velocity_m2)
+
+    def _add(self, hold_codes: np.ndarray, x: np.ndarray, y: np.ndarray) -> None:
+        """Adds one frame's readings, vectorized over its holds."""
+        self.frame_count += 1
+        if hold_codes.size == 0:
+            return
+
+        load = np.hypot(x, y)
+        dt = 1.0 / self.frame_rate
+        self.active_frame_count += 1
+        self.reading_count += hold_codes.size
+        self.peak_load = float(np.fmax(self.peak_load, load.max()))
+        self._potential_energy += self.climber_mass * metrics.GRAVITY * (0.5 * (y / self.climber_mass) * (dt ** 2)).sum()
+        self._load_sum += load.sum()
+
+        # Load velocity against each hold's previous reading, none for a hold's first reading
+        seen = self._load_counts[hold_codes] > 0
+        velocity = (load - self._last_loads[hold_codes]) * self.frame_rate
+        self._abs_load_velocity_sum += np.abs(velocity[seen]).sum()
+        self._welford(self._velocity_counts, self._velocity_means, self._velocity_m2, hold_codes[seen], velocity[seen])
+
+        self._welford(self._load_counts, self._load_means, self._load_m2, hold_codes, load)
+        self._load_peaks[hold_codes] = np.maximum(self._load_peaks[hold_codes], load)
+        self._loaded_frames[hold_codes] += load > comparison.MIN_ENGAGEMENT_LOAD
+        self._last_loads[hold_codes] = load
+
+    @staticmethod
+    def _welford(
+        counts: np.ndarray,
+        means: np.ndarray,
+        m2: np.ndarray,
+        hold_codes: np.ndarray,
+        values: np.ndarray,
+    ) -> None:
+        """Welford update of the running mean and squared deviation sum of each hold, in place."""
+        count = counts[hold_codes] + 1
+        delta = values - means[hold_codes]
+        means[hold_codes] += delta / count
+        m2[hold_codes] += delta * (values - means[hold_codes])
+        counts[hold_codes] = count
@@ -1,15 +1,29 @@
 import datetime
-import io
+import os
 import typing
 
 import flask
 import numpy as np
 
+import betaboard.business.logic.jobs as jobs
+import betaboard.business.logic.recording_analysis.playback as playback
+import betaboard.business.logic.recording_analysis.stored_results as stored_results
+import betaboard.business.logic.recording_analysis.streaming as streaming
+import betaboard.business.models.jobs as jobs_model
 import betaboard.business.models.recordings as recordings_model
 import betaboard.db.dao.recording_dao as recording_dao
 import betaboard.db.dao.route_dao as route_dao
 import betaboard.db.dao.hold_dao as hold_dao
 
+SENSOR_FRAME_RATE = 10  # Hz
+
+# Background jobs that process a stopped recording
+INGEST_SENSOR_READINGS_JOB = 'ingest_sensor_readings'
+UPLOAD_VIDEO_JOB = 'upload_video'
+PRECOMPUTE_ANALYSIS_JOB = 'precompute_analysis'
+ANALYZE_KINEMATICS_JOB = 'analyze_kinematics'
+# Builds the playback pyramid of a recording ingested before pyramids were stored
+BUILD_PLAYBACK_JOB = 'build_playback'
 
 def start_recording(route_id: str) -> recordings_model.RecordingModel:
     """
@@ -45,7 +59,11 @@ def start_recording(route_id: str) -> recordings_model.RecordingModel:
 
 def stop_recording(recording_id: str) -> recordings_model.RecordingModel:
     """
-    Stop recording a climbing attempt, save the video, and generate sensor data.
+    Stop recording a climbing attempt and queue its processing.
+
+    The video is spooled to local disk and the recording is marked 'processing'. Uploading the
+    video, ingesting sensor data and precomputing the analysis run as background jobs, and the
+    recording is marked 'completed' once its video and sensor data are stored.
 
     Args:
         recording_id (str): The ID of the recording to stop.
@@ -56,50 +74,34 @@ def stop_recording(recording_id: str) -> recordings_model.RecordingModel:
     Raises:
         ValueError: If recording not found or services fail.
     """
-    # Generate simulated sensor data
     end_time = datetime.datetime.now(datetime.timezone.utc)
 
-    # Get the current recording
-    recording = recording_dao.RecordingDAO.get_recording_by_id(recording_id)
+    # Verify recording exists
+    recording_dao.RecordingDAO.get_recording_by_id(recording_id)
     
     # Get services
     camera_client = flask.current_app.extensions['camera_service']
-    s3_client = flask.current_app.extensions['s3']
 
     try:
-        # Stop recording and get video data
-        video_data = camera_client.stop_recording()
-
-        # Upload video to S3
-        video_file = io.BytesIO(video_data)
-        s3_key = s3_client.upload_file(video_file)
-
-        # Get route and hold information for sensor simulation
-        route_model = route_dao.RouteDAO.get_route_by_id(recording.route_id)
-        hold_ids = [hold.id for hold in route_model.holds]
-
-        sensor_reading_frames = _simulate_recording(recording.start_time, end_time, hold_ids)
-
-        # Transform sensor readings to SensorReadingModel instances
-        sensor_readings_models = [
-            [
-                recordings_model.SensorReadingModel(
-                    hold_id=sensor_reading['hold_id'],
-                    x=sensor_reading['x'],
-                    y=sensor_reading['y'],
-                )
-                for sensor_reading in frame
-            ]
-            for frame in sensor_reading_frames
-        ]
+        # Stop recording and spool the video for the upload job
+        video_path = _spool_video_path(recording_id)
+        camera_client.stop_recording_to_file(video_path)
 
-        # Update recording with all data
         recording_model = recording_dao.RecordingDAO.update_recording(
             recording_id=recording_id,
             end_time=end_time,
-            video_s3_key=s3_key,
-            status='completed',
-            sensor_readings=sensor_readings_models
+            status='processing',
+        )
+
+        jobs.enqueue(
+            INGEST_SENSOR_READINGS_JOB,
+            {'recording_id': recording_id},
+            recording_id=recording_id,
+        )
+        jobs.enqueue(
+            UPLOAD_VIDEO_JOB,
+            {'recording_id': recording_id, 'video_path': video_path},
+            recording_id=recording_id,
         )
 
         return recording_model
@@ -113,20 +115,241 @@ def stop_recording(recording_id: str) -> recordings_model.RecordingModel:
         raise ValueError(f"Failed to stop recording: {str(e)}")
 
 
+def _fail_processing(job: jobs_model.JobModel) -> None:
+    """Mark a recording failed once one of its processing jobs has run out of attempts."""
+    recording_dao.RecordingDAO.update_recording(
+        recording_id=job.recording_id,
+        status='failed'
+    )
+
+
+@jobs.register_handler(INGEST_SENSOR_READINGS_JOB, on_failure=_fail_processing)
+def _ingest_sensor_readings(recording_id: str) -> None:
+    """Generate and store a stopped recording's sensor data, playback levels and key metrics."""
+    recording = recording_dao.RecordingDAO.get_recording_by_id(recording_id)
+
+    # Get route and hold information for sensor simulation
+    route_model = route_dao.RouteDAO.get_route_by_id(recording.route_id)
+    hold_ids = [hold.id for hold in route_model.holds]
+
+    # Accumulate the key metrics frame by frame as the readings arrive, so they are stored with
+    # the readings rather than computed by the analysis
+    streamed_metrics = streaming.StreamingMetrics(SENSOR_FRAME_RATE, hold_ids=hold_ids)
+    sensor_reading_frames = _simulate_recording(
+        recording.start_time,
+        recording.end_time,
+        hold_ids,
+        on_frame=lambda frame: streamed_metrics.add_frame(_stored_readings(frame)),
+    )
+
+    # Pack sensor readings straight into frame-major arrays
+    packed_readings = _pack_simulated_frames(sensor_reading_frames, hold_ids)
+    recording_dao.RecordingDAO.update_recording(
+        recording_id=recording_id,
+        sensor_readings=packed_readings
+    )
+
+    # Precompute the playback levels of detail
+    recording_dao.RecordingDAO.save_playback_levels(
+        recording_id,
+        playback.build_playback_pyramid(packed_readings),
+    )
+
+    hold_numbers = stored_results.get_hold_numbers(list(route_model.holds))
+    stored_results.save_key_metrics(recording_id, streamed_metrics.key_metrics(hold_numbers), hold_numbers)
+
+    _complete_processing(recording_id)
+
+
+@jobs.register_handler(UPLOAD_VIDEO_JOB, on_failure=_fail_processing)
+def _upload_video(recording_id: str, video_path: str) -> None:
+    """Upload a stopped recording's spooled video to S3."""
+    recording = recording_dao.RecordingDAO.get_recording_by_id(recording_id)
+
+    s3_client = flask.current_app.extensions['s3']
+
+    # A retry after the key was stored only has the spooled file left to hand over
+    s3_key = recording.video_s3_key
+    if s3_key is None:
+        with open(video_path, 'rb') as video_file:
+            s3_key = s3_client.upload_file(video_file)
+        recording_dao.RecordingDAO.update_recording(
+            recording_id=recording_id,
+            video_s3_key=s3_key
+        )
+
+    # Keep the video in the local cache for the kinematics job
+    if os.path.exists(video_path):
+        s3_client.add_to_cache(s3_key, video_path)
+
+    _complete_processing(recording_id)
+
+
+@jobs.register_handler(BUILD_PLAYBACK_JOB)
+def _build_playback(recording_id: str) -> None:
+    """Build and store the playback pyramid of a recording from its stored readings."""
+    packed_readings = recording_dao.RecordingDAO.get_sensor_readings(recording_id)
+    if packed_readings.frame_count == 0:
+        return
+    recording_dao.RecordingDAO.save_playback_levels(
+        recording_id,
+        playback.build_playback_pyramid(packed_readings),
+    )
+
+
+def enqueue_missing_playbacks() -> int:
+    """
+    Queues building the playback pyramid of every recording with readings but no pyramid.
+
+    Returns:
+        int: Number of recordings queued.
+    """
+    recording_ids = recording_dao.RecordingDAO.get_recording_ids_without_playback()
+    for recording_id in recording_ids:
+        jobs.enqueue(BUILD_PLAYBACK_JOB, {'recording_id': recording_id}, recording_id=recording_id)
+    return len(recording_ids)
+
+
+def _complete_processing(recording_id: str) -> None:
+    """Complete a recording once all its data is stored, and queue its analysis."""
+    if recording_dao.RecordingDAO.complete_processing(recording_id):
+        jobs.enqueue(
+            PRECOMPUTE_ANALYSIS_JOB,
+            {'recording_id': recording_id},
+            recording_id=recording_id,
+        )
+
+
+def _spool_video_path(recording_id: str) -> str:
+    """Path the video of a recording is spooled to until it is uploaded."""
+    spool_dir = flask.current_app.config['JOBS']['SPOOL_DIR']
+    os.makedirs(spool_dir, exist_ok=True)
+    return os.path.join(spool_dir, f'recording-{recording_id}.mp4')
+
+
 def get_recording(recording_id: str) -> recordings_model.RecordingModel:
     """Get a specific recording."""
     return recording_dao.RecordingDAO.get_recording_by_id(recording_id)
 
 def get_recordings(recording_ids: typing.List[str]) -> typing.List[recordings_model.RecordingModel]:
-    """Get multiple recordings by their IDs."""
+    """Get multiple recordings by their IDs, in the order of `recording_ids`."""
     return recording_dao.RecordingDAO.get_recordings_by_ids(recording_ids)
 
+def get_recording_summaries(recording_ids: typing.List[str]) -> typing.List[recordings_model.RecordingSummaryModel]:
+    """Get the summaries of multiple recordings by their IDs, without their readings."""
+    return recording_dao.RecordingDAO.get_recording_summaries_by_ids(recording_ids)
+
+def get_recording_readings(
+    recording_id: str,
+    start_frame: typing.Optional[int] = None,
+    end_frame: typing.Optional[int] = None,
+    hold_ids: typing.Optional[typing.List[str]] = None
+) -> recordings_model.PackedSensorReadingsModel:
+    """Get the sensor readings of a single recording, optionally a frame window for some holds."""
+    return recording_dao.RecordingDAO.get_sensor_readings(
+        recording_id,
+        start_frame=start_frame,
+        end_frame=end_frame,
+        hold_ids=hold_ids,
+    )
+
+def get_recording_playback(
+    recording_id: str,
+    factor: typing.Optional[int] = None,
+    max_bins: typing.Optional[int] = None,
+    start_frame: typing.Optional[int] = None,
+    end_frame: typing.Optional[int] = None
+) -> recordings_model.PlaybackLevelModel:
+    """
+    Get a recording's hold force playback at a level of detail.
+
+    The pyramid is built when the readings are ingested, or by the BUILD_PLAYBACK_JOB backfill for
+    recordings ingested before.
+
+    Args:
+        recording_id: ID of the recording.
+        factor: Decimation factor of the level to return. Takes precedence over `max_bins`.
+        max_bins: Maximum number of bins for the requested frame window, used to pick the
+            finest level that fits.
+        start_frame: First frame of the window (inclusive), defaults to the first frame.
+        end_frame: Last frame of the window (exclusive), defaults to the end of the recording.
+
+    Returns:
+        PlaybackLevelModel: The level, covering the bins that overlap the frame window.
+
+    Raises:
+        ValueError: If the recording has no playback pyramid, e.g. it is unknown or has no readings
+            yet, or the requested factor is not found.
+    """
+    bin_counts = recording_dao.RecordingDAO.get_playback_bin_counts(recording_id)
+    if not bin_counts:
+        raise ValueError(f"No playback for recording ID {recording_id}")
+
+    if factor is None:
+        # Size the budget against the window rather than the whole recording
+        frame_count = bin_counts[min(bin_counts)] * min(bin_counts)
+        window_end = frame_count if end_frame is None else end_frame
+        window_start = 0 if start_frame is None else start_frame
+        window_frames = window_end - window_start
+        window_bins = {
+            level_factor: -(-max(window_frames, 0) // level_factor)
+            for level_factor in bin_counts
+        }
+        factor = playback.select_factor(window_bins, max_bins)
+    elif factor not in bin_counts:
+        raise ValueError(f"No playback level with factor {factor}")
+
+    start_bin = None if start_frame is None else start_frame // factor
+    end_bin = None if end_frame is None else -(-end_frame // factor)
+    return recording_dao.RecordingDAO.get_playback_level(
+        recording_id,
+        factor,
+        start_bin=start_bin,
+        end_bin=end_bin,
+    )
+
 def get_recording_video_url(recording_id: str) -> str:
     """Get the video URL for a recording."""
     recording = recording_dao.RecordingDAO.get_recording_by_id(recording_id)
     s3_client = flask.current_app.extensions['s3']
     return s3_client.get_file_url(recording.video_s3_key)
 
+def _pack_simulated_frames(
+    sensor_reading_frames: typing.List[typing.List[dict]],
+    hold_ids: typing.List[str]
+) -> recordings_model.PackedSensorReadingsModel:
+    """
+    Pack simulated sensor reading frames into frame-major arrays.
+
+    Args:
+        sensor_reading_frames: Simulated frames, each holding one reading per hold in `hold_ids` order.
+        hold_ids: List of hold IDs involved in the route.
+
+    Returns:
+        PackedSensorReadingsModel: The packed readings.
+    """
+    shape = (len(sensor_reading_frames), len(hold_ids))
+    x = np.array(
+        [[reading['x'] for reading in frame] for frame in sensor_reading_frames],
+        dtype=np.float32,
+    ).reshape(shape)
+    y = np.array(
+        [[reading['y'] for reading in frame] for frame in sensor_reading_frames],
+        dtype=np.float32,
+    ).reshape(shape)
+    return recordings_model.PackedSensorReadingsModel(hold_ids=list(hold_ids), x=x, y=y)
+
+def _stored_readings(frame: typing.List[dict]) -> typing.List[recordings_model.SensorReadingModel]:
+    """A simulated frame's readings, with the float32 precision they are packed and stored with."""
+    return [
+        recordings_model.SensorReadingModel(
+            hold_id=reading['hold_id'],
+            x=float(np.float32(reading['x'])),
+            y=float(np.float32(reading['y'])),
+        )
+        for reading in frame
+    ]
+
 def _generate_smooth_load(duration_seconds, sample_rate, negative_mean=True):
     num_samples = int(duration_seconds * sample_rate)
     time = np.linspace(0, duration_seconds, num_samples)
@@ -167,7 +390,8 @@ def _simulate_recording(
     start_time: datetime.datetime,
     end_time: datetime.datetime,
     hold_ids: typing.List[str],
-    sample_rate=10
+    sample_rate=10,
+    on_frame: typing.Optional[typing.Callable[[typing.List[dict]], None]] = None,
 ) -> typing.List[typing.List[dict]]:
     """
     Simulates sensor readings for a recording.
@@ -180,6 +404,7 @@ def _simulate_recording(
         end_time: The end time of the recording.
         hold_ids: List of hold IDs involved in the route.
         sample_rate: The sample rate for sensor readings.
+        on_frame: Called with each frame as it is generated.
 
     Returns:
         List[List[dict]]: Simulated sensor readings.
@@ -268,6 +493,8 @@ def _simulate_recording(
             })
 
         sensor_reading_frames.append(frame_readings)
+        if on_frame is not None:
+            on_frame(frame_readings)
 
     return sensor_reading_frames
 
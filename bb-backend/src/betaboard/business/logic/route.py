@@ -1,5 +1,6 @@
 import typing
 
+import betaboard.business.models.recordings as recordings_model
 import betaboard.business.models.routes as routes_model
 import betaboard.db.dao.route_dao as route_dao
 import betaboard.db.dao.hold_dao as hold_dao
@@ -20,5 +21,24 @@ def create_route(name: str, description: str, grade: str, date: str, hold_ids: t
     route_dao.RouteDAO.save_route(route_model)
     return route_model
 
-def get_route_recordings(route_id: str):
-    return recording_dao.RecordingDAO.get_recordings_by_route_id(route_id)
+def get_route_recordings(
+    route_id: str,
+    limit: int = 50,
+    cursor: typing.Optional[str] = None
+) -> typing.Tuple[typing.List[recordings_model.RecordingSummaryModel], typing.Optional[str]]:
+    """
+    Get a page of recording summaries for a route, newest first.
+
+    Args:
+        route_id: ID of the route.
+        limit: Maximum number of recordings to return.
+        cursor: Cursor returned by the previous page, or None for the first page.
+
+    Returns:
+        Tuple of the recording summaries and the cursor for the next page (None on the last page).
+    """
+    return recording_dao.RecordingDAO.get_recording_summaries_by_route_id(
+        route_id,
+        limit=limit,
+        cursor=cursor,
+    )
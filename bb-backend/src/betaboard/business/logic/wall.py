@@ -35,7 +35,7 @@ def register_wall(name: str, image: PIL.Image.Image, board_annotations: list):
     for segment in hold_segments:
         hold_model = holds_model.HoldModel(
             bbox=segment.bbox,
-            mask=segment.mask,
+            mask=np.asarray(segment.mask, dtype=bool),
         )
         hold_dao.HoldDAO.save_hold(hold_model)
         hold_models.append(hold_model)
@@ -55,7 +55,7 @@ def register_wall(name: str, image: PIL.Image.Image, board_annotations: list):
 def add_hold_to_wall(
     wall_id: str,
     bbox: typing.List[int],
-    mask: typing.List[typing.List[int]]
+    mask: np.ndarray
 ) -> holds_model.HoldModel:
     """
     Add a hold to a wall with a pre-supplied mask.
@@ -63,7 +63,7 @@ def add_hold_to_wall(
     Args:
         wall_id (str): The ID of the wall.
         bbox (List[int]): The bounding box of the hold [x_min, y_min, x_max, y_max].
-        mask (List[List[int]]): The mask of the hold.
+        mask (np.ndarray): The (height, width) boolean mask of the hold within its bounding box.
 
     Returns:
         HoldModel: The added hold model.
@@ -75,7 +75,7 @@ def add_hold_to_wall(
     # Create the hold model
     hold_model = holds_model.HoldModel(
         bbox=bbox,
-        mask=mask
+        mask=np.asarray(mask, dtype=bool)
     )
     hold_dao.HoldDAO.save_hold(hold_model)
 
@@ -0,0 +1,101 @@
+import dataclasses
+import typing
+
+@dataclasses.dataclass
+class HoldUsageModel:
+    """
+    Load on one hold during one recording.
+
+    Args:
+        hold_id: ID of the hold
+        time_on_hold: Seconds the hold was engaged
+        load_sum: Sum of the load of every engaged frame in N
+        load_frames: Number of engaged frames
+        peak_load: Highest load on the hold in N
+        load_histogram: Number of engaged frames per load bin, the last bin being open ended
+    """
+    hold_id: str
+    time_on_hold: float
+    load_sum: float
+    load_frames: int
+    peak_load: float
+    load_histogram: typing.List[int]
+
+@dataclasses.dataclass
+class RecordingMetricSummaryModel:
+    """
+    Metrics of a completed recording, as aggregated into its route's analytics.
+
+    Args:
+        recording_id: ID of the recording
+        route_id: ID of the route climbed
+        active_duration: Seconds with sensor readings
+        peak_load: Highest load on any hold in N
+        energy_expenditure: Total energy expenditure in J
+        overall_stability: Mean absolute load velocity in N/s
+        holds: Usage of each engaged hold
+    """
+    recording_id: str
+    route_id: str
+    active_duration: float
+    peak_load: float
+    energy_expenditure: float
+    overall_stability: float
+    holds: typing.List[HoldUsageModel] = dataclasses.field(default_factory=list)
+
+@dataclasses.dataclass
+class HoldAnalyticsModel:
+    """
+    Usage of a hold over every summarized attempt of a route or wall.
+
+    Args:
+        hold_id: ID of the hold
+        attempt_count: Number of attempts that engaged the hold
+        time_on_hold: Total seconds the hold was engaged
+        average_load: Mean load while engaged in N
+        peak_load: Highest load on the hold in N
+        load_share: Fraction of the load of all holds carried by this hold
+        load_histogram: Number of engaged frames per load bin, the last bin being open ended
+    """
+    hold_id: str
+    attempt_count: int
+    time_on_hold: float
+    average_load: float
+    peak_load: float
+    load_share: float
+    load_histogram: typing.List[int]
+
+    def asdict(self) -> dict:
+        """Convert the model to a dictionary."""
+        return dataclasses.asdict(self)
+
+@dataclasses.dataclass
+class AnalyticsModel:
+    """
+    Aggregated metrics of every summarized attempt of a route or wall.
+
+    Args:
+        attempt_count: Number of attempts
+        average_active_duration: Mean seconds with sensor readings per attempt
+        average_stability: Mean overall stability per attempt in N/s
+        peak_load: Highest load on any hold in N
+        load_histogram_bin_width: Width of the hold load histogram bins in N
+        holds: Usage of each hold engaged in any attempt
+    """
+    attempt_count: int
+    average_active_duration: float
+    average_stability: float
+    peak_load: float
+    load_histogram_bin_width: float
+    holds: typing.List[HoldAnalyticsModel] = dataclasses.field(default_factory=list)
+
+    def asdict(self) -> dict:
+        """Convert the model to a dictionary."""
+        return {
+            'attempt_count': self.attempt_count,
+            'average_active_duration': self.average_active_duration,
+            'average_stability': self.average_stability,
+            'peak_load': self.peak_load,
+            'load_histogram_bin_width': self.load_histogram_bin_width,
+            'holds': [hold.asdict() for hold in self.holds],
+        }
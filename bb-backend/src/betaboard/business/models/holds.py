@@ -1,15 +1,28 @@
 import dataclasses
 import typing
 
+import numpy as np
+
+import betaboard.utils.encoding as encoding_utils
+
 @dataclasses.dataclass
 class HoldModel:
+    """
+    Model representing a hold on a wall.
+
+    Args:
+        id: Unique identifier for the hold
+        bbox: Bounding box of the hold in the wall image [x_min, y_min, width, height]
+        mask: (height, width) boolean mask of the hold within its bounding box
+    """
     id: str = None
     bbox: typing.List[int] = dataclasses.field(default_factory=list)
-    mask: typing.List[typing.List[int]] = dataclasses.field(default_factory=list)
+    mask: np.ndarray = dataclasses.field(default_factory=lambda: np.zeros((0, 0), dtype=bool))
 
-    def asdict(self):
+    def asdict(self, mask_format: str = 'list'):
+        """Convert the model to a dictionary, with the mask in one of `encoding_utils.MASK_FORMATS`."""
         return {
             'id': self.id,
             'bbox': self.bbox,
-            'mask': self.mask,
+            'mask': encoding_utils.mask_to_json(self.mask, mask_format),
         }
@@ -0,0 +1,43 @@
+import dataclasses
+import datetime
+import typing
+
+@dataclasses.dataclass
+class JobModel:
+    """
+    Model representing a background job.
+
+    Args:
+        id: Unique identifier for the job
+        kind: Name of the handler that runs the job
+        payload: JSON arguments passed to the handler
+        status: Current status of the job ('queued', 'running', 'completed', or 'failed')
+        attempts: Number of times the job has been claimed
+        max_attempts: Number of attempts after which a failing job is no longer retried
+        run_after: Earliest time the job may run
+        last_error: Error of the last failed attempt (None if no attempt failed)
+        recording_id: ID of the recording the job processes (None if not recording specific)
+    """
+    id: str
+    kind: str
+    payload: dict
+    status: str
+    attempts: int
+    max_attempts: int
+    run_after: datetime.datetime
+    last_error: typing.Optional[str] = None
+    recording_id: typing.Optional[str] = None
+
+    def asdict(self) -> dict:
+        """Convert the model to a dictionary."""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'payload': self.payload,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'run_after': self.run_after,
+            'last_error': self.last_error,
+            'recording_id': self.recording_id,
+        }
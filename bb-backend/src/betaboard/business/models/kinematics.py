@@ -0,0 +1,31 @@
+import dataclasses
+import typing
+
+import numpy as np
+
+LANDMARK_FIELDS = ('x', 'y', 'z', 'visibility')
+
+@dataclasses.dataclass
+class KinematicsModel:
+    """
+    Dense pose landmarks of every analyzed video frame.
+
+    Args:
+        landmark_names: Name of each landmark column of the landmarks array
+        timestamps: (frames,) array of frame timestamps in seconds
+        landmarks: (frames, landmarks, fields) float32 array with fields in LANDMARK_FIELDS order.
+            x and y are normalized image coordinates. NaN for frames where no pose was detected
+        metadata: Video metadata (frame_count, duration, fps, resolution, frame_stride, analyzed_fps),
+            plus start_time and frame_interval once on a uniform timeline
+        visible: (frames, landmarks) bool array, False for missing or low-visibility landmarks
+            (None until post-processed)
+    """
+    landmark_names: typing.List[str]
+    timestamps: np.ndarray
+    landmarks: np.ndarray
+    metadata: dict
+    visible: typing.Optional[np.ndarray] = None
+
+    @property
+    def frame_count(self) -> int:
+        return self.landmarks.shape[0]
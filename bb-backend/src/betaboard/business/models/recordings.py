@@ -2,12 +2,154 @@ import dataclasses
 import datetime
 import typing
 
+import numpy as np
+
+PLAYBACK_CHANNELS = ('x', 'y', 'force_magnitude')
+PLAYBACK_STATS = ('min', 'max', 'mean')
+
 @dataclasses.dataclass
 class SensorReadingModel:
     hold_id: str
     x: float
     y: float
 
+@dataclasses.dataclass
+class PackedSensorReadingsModel:
+    """
+    Frame-major columnar sensor readings for a recording.
+
+    Args:
+        hold_ids: Hold ID for each column of the reading arrays
+        x: (frames, holds) float32 array of horizontal load, NaN where a hold has no reading
+        y: (frames, holds) float32 array of vertical load, NaN where a hold has no reading
+        start_frame: Recording frame index of the first row, non-zero when this is a window
+    """
+    hold_ids: typing.List[str]
+    x: np.ndarray
+    y: np.ndarray
+    start_frame: int = 0
+
+    @property
+    def frame_count(self) -> int:
+        return self.x.shape[0]
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: typing.List[typing.List[SensorReadingModel]]
+    ) -> 'PackedSensorReadingsModel':
+        """
+        Pack a list of sensor reading frames into frame-major arrays.
+
+        Holds are assigned columns in the order they are first seen.
+
+        Args:
+            frames: List of sensor reading frames.
+
+        Returns:
+            PackedSensorReadingsModel: The packed readings.
+        """
+        hold_columns = {}
+        for frame in frames:
+            for reading in frame:
+                hold_columns.setdefault(str(reading.hold_id), len(hold_columns))
+
+        x = np.full((len(frames), len(hold_columns)), np.nan, dtype=np.float32)
+        y = np.full((len(frames), len(hold_columns)), np.nan, dtype=np.float32)
+        for frame_index, frame in enumerate(frames):
+            for reading in frame:
+                column = hold_columns[str(reading.hold_id)]
+                x[frame_index, column] = reading.x
+                y[frame_index, column] = reading.y
+
+        return cls(hold_ids=list(hold_columns), x=x, y=y)
+
+    def to_frames(self) -> typing.List[typing.List[SensorReadingModel]]:
+        """Unpack the arrays back into a list of sensor reading frames."""
+        present = ~(np.isnan(self.x) | np.isnan(self.y))
+        return [
+            [
+                SensorReadingModel(hold_id=hold_id, x=float(x), y=float(y))
+                for hold_id, x, y, is_present in zip(self.hold_ids, x_row, y_row, present_row)
+                if is_present
+            ]
+            for x_row, y_row, present_row in zip(self.x, self.y, present)
+        ]
+
+@dataclasses.dataclass
+class PlaybackLevelModel:
+    """
+    One level of detail of a recording's playback decimation pyramid.
+
+    Args:
+        factor: Number of sensor frames aggregated into each bin
+        hold_ids: Hold ID for each column of the stats array
+        stats: (bins, holds, channels, stats) float32 array, with channels in PLAYBACK_CHANNELS order
+            and stats in PLAYBACK_STATS order. NaN where a hold has no reading in a bin
+        start_bin: Bin index of the first row, non-zero when this is a window
+    """
+    factor: int
+    hold_ids: typing.List[str]
+    stats: np.ndarray
+    start_bin: int = 0
+
+    @property
+    def bin_count(self) -> int:
+        return self.stats.shape[0]
+
+@dataclasses.dataclass
+class ForceProfileModel:
+    """
+    Dense per-hold load curves of a recording, as compared across attempts.
+
+    Args:
+        hold_ids: Hold ID for each column of the force array
+        hold_numbers: Hold number for each column of the force array, None for holds not on the route
+        force: (frames, holds) float32 array of load magnitude, 0 where a hold has no reading
+        frame_rate: Sensor frame rate in Hz
+        start_frame: Recording frame index of the first row
+    """
+    hold_ids: typing.List[str]
+    hold_numbers: typing.List[typing.Optional[int]]
+    force: np.ndarray
+    frame_rate: float
+    start_frame: int = 0
+
+    @property
+    def frame_count(self) -> int:
+        return self.force.shape[0]
+
+@dataclasses.dataclass
+class RecordingSummaryModel:
+    """
+    Lightweight view of a climbing recording without its sensor readings.
+
+    Args:
+        id: Unique identifier for the recording
+        route_id: ID of the route being climbed
+        start_time: When the recording started
+        end_time: When the recording ended (None if still recording)
+        video_s3_key: S3 key for the stored video (None if still recording)
+        status: Current status of the recording ('recording', 'processing', 'completed', or 'failed')
+    """
+    id: str
+    route_id: str
+    start_time: datetime.datetime
+    end_time: typing.Optional[datetime.datetime]
+    video_s3_key: typing.Optional[str] = None
+    status: str = 'recording'
+
+    def asdict(self) -> dict:
+        """Convert the model to a dictionary."""
+        return {
+            'id': self.id,
+            'route_id': self.route_id,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'video_s3_key': self.video_s3_key,
+            'status': self.status,
+        }
+
 @dataclasses.dataclass
 class RecordingModel:
     """
@@ -18,18 +160,34 @@ class RecordingModel:
         route_id: ID of the route being climbed
         start_time: When the recording started
         end_time: When the recording ended (None if still recording)
-        sensor_readings: List of sensor readings per frame
+        packed_readings: Frame-major sensor readings (None if not yet recorded)
         video_s3_key: S3 key for the stored video (None if still recording)
-        status: Current status of the recording ('recording', 'completed', or 'failed')
+        status: Current status of the recording ('recording', 'processing', 'completed', or 'failed')
     """
     id: str
     route_id: str
     start_time: datetime.datetime
     end_time: typing.Optional[datetime.datetime]
-    sensor_readings: typing.List[typing.List[SensorReadingModel]]
+    packed_readings: typing.Optional[PackedSensorReadingsModel] = None
     video_s3_key: typing.Optional[str] = None
     status: str = 'recording'
 
+    @property
+    def sensor_readings(self) -> typing.List[typing.List[SensorReadingModel]]:
+        """List of sensor readings per frame."""
+        if self.packed_readings is None:
+            return []
+        return self.packed_readings.to_frames()
+
     def asdict(self) -> dict:
         """Convert the model to a dictionary."""
-        return dataclasses.asdict(self)
+        return {
+            'id': self.id,
+            'route_id': self.route_id,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            # Reading models are serialized as they are by the app's JSON provider
+            'sensor_readings': self.sensor_readings,
+            'video_s3_key': self.video_s3_key,
+            'status': self.status,
+        }
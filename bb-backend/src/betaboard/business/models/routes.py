@@ -13,7 +13,8 @@ class RouteModel:
     wall_id: int = None
     holds: typing.List[holds_model.HoldModel] = dataclasses.field(default_factory=list)
 
-    def asdict(self):
+    def asdict(self, mask_format: str = 'list'):
+        """Convert the model to a dictionary, with hold masks in `mask_format`."""
         return {
             'id': self.id,
             'name': self.name,
@@ -21,5 +22,5 @@ class RouteModel:
             'grade': self.grade,
             'date': self.date,
             'wall_id': self.wall_id,
-            'holds': [hold.asdict() for hold in self.holds],
+            'holds': [hold.asdict(mask_format) for hold in self.holds],
         }
@@ -15,7 +15,8 @@ class WallModel:
     routes: typing.List[routes_model.RouteModel] = dataclasses.field(default_factory=list)
     holds: typing.List[holds_model.HoldModel] = dataclasses.field(default_factory=list)
 
-    def asdict(self):
+    def asdict(self, mask_format: str = 'list'):
+        """Convert the model to a dictionary, with hold masks in `mask_format`."""
         return {
             'id': self.id,
             'name': self.name,
@@ -23,6 +24,6 @@ class WallModel:
             'width': self.width,
             'image_id': self.image_id,
             'image_url': self.image_url,
-            'routes': [route.asdict() for route in self.routes],
-            'holds': [hold.asdict() for hold in self.holds],
+            'routes': [route.asdict(mask_format) for route in self.routes],
+            'holds': [hold.asdict(mask_format) for hold in self.holds],
         }
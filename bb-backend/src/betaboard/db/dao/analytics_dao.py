@@ -0,0 +1,216 @@
+import dataclasses
+import datetime
+import typing
+
+import numpy as np
+import sqlalchemy
+import sqlalchemy.orm
+
+import betaboard.db.schema.analytics_schema as analytics_schema
+import betaboard.db.schema.recording_schema as recording_schema
+import betaboard.db.schema.route_schema as route_schema
+import betaboard.business.models.analytics as analytics_model
+import betaboard.db.dao.base_dao as base_dao
+
+class AnalyticsDAO:
+    @staticmethod
+    @base_dao.with_session
+    def save_recording_summary(
+        summary: analytics_model.RecordingMetricSummaryModel,
+        session: sqlalchemy.orm.Session
+    ) -> bool:
+        """
+        Store the metric summary of a recording and add it to its route's aggregates.
+
+        Both happen in one transaction, and the aggregate rows are locked while they are updated,
+        so concurrent summaries of the same route are all counted once.
+
+        Args:
+            summary: The recording's metric summary.
+            session: Database session.
+
+        Returns:
+            bool: False, without any change, if the recording was already summarized.
+        """
+        summary_table = analytics_schema.RecordingMetricSummarySchema
+        route_table = analytics_schema.RouteAnalyticsSchema
+        hold_table = analytics_schema.RouteHoldAnalyticsSchema
+
+        summarized = session.query(summary_table.id) \
+            .filter(summary_table.recording_id == summary.recording_id) \
+            .first()
+        if summarized is not None:
+            return False
+
+        route_id = int(summary.route_id)
+        now = datetime.datetime.utcnow()
+        session.add(summary_table(
+            recording_id=int(summary.recording_id),
+            route_id=route_id,
+            active_duration=summary.active_duration,
+            peak_load=summary.peak_load,
+            energy_expenditure=summary.energy_expenditure,
+            overall_stability=summary.overall_stability,
+            hold_usage=[dataclasses.asdict(hold) for hold in summary.holds],
+            created_at=now,
+        ))
+
+        route_analytics = session.query(route_table) \
+            .filter(route_table.route_id == route_id) \
+            .with_for_update() \
+            .first()
+        if route_analytics is None:
+            route_analytics = route_table(
+                route_id=route_id,
+                attempt_count=0,
+                active_duration_sum=0.0,
+                overall_stability_sum=0.0,
+                peak_load=0.0,
+            )
+            session.add(route_analytics)
+        route_analytics.attempt_count += 1
+        route_analytics.active_duration_sum += summary.active_duration
+        route_analytics.overall_stability_sum += summary.overall_stability
+        route_analytics.peak_load = max(route_analytics.peak_load, summary.peak_load)
+        route_analytics.updated_at = now
+
+        hold_ids = [int(hold.hold_id) for hold in summary.holds]
+        hold_analytics = {
+            row.hold_id: row
+            for row in session.query(hold_table)
+                .filter(hold_table.route_id == route_id)
+                .filter(hold_table.hold_id.in_(hold_ids))
+                .with_for_update()
+        }
+        for hold_id, usage in zip(hold_ids, summary.holds):
+            row = hold_analytics.get(hold_id)
+            if row is None:
+                row = hold_table(
+                    route_id=route_id,
+                    hold_id=hold_id,
+                    attempt_count=0,
+                    time_on_hold=0.0,
+                    load_sum=0.0,
+                    load_frames=0,
+                    peak_load=0.0,
+                    load_histogram=[],
+                )
+                session.add(row)
+            row.attempt_count += 1
+            row.time_on_hold += usage.time_on_hold
+            row.load_sum += usage.load_sum
+            row.load_frames += usage.load_frames
+            row.peak_load = max(row.peak_load, usage.peak_load)
+            # Assign a new list, in-place changes to JSON columns are not tracked
+            row.load_histogram = AnalyticsDAO._add_histograms([row.load_histogram, usage.load_histogram])
+
+        session.flush()
+        return True
+
+    @staticmethod
+    @base_dao.with_session
+    def get_analytics(
+        load_histogram_bin_width: float,
+        route_id: typing.Optional[str] = None,
+        wall_id: typing.Optional[str] = None,
+        session: sqlalchemy.orm.Session = None
+    ) -> analytics_model.AnalyticsModel:
+        """
+        Get the aggregated analytics of a route, or of every route on a wall.
+
+        Only the per-route aggregate rows are read, never the recordings' sensor readings.
+
+        Args:
+            load_histogram_bin_width: Width of the load histogram bins in N.
+            route_id: ID of the route.
+            wall_id: ID of the wall, used if no route ID is given.
+            session: Database session.
+
+        Returns:
+            AnalyticsModel: The aggregated analytics, with holds in hold ID order.
+        """
+        route_table = analytics_schema.RouteAnalyticsSchema
+        hold_table = analytics_schema.RouteHoldAnalyticsSchema
+
+        def scoped(query, table):
+            if route_id is not None:
+                return query.filter(table.route_id == route_id)
+            return query.join(route_schema.RouteSchema, route_schema.RouteSchema.id == table.route_id) \
+                .filter(route_schema.RouteSchema.wall_id == wall_id)
+
+        attempt_count, active_duration_sum, overall_stability_sum, peak_load = scoped(
+            session.query(
+                sqlalchemy.func.sum(route_table.attempt_count),
+                sqlalchemy.func.sum(route_table.active_duration_sum),
+                sqlalchemy.func.sum(route_table.overall_stability_sum),
+                sqlalchemy.func.max(route_table.peak_load),
+            ),
+            route_table,
+        ).one()
+        attempt_count = int(attempt_count or 0)
+
+        hold_rows = scoped(
+            session.query(
+                hold_table.hold_id,
+                hold_table.attempt_count,
+                hold_table.time_on_hold,
+                hold_table.load_sum,
+                hold_table.load_frames,
+                hold_table.peak_load,
+                hold_table.load_histogram,
+            ),
+            hold_table,
+        ).order_by(hold_table.hold_id).all()
+
+        # Merge the rows of a hold used by several routes
+        holds = {}
+        for row in hold_rows:
+            holds.setdefault(row.hold_id, []).append(row)
+        total_load = sum(row.load_sum for row in hold_rows)
+
+        hold_models = []
+        for hold_id, rows in holds.items():
+            load_sum = sum(row.load_sum for row in rows)
+            load_frames = sum(row.load_frames for row in rows)
+            hold_models.append(analytics_model.HoldAnalyticsModel(
+                hold_id=str(hold_id),
+                attempt_count=sum(row.attempt_count for row in rows),
+                time_on_hold=sum(row.time_on_hold for row in rows),
+                average_load=load_sum / load_frames if load_frames else 0.0,
+                peak_load=max(row.peak_load for row in rows),
+                load_share=load_sum / total_load if total_load else 0.0,
+                load_histogram=AnalyticsDAO._add_histograms([row.load_histogram for row in rows]),
+            ))
+
+        return analytics_model.AnalyticsModel(
+            attempt_count=attempt_count,
+            average_active_duration=active_duration_sum / attempt_count if attempt_count else 0.0,
+            average_stability=overall_stability_sum / attempt_count if attempt_count else 0.0,
+            peak_load=peak_load or 0.0,
+            load_histogram_bin_width=load_histogram_bin_width,
+            holds=hold_models,
+        )
+
+    @staticmethod
+    @base_dao.with_session
+    def get_unsummarized_recording_ids(
+        session: sqlalchemy.orm.Session
+    ) -> typing.List[str]:
+        """Get the IDs of completed recordings without a metric summary, oldest first."""
+        recording_table = recording_schema.RecordingSchema
+        summary_table = analytics_schema.RecordingMetricSummarySchema
+        recording_ids = session.query(recording_table.id) \
+            .outerjoin(summary_table, summary_table.recording_id == recording_table.id) \
+            .filter(recording_table.status == 'completed') \
+            .filter(summary_table.id.is_(None)) \
+            .order_by(recording_table.id) \
+            .all()
+        return [str(row.id) for row in recording_ids]
+
+    @staticmethod
+    def _add_histograms(histograms: typing.List[typing.List[int]]) -> typing.List[int]:
+        """Element-wise sum of histograms, padding shorter ones with zeros."""
+        total = np.zeros(max((len(histogram) for histogram in histograms), default=0), dtype=np.int64)
+        for histogram in histograms:
+            total[:len(histogram)] += np.asarray(histogram, dtype=np.int64)
+        return total.tolist()
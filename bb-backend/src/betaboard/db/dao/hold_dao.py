@@ -1,27 +1,20 @@
 import typing
-import zlib
-import json
+
+import numpy as np
 import sqlalchemy.orm
 
 import betaboard.db.schema.hold_schema as hold_schema
 import betaboard.business.models.holds as holds
 import betaboard.db.dao.base_dao as base_dao
+import betaboard.utils.encoding as encoding_utils
 
 class HoldDAO:
-    @staticmethod
-    def _compress_mask(mask: typing.List[typing.List[int]]) -> bytes:
-        return zlib.compress(json.dumps(mask).encode('utf-8'))
-
-    @staticmethod
-    def _decompress_mask(mask_bytes: bytes) -> typing.List[typing.List[int]]:
-        return json.loads(zlib.decompress(mask_bytes).decode('utf-8'))
-
     @staticmethod
     def _to_model(hold: hold_schema.HoldSchema) -> holds.HoldModel:
         return holds.HoldModel(
             id=str(hold.id),
             bbox=hold.bbox,
-            mask=HoldDAO._decompress_mask(hold.mask) if hold.mask else []
+            mask=encoding_utils.decode_mask(hold.mask) if hold.mask else np.zeros((0, 0), dtype=bool)
         )
 
     @staticmethod
@@ -54,7 +47,7 @@ class HoldDAO:
     def save_hold(hold_model: holds.HoldModel, session: sqlalchemy.orm.Session):
         hold = hold_schema.HoldSchema(
             bbox=hold_model.bbox,
-            mask=HoldDAO._compress_mask(hold_model.mask) if hold_model.mask else None,
+            mask=encoding_utils.encode_mask(hold_model.mask) if hold_model.mask.size else None,
         )
         session.add(hold)
         session.flush()
@@ -0,0 +1,226 @@
+import datetime
+import typing
+
+import sqlalchemy
+import sqlalchemy.orm
+
+import betaboard.db.schema.job_schema as job_schema
+import betaboard.business.models.jobs as jobs_model
+import betaboard.db.dao.base_dao as base_dao
+
+class JobDAO:
+    @staticmethod
+    def _to_model(job: job_schema.JobSchema) -> jobs_model.JobModel:
+        return jobs_model.JobModel(
+            id=str(job.id),
+            kind=job.kind,
+            payload=job.payload,
+            status=job.status,
+            attempts=job.attempts,
+            max_attempts=job.max_attempts,
+            run_after=job.run_after,
+            last_error=job.last_error,
+            recording_id=str(job.recording_id) if job.recording_id is not None else None,
+        )
+
+    @staticmethod
+    @base_dao.with_session
+    def enqueue_job(
+        kind: str,
+        payload: dict,
+        max_attempts: int,
+        recording_id: typing.Optional[str] = None,
+        run_after: typing.Optional[datetime.datetime] = None,
+        session: sqlalchemy.orm.Session = None
+    ) -> jobs_model.JobModel:
+        """
+        Add a job to the queue.
+
+        Args:
+            kind: Name of the handler that runs the job.
+            payload: JSON arguments passed to the handler.
+            max_attempts: Number of attempts after which a failing job is no longer retried.
+            recording_id: ID of the recording the job processes, if any.
+            run_after: Earliest time the job may run, defaults to now.
+            session: Database session.
+
+        Returns:
+            JobModel: The queued job.
+        """
+        now = datetime.datetime.utcnow()
+        job = job_schema.JobSchema(
+            kind=kind,
+            payload=payload,
+            status='queued',
+            attempts=0,
+            max_attempts=max_attempts,
+            run_after=run_after or now,
+            created_at=now,
+            updated_at=now,
+            recording_id=int(recording_id) if recording_id is not None else None,
+        )
+        session.add(job)
+        session.flush()
+        return JobDAO._to_model(job)
+
+    @staticmethod
+    @base_dao.with_session
+    def claim_next_job(
+        lease: datetime.timedelta,
+        kinds: typing.Optional[typing.List[str]] = None,
+        session: sqlalchemy.orm.Session = None
+    ) -> typing.Optional[jobs_model.JobModel]:
+        """
+        Claim the oldest due job, marking it running and counting the attempt.
+
+        Rows locked by other workers are skipped, so concurrent workers never claim the same job.
+        Jobs left running for longer than `lease`, e.g. by a worker that died, are claimed again
+        while they have attempts left. Once they have none left, they are claimed to be marked
+        failed instead, and returned with status 'failed' for their failure handling.
+
+        Args:
+            lease: Time after which a running job is assumed abandoned.
+            kinds: Only claim jobs of these kinds, defaults to any kind.
+            session: Database session.
+
+        Returns:
+            Optional[JobModel]: The claimed job, or None if no job is due.
+        """
+        now = datetime.datetime.utcnow()
+        job_table = job_schema.JobSchema
+        query = session.query(job_table).filter(sqlalchemy.or_(
+            sqlalchemy.and_(job_table.status == 'queued', job_table.run_after <= now),
+            sqlalchemy.and_(job_table.status == 'running', job_table.updated_at <= now - lease),
+        ))
+        if kinds is not None:
+            query = query.filter(job_table.kind.in_(kinds))
+
+        job = query.order_by(job_table.run_after, job_table.id) \
+            .with_for_update(skip_locked=True) \
+            .first()
+        if job is None:
+            return None
+
+        job.updated_at = now
+        if job.status == 'running' and job.attempts >= job.max_attempts:
+            job.status = 'failed'
+            job.last_error = f"Lease expired after {job.attempts} attempts"
+        else:
+            job.status = 'running'
+            job.attempts += 1
+        session.flush()
+        return JobDAO._to_model(job)
+
+    @staticmethod
+    def _get_running_attempt(
+        session: sqlalchemy.orm.Session,
+        job_id: str,
+        attempt: int,
+    ) -> typing.Optional[job_schema.JobSchema]:
+        """
+        Lock a job while it is still running the given attempt, or None if it is no longer, e.g.
+        because its lease expired and it was claimed again.
+        """
+        job_table = job_schema.JobSchema
+        return session.query(job_table) \
+            .filter(job_table.id == job_id) \
+            .filter(job_table.status == 'running') \
+            .filter(job_table.attempts == attempt) \
+            .with_for_update() \
+            .first()
+
+    @staticmethod
+    @base_dao.with_session
+    def renew_lease(
+        job_id: str,
+        attempt: int,
+        session: sqlalchemy.orm.Session
+    ) -> bool:
+        """
+        Extend the lease of a running job attempt, so it is not claimed again while it runs.
+
+        Returns:
+            bool: False if the job is no longer running this attempt.
+        """
+        job = JobDAO._get_running_attempt(session, job_id, attempt)
+        if job is None:
+            return False
+
+        job.updated_at = datetime.datetime.utcnow()
+        return True
+
+    @staticmethod
+    @base_dao.with_session
+    def complete_job(
+        job_id: str,
+        attempt: int,
+        session: sqlalchemy.orm.Session
+    ) -> bool:
+        """
+        Mark a running job attempt as completed.
+
+        Returns:
+            bool: False if the job is no longer running this attempt, in which case it is left as is.
+        """
+        job = JobDAO._get_running_attempt(session, job_id, attempt)
+        if job is None:
+            return False
+
+        job.status = 'completed'
+        job.last_error = None
+        job.updated_at = datetime.datetime.utcnow()
+        return True
+
+    @staticmethod
+    @base_dao.with_session
+    def fail_job(
+        job_id: str,
+        attempt: int,
+        error: str,
+        retry_delay: datetime.timedelta,
+        session: sqlalchemy.orm.Session
+    ) -> typing.Optional[jobs_model.JobModel]:
+        """
+        Record a failed attempt of a running job.
+
+        The job is queued again after `retry_delay` unless it has used all its attempts, in which
+        case it is marked failed.
+
+        Args:
+            job_id: ID of the job.
+            attempt: The failed attempt, as counted when it was claimed.
+            error: Description of the failure.
+            retry_delay: Time to wait before the next attempt.
+            session: Database session.
+
+        Returns:
+            Optional[JobModel]: The updated job, or None if the job is no longer running this
+                attempt, in which case it is left as is.
+        """
+        job = JobDAO._get_running_attempt(session, job_id, attempt)
+        if job is None:
+            return None
+
+        now = datetime.datetime.utcnow()
+        job.last_error = error
+        job.updated_at = now
+        if job.attempts < job.max_attempts:
+            job.status = 'queued'
+            job.run_after = now + retry_delay
+        else:
+            job.status = 'failed'
+        session.flush()
+        return JobDAO._to_model(job)
+
+    @staticmethod
+    @base_dao.with_session
+    def get_jobs_by_recording_id(
+        recording_id: str,
+        session: sqlalchemy.orm.Session
+    ) -> typing.List[jobs_model.JobModel]:
+        """Get every job of a recording, oldest first."""
+        jobs = session.query(job_schema.JobSchema) \
+            .filter(job_schema.JobSchema.recording_id == recording_id) \
+            .order_by(job_schema.JobSchema.id) \
+            .all()
+        return [JobDAO._to_model(job) for job in jobs]
@@ -1,12 +1,64 @@
 import datetime
+import io
 import typing
+import zlib
+
+import numpy as np
+import sqlalchemy.dialects.postgresql
 import sqlalchemy.orm
 
 import betaboard.db.schema.recording_schema as recording_schema
 import betaboard.business.models.recordings as recordings_model
 import betaboard.db.dao.base_dao as base_dao
+import betaboard.utils.json_provider as json_provider
+
+READINGS_DTYPE = np.dtype('<f4')
+
+INGEST_BATCH_SIZE = 10000
+
+SensorReadingsInput = typing.Union[
+    typing.List[typing.List[recordings_model.SensorReadingModel]],
+    recordings_model.PackedSensorReadingsModel,
+]
 
 class RecordingDAO:
+    @staticmethod
+    def _pack_readings(
+        packed_readings: recordings_model.PackedSensorReadingsModel
+    ) -> bytes:
+        """
+        Serialize packed readings into a frame-major float32 (x, y) blob.
+
+        Args:
+            packed_readings: The packed readings to serialize.
+
+        Returns:
+            bytes: The serialized readings.
+        """
+        readings = np.stack([packed_readings.x, packed_readings.y], axis=-1)
+        return readings.astype(READINGS_DTYPE).tobytes()
+
+    @staticmethod
+    def _unpack_readings(
+        packed: recording_schema.PackedSensorReadingsSchema
+    ) -> recordings_model.PackedSensorReadingsModel:
+        """
+        Deserialize a packed readings row without copying the blob.
+
+        Args:
+            packed: The packed readings schema to deserialize.
+
+        Returns:
+            PackedSensorReadingsModel: The packed readings model.
+        """
+        readings = np.frombuffer(packed.readings, dtype=READINGS_DTYPE)
+        readings = readings.reshape(packed.frame_count, len(packed.hold_ids), 2)
+        return recordings_model.PackedSensorReadingsModel(
+            hold_ids=[str(hold_id) for hold_id in packed.hold_ids],
+            x=readings[..., 0],
+            y=readings[..., 1],
+        )
+
     @staticmethod
     def _to_model(recording: recording_schema.RecordingSchema) -> recordings_model.RecordingModel:
         """
@@ -18,34 +70,49 @@ class RecordingDAO:
         Returns:
             RecordingModel: The converted recording model.
         """
-        sensor_readings = []
-        # Group sensor readings by frame index
-        readings_by_frame = {}
-        for reading in recording.sensor_readings:
-            frame_index = reading.frame_index
-            if frame_index not in readings_by_frame:
-                readings_by_frame[frame_index] = []
-            readings_by_frame[frame_index].append(
-                recordings_model.SensorReadingModel(
-                    hold_id=str(reading.hold_id),
-                    x=reading.x,
-                    y=reading.y,
-                )
-            )
-        # Sort frames by index
-        for frame_index in sorted(readings_by_frame.keys()):
-            sensor_readings.append(readings_by_frame[frame_index])
+        packed_readings = None
+        if recording.packed_sensor_readings is not None:
+            packed_readings = RecordingDAO._unpack_readings(recording.packed_sensor_readings)
 
         return recordings_model.RecordingModel(
             id=str(recording.id),
             route_id=str(recording.route_id),
             start_time=recording.start_time,
             end_time=recording.end_time,
-            sensor_readings=sensor_readings,
+            packed_readings=packed_readings,
             video_s3_key=recording.video_s3_key,
             status=recording.status
         )
 
+    @staticmethod
+    def _to_summary_model(
+        recording: recording_schema.RecordingSchema
+    ) -> recordings_model.RecordingSummaryModel:
+        """
+        Convert a recording schema to a summary model, without touching its readings.
+
+        Args:
+            recording: The recording schema to convert.
+
+        Returns:
+            RecordingSummaryModel: The converted recording summary model.
+        """
+        return recordings_model.RecordingSummaryModel(
+            id=str(recording.id),
+            route_id=str(recording.route_id),
+            start_time=recording.start_time,
+            end_time=recording.end_time,
+            video_s3_key=recording.video_s3_key,
+            status=recording.status
+        )
+
+    @staticmethod
+    def _summary_options():
+        return [
+            sqlalchemy.orm.noload(recording_schema.RecordingSchema.sensor_readings),
+            sqlalchemy.orm.noload(recording_schema.RecordingSchema.packed_sensor_readings),
+        ]
+
     @staticmethod
     @base_dao.with_session
     def create_recording(
@@ -80,7 +147,7 @@ class RecordingDAO:
         end_time: typing.Optional[datetime.datetime] = None,
         video_s3_key: typing.Optional[str] = None,
         status: typing.Optional[str] = None,
-        sensor_readings: typing.Optional[typing.List[typing.List[recordings_model.SensorReadingModel]]] = None,
+        sensor_readings: typing.Optional[SensorReadingsInput] = None,
         session: sqlalchemy.orm.Session = None
     ) -> recordings_model.RecordingModel:
         """
@@ -91,7 +158,8 @@ class RecordingDAO:
             end_time (Optional[datetime.datetime]): Optional end time of the recording.
             video_s3_key (Optional[str]): Optional S3 key for the video.
             status (Optional[str]): Optional new status for the recording.
-            sensor_readings (Optional[List[List[SensorReadingModel]]]): Optional list of sensor reading frames.
+            sensor_readings (Optional[SensorReadingsInput]): Optional list of sensor reading frames, or
+                the readings already packed into arrays.
             session (Session): Database session.
 
         Returns:
@@ -111,21 +179,200 @@ class RecordingDAO:
         if status is not None:
             recording.status = status
         if sensor_readings is not None:
-            # Create sensor readings
-            for frame_idx, frame in enumerate(sensor_readings):
-                for reading in frame:
-                    sensor_reading = recording_schema.SensorReadingSchema(
-                        recording_id=recording.id,
-                        hold_id=reading.hold_id,
-                        frame_index=frame_idx,
-                        x=float(reading.x),
-                        y=float(reading.y),
-                    )
-                    session.add(sensor_reading)
+            RecordingDAO._write_sensor_readings(recording, sensor_readings, session)
 
         session.flush()
         return RecordingDAO._to_model(recording)
 
+    @staticmethod
+    @base_dao.with_session
+    def complete_processing(
+        recording_id: str,
+        session: sqlalchemy.orm.Session
+    ) -> bool:
+        """
+        Mark a processing recording completed, provided its video and sensor readings are stored.
+
+        The check and update are a single statement, so only one caller completes a recording.
+
+        Args:
+            recording_id: ID of the recording.
+            session: Database session.
+
+        Returns:
+            bool: True if this call completed the recording.
+        """
+        recording_table = recording_schema.RecordingSchema
+        packed_table = recording_schema.PackedSensorReadingsSchema
+        has_readings = session.query(packed_table.id) \
+            .filter(packed_table.recording_id == recording_table.id) \
+            .exists()
+        updated = session.query(recording_table) \
+            .filter(recording_table.id == recording_id) \
+            .filter(recording_table.status == 'processing') \
+            .filter(recording_table.video_s3_key.isnot(None)) \
+            .filter(has_readings) \
+            .update({'status': 'completed'}, synchronize_session=False)
+        return updated == 1
+
+    @staticmethod
+    @base_dao.with_session
+    def ingest_sensor_readings(
+        recording_id: str,
+        sensor_readings: SensorReadingsInput,
+        method: typing.Optional[str] = None,
+        batch_size: int = INGEST_BATCH_SIZE,
+        session: sqlalchemy.orm.Session = None
+    ) -> int:
+        """
+        Bulk write a recording's sensor readings, replacing any existing ones.
+
+        Args:
+            recording_id (str): ID of the recording the readings belong to.
+            sensor_readings (SensorReadingsInput): List of sensor reading frames, or the readings
+                already packed into arrays.
+            method (Optional[str]): 'copy' to stream rows with Postgres COPY FROM STDIN, or 'values'
+                for batched executemany inserts. Defaults to 'copy' on Postgres.
+            batch_size (int): Number of rows per executemany batch for the 'values' method.
+            session (Session): Database session.
+
+        Returns:
+            int: The number of sensor reading rows written.
+
+        Raises:
+            ValueError: If recording not found or the method is unknown.
+        """
+        recording = session.query(recording_schema.RecordingSchema).get(recording_id)
+        if recording is None:
+            raise ValueError("Recording not found")
+
+        row_count = RecordingDAO._write_sensor_readings(
+            recording,
+            sensor_readings,
+            session,
+            method=method,
+            batch_size=batch_size,
+        )
+        session.flush()
+        return row_count
+
+    @staticmethod
+    def _write_sensor_readings(
+        recording: recording_schema.RecordingSchema,
+        sensor_readings: SensorReadingsInput,
+        session: sqlalchemy.orm.Session,
+        method: typing.Optional[str] = None,
+        batch_size: int = INGEST_BATCH_SIZE
+    ) -> int:
+        """
+        Write the packed readings row and the row-per-reading table for a recording.
+
+        Args:
+            recording: The recording the readings belong to.
+            sensor_readings: List of sensor reading frames, or the readings already packed into arrays.
+            session: Database session.
+            method: Row insert method, see `ingest_sensor_readings`.
+            batch_size: Number of rows per executemany batch for the 'values' method.
+
+        Returns:
+            int: The number of sensor reading rows written.
+        """
+        if method is None:
+            method = 'copy' if session.get_bind().dialect.name == 'postgresql' else 'values'
+        if method not in ('copy', 'values'):
+            raise ValueError(f"Unknown sensor reading ingest method: {method}")
+
+        if not isinstance(sensor_readings, recordings_model.PackedSensorReadingsModel):
+            sensor_readings = recordings_model.PackedSensorReadingsModel.from_frames(sensor_readings)
+
+        # Store the packed readings, replacing any previous ones
+        if recording.packed_sensor_readings is None:
+            recording.packed_sensor_readings = recording_schema.PackedSensorReadingsSchema()
+        recording.packed_sensor_readings.frame_count = sensor_readings.frame_count
+        recording.packed_sensor_readings.hold_ids = [int(hold_id) for hold_id in sensor_readings.hold_ids]
+        recording.packed_sensor_readings.readings = RecordingDAO._pack_readings(sensor_readings)
+        session.flush()
+
+        # Replace the row-per-reading data
+        session.query(recording_schema.SensorReadingSchema) \
+            .filter(recording_schema.SensorReadingSchema.recording_id == recording.id) \
+            .delete(synchronize_session=False)
+
+        columns = RecordingDAO._to_reading_columns(recording.id, sensor_readings)
+        if method == 'copy':
+            RecordingDAO._copy_reading_rows(columns, session)
+        else:
+            RecordingDAO._insert_reading_rows(columns, session, batch_size)
+        return len(columns['frame_index'])
+
+    @staticmethod
+    def _to_reading_columns(
+        recording_id: int,
+        packed_readings: recordings_model.PackedSensorReadingsModel
+    ) -> typing.Dict[str, np.ndarray]:
+        """
+        Flatten packed readings into sensor_readings column arrays, frame-major.
+
+        Args:
+            recording_id: ID of the recording the readings belong to.
+            packed_readings: The packed readings to flatten.
+
+        Returns:
+            Dict[str, np.ndarray]: Column name to column values, skipping missing readings.
+        """
+        present = ~(np.isnan(packed_readings.x) | np.isnan(packed_readings.y))
+        frame_indices, hold_columns = np.nonzero(present)
+        hold_ids = np.asarray([int(hold_id) for hold_id in packed_readings.hold_ids], dtype=np.int64)
+        return {
+            'recording_id': np.full(len(frame_indices), recording_id, dtype=np.int64),
+            'hold_id': hold_ids[hold_columns],
+            'frame_index': frame_indices.astype(np.int64),
+            'x': packed_readings.x[present].astype(np.float64),
+            'y': packed_readings.y[present].astype(np.float64),
+        }
+
+    @staticmethod
+    def _insert_reading_rows(
+        columns: typing.Dict[str, np.ndarray],
+        session: sqlalchemy.orm.Session,
+        batch_size: int
+    ) -> None:
+        """Insert sensor reading rows with batched executemany inserts."""
+        table = recording_schema.SensorReadingSchema.__table__
+        names = list(columns)
+        values = [columns[name].tolist() for name in names]
+        row_count = len(values[0])
+        for start in range(0, row_count, batch_size):
+            batch = [
+                dict(zip(names, row))
+                for row in zip(*(column[start:start + batch_size] for column in values))
+            ]
+            session.execute(table.insert(), batch)
+
+    @staticmethod
+    def _copy_reading_rows(
+        columns: typing.Dict[str, np.ndarray],
+        session: sqlalchemy.orm.Session
+    ) -> None:
+        """Stream sensor reading rows into Postgres with COPY FROM STDIN."""
+        buffer = io.StringIO()
+        np.savetxt(
+            buffer,
+            np.column_stack([columns[name] for name in columns]),
+            fmt=['%d', '%d', '%d', '%.17g', '%.17g'],
+            delimiter='\t',
+        )
+        buffer.seek(0)
+
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY sensor_readings ({', '.join(columns)}) FROM STDIN",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
     @staticmethod
     @base_dao.with_session
     def get_recording_by_id(
@@ -162,10 +409,45 @@ class RecordingDAO:
         recording_ids: typing.List[int],
         session: sqlalchemy.orm.Session
     ) -> typing.List[recordings_model.RecordingModel]:
+        """
+        Get recordings by their IDs.
+
+        Args:
+            recording_ids: IDs of the recordings.
+            session: Database session.
+
+        Returns:
+            List[RecordingModel]: The recordings found, in the order of `recording_ids`.
+        """
         recording_records = session.query(recording_schema.RecordingSchema)\
             .filter(recording_schema.RecordingSchema.id.in_(recording_ids))\
             .all()
-        return [RecordingDAO._to_model(rec) for rec in recording_records]
+        recordings = {str(rec.id): RecordingDAO._to_model(rec) for rec in recording_records}
+        return [recordings[str(recording_id)] for recording_id in recording_ids if str(recording_id) in recordings]
+
+    @staticmethod
+    @base_dao.with_session
+    def get_recording_summaries_by_ids(
+        recording_ids: typing.List[str],
+        session: sqlalchemy.orm.Session
+    ) -> typing.List[recordings_model.RecordingSummaryModel]:
+        """
+        Get the summaries of recordings, without loading their readings.
+
+        Args:
+            recording_ids: IDs of the recordings.
+            session: Database session.
+
+        Returns:
+            List[RecordingSummaryModel]: The summaries of the recordings found, in the order of
+                `recording_ids`.
+        """
+        recording_records = session.query(recording_schema.RecordingSchema) \
+            .options(*RecordingDAO._summary_options()) \
+            .filter(recording_schema.RecordingSchema.id.in_(recording_ids)) \
+            .all()
+        summaries = {str(rec.id): RecordingDAO._to_summary_model(rec) for rec in recording_records}
+        return [summaries[str(recording_id)] for recording_id in recording_ids if str(recording_id) in summaries]
 
     @staticmethod
     @base_dao.with_session
@@ -176,4 +458,314 @@ class RecordingDAO:
         recording_records = session.query(recording_schema.RecordingSchema)\
             .filter(recording_schema.RecordingSchema.route_id == route_id)\
             .all()
-        return [RecordingDAO._to_model(rec) for rec in recording_records]
\ No newline at end of file
+        return [RecordingDAO._to_model(rec) for rec in recording_records]
+
+    @staticmethod
+    @base_dao.with_session
+    def get_recording_summaries_by_route_id(
+        route_id: int,
+        limit: int = 50,
+        cursor: typing.Optional[str] = None,
+        session: sqlalchemy.orm.Session = None
+    ) -> typing.Tuple[typing.List[recordings_model.RecordingSummaryModel], typing.Optional[str]]:
+        """
+        Get a page of recording summaries for a route, newest first.
+
+        Args:
+            route_id: ID of the route whose recordings to list.
+            limit: Maximum number of recordings to return.
+            cursor: Cursor returned by the previous page, or None for the first page.
+            session: Database session.
+
+        Returns:
+            Tuple[List[RecordingSummaryModel], Optional[str]]: The recording summaries, and the
+                cursor for the next page (None if this is the last page).
+        """
+        query = session.query(recording_schema.RecordingSchema) \
+            .options(*RecordingDAO._summary_options()) \
+            .filter(recording_schema.RecordingSchema.route_id == route_id)
+        if cursor is not None:
+            query = query.filter(recording_schema.RecordingSchema.id < int(cursor))
+
+        recording_records = query \
+            .order_by(recording_schema.RecordingSchema.id.desc()) \
+            .limit(limit + 1) \
+            .all()
+
+        next_cursor = None
+        if len(recording_records) > limit:
+            recording_records = recording_records[:limit]
+            next_cursor = str(recording_records[-1].id)
+
+        return [RecordingDAO._to_summary_model(rec) for rec in recording_records], next_cursor
+
+    @staticmethod
+    @base_dao.with_session
+    def get_sensor_readings(
+        recording_id: str,
+        start_frame: typing.Optional[int] = None,
+        end_frame: typing.Optional[int] = None,
+        hold_ids: typing.Optional[typing.List[str]] = None,
+        session: sqlalchemy.orm.Session = None
+    ) -> recordings_model.PackedSensorReadingsModel:
+        """
+        Get the packed sensor readings of a single recording, or a frame window of them.
+
+        Only the bytes of the requested frames are read from the packed readings blob, located
+        by offset arithmetic on its frame-major layout.
+
+        Args:
+            recording_id: ID of the recording whose readings to get.
+            start_frame: First frame to return (inclusive), defaults to the first frame.
+            end_frame: Last frame to return (exclusive), defaults to the end of the recording.
+            hold_ids: Holds to return readings for, defaults to all holds.
+            session: Database session.
+
+        Returns:
+            PackedSensorReadingsModel: The requested readings (empty if none were recorded).
+
+        Raises:
+            ValueError: If recording not found.
+        """
+        packed_table = recording_schema.PackedSensorReadingsSchema
+        header = session.query(packed_table.frame_count, packed_table.hold_ids) \
+            .filter(packed_table.recording_id == recording_id) \
+            .one_or_none()
+        if header is None:
+            recording = session.query(recording_schema.RecordingSchema) \
+                .options(*RecordingDAO._summary_options()) \
+                .get(recording_id)
+            if recording is None:
+                raise ValueError("Recording not found")
+            return recordings_model.PackedSensorReadingsModel.from_frames([])
+
+        frame_count, stored_hold_ids = header
+        start_frame = min(max(start_frame or 0, 0), frame_count)
+        end_frame = frame_count if end_frame is None else min(max(end_frame, start_frame), frame_count)
+
+        # Each frame is one (x, y) pair per hold
+        frame_size = len(stored_hold_ids) * 2 * READINGS_DTYPE.itemsize
+        window = session.query(
+            sqlalchemy.func.substring(
+                packed_table.readings,
+                start_frame * frame_size + 1,
+                (end_frame - start_frame) * frame_size,
+            )
+        ).filter(packed_table.recording_id == recording_id).scalar()
+
+        readings = np.frombuffer(window or b'', dtype=READINGS_DTYPE)
+        readings = readings.reshape(end_frame - start_frame, len(stored_hold_ids), 2)
+
+        stored_hold_ids = [str(hold_id) for hold_id in stored_hold_ids]
+        if hold_ids is not None:
+            requested = set(str(hold_id) for hold_id in hold_ids)
+            columns = [index for index, hold_id in enumerate(stored_hold_ids) if hold_id in requested]
+            readings = readings[:, columns]
+            stored_hold_ids = [stored_hold_ids[index] for index in columns]
+
+        return recordings_model.PackedSensorReadingsModel(
+            hold_ids=stored_hold_ids,
+            x=readings[..., 0],
+            y=readings[..., 1],
+            start_frame=start_frame,
+        )
+
+    @staticmethod
+    @base_dao.with_session
+    def save_playback_levels(
+        recording_id: str,
+        levels: typing.List[recordings_model.PlaybackLevelModel],
+        session: sqlalchemy.orm.Session
+    ) -> None:
+        """
+        Store a recording's playback pyramid levels, replacing any with the same factor.
+
+        Args:
+            recording_id: ID of the recording the levels belong to.
+            levels: The playback pyramid levels to store.
+            session: Database session.
+        """
+        if not levels:
+            return
+
+        # Upserted, so concurrent builds of the same pyramid do not violate (recording_id, factor)
+        level_table = recording_schema.PlaybackLevelSchema
+        statement = sqlalchemy.dialects.postgresql.insert(level_table).values([
+            {
+                'recording_id': int(recording_id),
+                'factor': level.factor,
+                'bin_count': level.bin_count,
+                'hold_ids': [int(hold_id) for hold_id in level.hold_ids],
+                'stats': level.stats.astype(READINGS_DTYPE).tobytes(),
+            }
+            for level in levels
+        ])
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[level_table.recording_id, level_table.factor],
+            set_={
+                'bin_count': statement.excluded.bin_count,
+                'hold_ids': statement.excluded.hold_ids,
+                'stats': statement.excluded.stats,
+            },
+        ))
+
+    @staticmethod
+    @base_dao.with_session
+    def get_playback_bin_counts(
+        recording_id: str,
+        session: sqlalchemy.orm.Session
+    ) -> typing.Dict[int, int]:
+        """
+        Get the bin count of each stored playback pyramid level of a recording.
+
+        Args:
+            recording_id: ID of the recording.
+            session: Database session.
+
+        Returns:
+            Dict[int, int]: Bin count keyed by factor, empty if no pyramid is stored.
+        """
+        level_table = recording_schema.PlaybackLevelSchema
+        rows = session.query(level_table.factor, level_table.bin_count) \
+            .filter(level_table.recording_id == recording_id) \
+            .all()
+        return {factor: bin_count for factor, bin_count in rows}
+
+    @staticmethod
+    @base_dao.with_session
+    def get_recording_ids_without_playback(
+        session: sqlalchemy.orm.Session
+    ) -> typing.List[str]:
+        """Get the IDs of recordings with packed readings but no playback pyramid, oldest first."""
+        packed_table = recording_schema.PackedSensorReadingsSchema
+        level_table = recording_schema.PlaybackLevelSchema
+        recording_ids = session.query(packed_table.recording_id) \
+            .outerjoin(level_table, level_table.recording_id == packed_table.recording_id) \
+            .filter(level_table.id.is_(None)) \
+            .order_by(packed_table.recording_id) \
+            .all()
+        return [str(row.recording_id) for row in recording_ids]
+
+    @staticmethod
+    @base_dao.with_session
+    def get_playback_level(
+        recording_id: str,
+        factor: int,
+        start_bin: typing.Optional[int] = None,
+        end_bin: typing.Optional[int] = None,
+        session: sqlalchemy.orm.Session = None
+    ) -> typing.Optional[recordings_model.PlaybackLevelModel]:
+        """
+        Get a playback pyramid level of a recording, or a window of its bins.
+
+        Args:
+            recording_id: ID of the recording.
+            factor: Decimation factor of the level.
+            start_bin: First bin to return (inclusive), defaults to the first bin.
+            end_bin: Last bin to return (exclusive), defaults to the last bin.
+            session: Database session.
+
+        Returns:
+            Optional[PlaybackLevelModel]: The requested level, or None if it is not stored.
+        """
+        level_table = recording_schema.PlaybackLevelSchema
+        header = session.query(level_table.bin_count, level_table.hold_ids) \
+            .filter(level_table.recording_id == recording_id) \
+            .filter(level_table.factor == factor) \
+            .one_or_none()
+        if header is None:
+            return None
+
+        bin_count, hold_ids = header
+        start_bin = min(max(start_bin or 0, 0), bin_count)
+        end_bin = bin_count if end_bin is None else min(max(end_bin, start_bin), bin_count)
+
+        stats_shape = (
+            len(hold_ids),
+            len(recordings_model.PLAYBACK_CHANNELS),
+            len(recordings_model.PLAYBACK_STATS),
+        )
+        bin_size = int(np.prod(stats_shape)) * READINGS_DTYPE.itemsize
+        window = session.query(
+            sqlalchemy.func.substring(
+                level_table.stats,
+                start_bin * bin_size + 1,
+                (end_bin - start_bin) * bin_size,
+            )
+        ).filter(level_table.recording_id == recording_id) \
+            .filter(level_table.factor == factor) \
+            .scalar()
+
+        stats = np.frombuffer(window or b'', dtype=READINGS_DTYPE)
+        return recordings_model.PlaybackLevelModel(
+            factor=factor,
+            hold_ids=[str(hold_id) for hold_id in hold_ids],
+            stats=stats.reshape(end_bin - start_bin, *stats_shape),
+            start_bin=start_bin,
+        )
+
+    @staticmethod
+    @base_dao.with_session
+    def get_analysis_results(
+        recording_id: str,
+        analysis_version: int,
+        session: sqlalchemy.orm.Session
+    ) -> typing.Optional[dict]:
+        """
+        Get the stored analysis results of a recording for an analysis version.
+
+        Args:
+            recording_id: ID of the recording.
+            analysis_version: Version of the analysis code that produced the results.
+            session: Database session.
+
+        Returns:
+            Optional[dict]: Analysis results keyed by output name, or None if none are stored.
+        """
+        analysis_table = recording_schema.RecordingAnalysisSchema
+        results = session.query(analysis_table.results) \
+            .filter(analysis_table.recording_id == recording_id) \
+            .filter(analysis_table.analysis_version == analysis_version) \
+            .scalar()
+        if results is None:
+            return None
+        return json_provider.loads(zlib.decompress(results))
+
+    @staticmethod
+    @base_dao.with_session
+    def save_analysis_results(
+        recording_id: str,
+        analysis_version: int,
+        results: dict,
+        session: sqlalchemy.orm.Session
+    ) -> None:
+        """
+        Store the analysis results of a recording, replacing those of every analysis version.
+
+        Args:
+            recording_id: ID of the recording.
+            analysis_version: Version of the analysis code that produced the results.
+            results: Analysis results keyed by output name, serializable by `json_provider.dumps`.
+            session: Database session.
+        """
+        analysis_table = recording_schema.RecordingAnalysisSchema
+        session.query(analysis_table) \
+            .filter(analysis_table.recording_id == recording_id) \
+            .filter(analysis_table.analysis_version != analysis_version) \
+            .delete(synchronize_session=False)
+
+        # Upserted, so concurrent analyses of the same recording do not violate
+        # (recording_id, analysis_version)
+        statement = sqlalchemy.dialects.postgresql.insert(analysis_table).values(
+            recording_id=int(recording_id),
+            analysis_version=analysis_version,
+            results=zlib.compress(json_provider.dumps(results)),
+            updated_at=datetime.datetime.utcnow(),
+        )
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[analysis_table.recording_id, analysis_table.analysis_version],
+            set_={
+                'results': statement.excluded.results,
+                'updated_at': statement.excluded.updated_at,
+            },
+        ))
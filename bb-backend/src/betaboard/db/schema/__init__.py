@@ -2,8 +2,20 @@ from betaboard.db.schema.base_schema import BaseSchema
 from betaboard.db.schema.wall_schema import WallSchema
 from betaboard.db.schema.hold_schema import HoldSchema
 from betaboard.db.schema.route_schema import RouteSchema
-from betaboard.db.schema.recording_schema import RecordingSchema, SensorReadingSchema
+from betaboard.db.schema.recording_schema import (
+    RecordingSchema,
+    SensorReadingSchema,
+    PackedSensorReadingsSchema,
+    PlaybackLevelSchema,
+    RecordingAnalysisSchema,
+)
 from betaboard.db.schema.sensor_schema import SensorSchema
+from betaboard.db.schema.job_schema import JobSchema
+from betaboard.db.schema.analytics_schema import (
+    RecordingMetricSummarySchema,
+    RouteAnalyticsSchema,
+    RouteHoldAnalyticsSchema,
+)
 
 __all__ = [
     'BaseSchema',
@@ -12,5 +24,12 @@ __all__ = [
     'RouteSchema',
     'RecordingSchema',
     'SensorReadingSchema',
+    'PackedSensorReadingsSchema',
+    'PlaybackLevelSchema',
+    'RecordingAnalysisSchema',
     'SensorSchema',
+    'JobSchema',
+    'RecordingMetricSummarySchema',
+    'RouteAnalyticsSchema',
+    'RouteHoldAnalyticsSchema',
 ]
\ No newline at end of file
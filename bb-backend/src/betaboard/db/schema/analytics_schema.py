@@ -0,0 +1,68 @@
+import sqlalchemy
+import sqlalchemy.orm
+
+import betaboard.db.schema.base_schema as base_schema
+
+
+class RecordingMetricSummarySchema(base_schema.BaseSchema):
+    __tablename__ = 'recording_metric_summaries'
+
+    recording_id = sqlalchemy.Column(
+        sqlalchemy.Integer,
+        sqlalchemy.ForeignKey('recordings.id'),
+        nullable=False,
+        unique=True
+    )
+    route_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('routes.id'), nullable=False, index=True)
+    active_duration = sqlalchemy.Column(sqlalchemy.Float, nullable=False)
+    peak_load = sqlalchemy.Column(sqlalchemy.Float, nullable=False)
+    energy_expenditure = sqlalchemy.Column(sqlalchemy.Float, nullable=False)
+    overall_stability = sqlalchemy.Column(sqlalchemy.Float, nullable=False)
+    # Usage of each engaged hold, a list of HoldUsageModel dicts
+    hold_usage = sqlalchemy.Column(sqlalchemy.JSON, nullable=False)
+    created_at = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+
+    # Relationships
+    recording = sqlalchemy.orm.relationship('RecordingSchema', back_populates='metric_summary')
+
+
+class RouteAnalyticsSchema(base_schema.BaseSchema):
+    __tablename__ = 'route_analytics'
+
+    route_id = sqlalchemy.Column(
+        sqlalchemy.Integer,
+        sqlalchemy.ForeignKey('routes.id'),
+        nullable=False,
+        unique=True
+    )
+    # Running totals over every summarized recording of the route
+    attempt_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
+    active_duration_sum = sqlalchemy.Column(sqlalchemy.Float, nullable=False, default=0.0)
+    overall_stability_sum = sqlalchemy.Column(sqlalchemy.Float, nullable=False, default=0.0)
+    peak_load = sqlalchemy.Column(sqlalchemy.Float, nullable=False, default=0.0)
+    updated_at = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+
+    # Relationships
+    route = sqlalchemy.orm.relationship('RouteSchema', back_populates='analytics')
+
+
+class RouteHoldAnalyticsSchema(base_schema.BaseSchema):
+    __tablename__ = 'route_hold_analytics'
+    __table_args__ = (
+        sqlalchemy.UniqueConstraint('route_id', 'hold_id'),
+    )
+
+    route_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('routes.id'), nullable=False)
+    hold_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('holds.id'), nullable=False)
+    # Running totals over every summarized recording of the route that engaged the hold
+    attempt_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
+    time_on_hold = sqlalchemy.Column(sqlalchemy.Float, nullable=False, default=0.0)
+    load_sum = sqlalchemy.Column(sqlalchemy.Float, nullable=False, default=0.0)
+    load_frames = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
+    peak_load = sqlalchemy.Column(sqlalchemy.Float, nullable=False, default=0.0)
+    # Engaged frame count per load bin
+    load_histogram = sqlalchemy.Column(sqlalchemy.JSON, nullable=False)
+
+    # Relationships
+    route = sqlalchemy.orm.relationship('RouteSchema', back_populates='hold_analytics')
+    hold = sqlalchemy.orm.relationship('HoldSchema')
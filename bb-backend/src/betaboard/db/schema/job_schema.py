@@ -0,0 +1,35 @@
+import sqlalchemy
+import sqlalchemy.orm
+
+import betaboard.db.schema.base_schema as base_schema
+
+
+class JobSchema(base_schema.BaseSchema):
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        sqlalchemy.Index('ix_jobs_status_run_after', 'status', 'run_after'),
+    )
+
+    kind = sqlalchemy.Column(sqlalchemy.String, nullable=False)
+    payload = sqlalchemy.Column(sqlalchemy.JSON, nullable=False)
+    status = sqlalchemy.Column(
+        sqlalchemy.Enum('queued', 'running', 'completed', 'failed', name='job_status'),
+        nullable=False,
+        default='queued'
+    )
+    attempts = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
+    max_attempts = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+    # Earliest time the job may be claimed, pushed back on retry
+    run_after = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+    last_error = sqlalchemy.Column(sqlalchemy.Text, nullable=True)
+    created_at = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+    updated_at = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+    recording_id = sqlalchemy.Column(
+        sqlalchemy.Integer,
+        sqlalchemy.ForeignKey('recordings.id'),
+        nullable=True,
+        index=True
+    )
+
+    # Relationships
+    recording = sqlalchemy.orm.relationship('RecordingSchema', back_populates='jobs')
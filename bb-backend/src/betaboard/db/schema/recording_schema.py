@@ -19,6 +19,59 @@ class SensorReadingSchema(base_schema.BaseSchema):
     hold = sqlalchemy.orm.relationship('HoldSchema')
 
 
+class PackedSensorReadingsSchema(base_schema.BaseSchema):
+    __tablename__ = 'packed_sensor_readings'
+
+    recording_id = sqlalchemy.Column(
+        sqlalchemy.Integer,
+        sqlalchemy.ForeignKey('recordings.id'),
+        nullable=False,
+        unique=True
+    )
+    frame_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+    # Hold ID of each column in the readings array
+    hold_ids = sqlalchemy.Column(sqlalchemy.JSON, nullable=False)
+    # Frame-major little-endian float32 array of shape (frame_count, len(hold_ids), 2) holding (x, y)
+    readings = sqlalchemy.Column(sqlalchemy.LargeBinary, nullable=False)
+
+    # Relationships
+    recording = sqlalchemy.orm.relationship('RecordingSchema', back_populates='packed_sensor_readings')
+
+
+class PlaybackLevelSchema(base_schema.BaseSchema):
+    __tablename__ = 'playback_levels'
+    __table_args__ = (
+        sqlalchemy.UniqueConstraint('recording_id', 'factor'),
+    )
+
+    recording_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('recordings.id'), nullable=False)
+    factor = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+    bin_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+    # Hold ID of each column in the stats array
+    hold_ids = sqlalchemy.Column(sqlalchemy.JSON, nullable=False)
+    # Bin-major little-endian float32 array of shape (bin_count, len(hold_ids), channels, stats)
+    stats = sqlalchemy.Column(sqlalchemy.LargeBinary, nullable=False)
+
+    # Relationships
+    recording = sqlalchemy.orm.relationship('RecordingSchema', back_populates='playback_levels')
+
+
+class RecordingAnalysisSchema(base_schema.BaseSchema):
+    __tablename__ = 'recording_analyses'
+    __table_args__ = (
+        sqlalchemy.UniqueConstraint('recording_id', 'analysis_version'),
+    )
+
+    recording_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('recordings.id'), nullable=False)
+    analysis_version = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+    # zlib compressed JSON object of analysis results, keyed by output name
+    results = sqlalchemy.Column(sqlalchemy.LargeBinary, nullable=False)
+    updated_at = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+
+    # Relationships
+    recording = sqlalchemy.orm.relationship('RecordingSchema', back_populates='analyses')
+
+
 class RecordingSchema(base_schema.BaseSchema):
     __tablename__ = 'recordings'
 
@@ -27,7 +80,7 @@ class RecordingSchema(base_schema.BaseSchema):
     end_time = sqlalchemy.Column(sqlalchemy.DateTime, nullable=True)
     video_s3_key = sqlalchemy.Column(sqlalchemy.String, nullable=True)
     status = sqlalchemy.Column(
-        sqlalchemy.Enum('recording', 'completed', 'failed', name='recording_status'),
+        sqlalchemy.Enum('recording', 'processing', 'completed', 'failed', name='recording_status'),
         nullable=False,
         default='recording'
     )
@@ -35,3 +88,16 @@ class RecordingSchema(base_schema.BaseSchema):
     # Relationships
     route = sqlalchemy.orm.relationship('RouteSchema', back_populates='recordings')
     sensor_readings = sqlalchemy.orm.relationship('SensorReadingSchema', back_populates='recording')
+    packed_sensor_readings = sqlalchemy.orm.relationship(
+        'PackedSensorReadingsSchema',
+        back_populates='recording',
+        uselist=False
+    )
+    playback_levels = sqlalchemy.orm.relationship('PlaybackLevelSchema', back_populates='recording')
+    analyses = sqlalchemy.orm.relationship('RecordingAnalysisSchema', back_populates='recording')
+    jobs = sqlalchemy.orm.relationship('JobSchema', back_populates='recording')
+    metric_summary = sqlalchemy.orm.relationship(
+        'RecordingMetricSummarySchema',
+        back_populates='recording',
+        uselist=False
+    )
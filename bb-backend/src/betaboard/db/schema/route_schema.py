@@ -24,3 +24,5 @@ class RouteSchema(base_schema.BaseSchema):
     wall = sqlalchemy.orm.relationship('WallSchema', back_populates='routes')
     holds = sqlalchemy.orm.relationship('HoldSchema', secondary=route_holds, back_populates='routes')
     recordings = sqlalchemy.orm.relationship('RecordingSchema', back_populates='route')
+    analytics = sqlalchemy.orm.relationship('RouteAnalyticsSchema', back_populates='route', uselist=False)
+    hold_analytics = sqlalchemy.orm.relationship('RouteHoldAnalyticsSchema', back_populates='route')
@@ -1,11 +1,25 @@
+import typing
+
 import flask
 import marshmallow
 
+import betaboard.business.logic.jobs as jobs
 import betaboard.business.logic.recordings as recordings_logic
 import betaboard.business.logic.recording_analysis.analysis as recording_analysis
+import betaboard.business.logic.recording_analysis.kinematics as kinematics
+import betaboard.business.logic.recording_analysis.playback as playback
+import betaboard.business.models.kinematics as kinematics_model
+import betaboard.utils.responses as responses_utils
 
 recording_bp = flask.Blueprint('recording', __name__)
 
+def _not_completed_error(recordings) -> typing.Optional[typing.Tuple[flask.Response, int]]:
+    """A 409 response if any of the recordings is not completed, so it has no data to analyze yet."""
+    not_completed = [recording.id for recording in recordings if recording.status != 'completed']
+    if not not_completed:
+        return None
+    return flask.jsonify({'error': f"Recordings are not completed yet: {', '.join(not_completed)}"}), 409
+
 
 @recording_bp.route('/recording/start', methods=['POST'])
 def start_recording() -> flask.Response:
@@ -44,7 +58,8 @@ def stop_recording(recording_id: str) -> flask.Response:
         recording_id (str): The ID of the recording to stop.
 
     Returns:
-        Response: JSON response with the completed recording data.
+        Response: JSON response with the stopped recording data, in 'processing' status until its
+            background jobs have stored the video and sensor data.
     """
     try:
         recording_model = recordings_logic.stop_recording(recording_id)
@@ -53,6 +68,184 @@ def stop_recording(recording_id: str) -> flask.Response:
         return flask.jsonify({'error': str(e)}), 404
 
 
+@recording_bp.route('/recording/<recording_id>/jobs', methods=['GET'])
+def get_recording_jobs(recording_id: str) -> flask.Response:
+    """
+    Get the background processing jobs of a recording.
+
+    Args:
+        recording_id (str): The ID of the recording to get the jobs for.
+
+    Returns:
+        Response: JSON response with the recording's jobs, oldest first.
+    """
+    recording_jobs = jobs.get_recording_jobs(recording_id)
+    return flask.jsonify({'jobs': [job.asdict() for job in recording_jobs]}), 200
+
+
+@recording_bp.route('/recording/<recording_id>/readings', methods=['GET'])
+def get_recording_readings(recording_id: str) -> flask.Response:
+    """
+    Get the sensor readings of a recording, optionally only a window of frames.
+
+    Args:
+        recording_id (str): The ID of the recording to get the readings for.
+        start_frame (int): Query parameter, first frame to return (inclusive).
+        end_frame (int): Query parameter, last frame to return (exclusive).
+        holds (str): Query parameter, comma separated hold IDs to return readings for.
+
+    Returns:
+        Response: JSON response with the sensor readings per frame.
+    """
+    class ReadingsQuerySchema(marshmallow.Schema):
+        start_frame = marshmallow.fields.Int(
+            required=False,
+            load_default=None,
+            validate=marshmallow.validate.Range(min=0)
+        )
+        end_frame = marshmallow.fields.Int(
+            required=False,
+            load_default=None,
+            validate=marshmallow.validate.Range(min=0)
+        )
+        holds = marshmallow.fields.Str(required=False, load_default=None)
+
+    try:
+        args = ReadingsQuerySchema().load(flask.request.args)
+    except marshmallow.exceptions.ValidationError as err:
+        return flask.jsonify(err.messages), 400
+
+    hold_ids = None
+    if args['holds'] is not None:
+        hold_ids = [hold_id for hold_id in args['holds'].split(',') if hold_id]
+
+    try:
+        packed_readings = recordings_logic.get_recording_readings(
+            recording_id,
+            start_frame=args['start_frame'],
+            end_frame=args['end_frame'],
+            hold_ids=hold_ids,
+        )
+    except ValueError as e:
+        return flask.jsonify({'error': str(e)}), 404
+
+    return flask.jsonify({
+        'recording_id': recording_id,
+        'start_frame': packed_readings.start_frame,
+        'end_frame': packed_readings.start_frame + packed_readings.frame_count,
+        'sensor_readings': packed_readings.to_frames(),
+    }), 200
+
+
+@recording_bp.route('/recording/<recording_id>/playback', methods=['GET'])
+def get_recording_playback(recording_id: str) -> flask.Response:
+    """
+    Get the hold force playback of a recording at a level of detail.
+
+    Args:
+        recording_id (str): The ID of the recording to get the playback for.
+        factor (int): Query parameter, decimation factor of the level to return.
+        max_points (int): Query parameter, maximum number of points per hold the viewport can
+            use. The finest level that fits is returned. Ignored if factor is given.
+        start_frame (int): Query parameter, first frame of the window (inclusive).
+        end_frame (int): Query parameter, last frame of the window (exclusive).
+
+    Returns:
+        Response: JSON response with min/max/mean playbacks per hold.
+    """
+    class PlaybackQuerySchema(marshmallow.Schema):
+        factor = marshmallow.fields.Int(
+            required=False,
+            load_default=None,
+            validate=marshmallow.validate.Range(min=1)
+        )
+        max_points = marshmallow.fields.Int(
+            required=False,
+            load_default=None,
+            validate=marshmallow.validate.Range(min=1)
+        )
+        start_frame = marshmallow.fields.Int(
+            required=False,
+            load_default=None,
+            validate=marshmallow.validate.Range(min=0)
+        )
+        end_frame = marshmallow.fields.Int(
+            required=False,
+            load_default=None,
+            validate=marshmallow.validate.Range(min=0)
+        )
+
+    try:
+        args = PlaybackQuerySchema().load(flask.request.args)
+    except marshmallow.exceptions.ValidationError as err:
+        return flask.jsonify(err.messages), 400
+
+    try:
+        level = recordings_logic.get_recording_playback(
+            recording_id,
+            factor=args['factor'],
+            max_bins=args['max_points'],
+            start_frame=args['start_frame'],
+            end_frame=args['end_frame'],
+        )
+    except ValueError as e:
+        return flask.jsonify({'error': str(e)}), 404
+
+    return flask.jsonify({
+        'recording_id': recording_id,
+        'factor': level.factor,
+        'start_frame': level.start_bin * level.factor,
+        'playbacks': playback.to_playbacks(level, recordings_logic.SENSOR_FRAME_RATE),
+    }), 200
+
+
+@recording_bp.route('/recording/<recording_id>/kinematics', methods=['GET'])
+def get_recording_kinematics(recording_id: str) -> flask.Response:
+    """
+    Get the pose kinematics of a recording.
+
+    Args:
+        recording_id (str): The ID of the recording to get the kinematics for.
+        format (str): Query parameter, 'dict' (default), 'columnar' or 'binary' JSON, or 'raw' for
+            the binary format's arrays as an octet stream, described by X-Kinematics-* headers.
+
+    Returns:
+        Response: The kinematics in the requested format.
+    """
+    class KinematicsQuerySchema(marshmallow.Schema):
+        format = marshmallow.fields.Str(
+            required=False,
+            load_default='dict',
+            validate=marshmallow.validate.OneOf(kinematics.KINEMATICS_FORMATS + ('raw',))
+        )
+
+    try:
+        args = KinematicsQuerySchema().load(flask.request.args)
+    except marshmallow.exceptions.ValidationError as err:
+        return flask.jsonify(err.messages), 400
+
+    try:
+        recording = recordings_logic.get_recording(recording_id)
+    except ValueError as e:
+        return flask.jsonify({'error': str(e)}), 404
+
+    recording_kinematics = recording_analysis.get_recording_kinematics(recording)
+    if recording_kinematics is None:
+        return flask.jsonify({'error': 'Recording has no video'}), 404
+
+    if args['format'] == 'raw':
+        response = flask.make_response(kinematics.kinematics_to_bytes(recording_kinematics))
+        response.mimetype = 'application/octet-stream'
+        response.headers['X-Kinematics-Shape'] = ','.join(map(str, recording_kinematics.landmarks.shape))
+        response.headers['X-Kinematics-Landmarks'] = ','.join(recording_kinematics.landmark_names)
+        response.headers['X-Kinematics-Fields'] = ','.join(kinematics_model.LANDMARK_FIELDS)
+        response.headers['X-Kinematics-Timestamps-Dtype'] = kinematics.BINARY_TIMESTAMPS_DTYPE.str
+        response.headers['X-Kinematics-Landmarks-Dtype'] = kinematics.BINARY_LANDMARKS_DTYPE.str
+        return response, 200
+
+    return flask.jsonify(kinematics.encode_kinematics(recording_kinematics, args['format'])), 200
+
+
 @recording_bp.route('/recording/<recording_id>/video', methods=['GET'])
 def get_recording_video(recording_id: str) -> flask.Response:
     """
@@ -75,12 +268,24 @@ def analyze_recordings():
 
     Args:
         recording_ids (list[str]): The IDs of the recordings to analyze.
+        outputs (list[str], optional): The results to compute, any of 'kinematics',
+            'visualizations' and 'key_metrics' for each recording, and 'comparison' of the
+            recordings of the first recording's route. Defaults to all of them.
+        kinematics_format (str, optional): Encoding of the kinematics, 'dict' (default),
+            'columnar' or 'binary'.
 
     Returns:
-        Response: JSON response with the analysis results.
+        Response: JSON response with the analysis results, or a 409 response if any recording is
+            not completed yet.
     """
     class AnalysisSchema(marshmallow.Schema):
         recording_ids = marshmallow.fields.List(marshmallow.fields.Str, required=True)
+        outputs = marshmallow.fields.List(
+            marshmallow.fields.Str(validate=marshmallow.validate.OneOf(recording_analysis.ANALYSIS_OUTPUTS)),
+        )
+        kinematics_format = marshmallow.fields.Str(
+            validate=marshmallow.validate.OneOf(kinematics.KINEMATICS_FORMATS)
+        )
 
     try:
         AnalysisSchema().load(flask.request.get_json())
@@ -88,10 +293,82 @@ def analyze_recordings():
         return err.messages, 400
 
     recording_ids = flask.request.get_json().get('recording_ids')
+    outputs = flask.request.get_json().get('outputs')
+    kinematics_format = flask.request.get_json().get('kinematics_format', 'dict')
     recordings = recordings_logic.get_recordings(recording_ids)
+    not_completed = _not_completed_error(recordings)
+    if not_completed is not None:
+        return not_completed
 
-    analysis_results = recording_analysis.analyze_recordings(recordings)
+    try:
+        analysis_results = recording_analysis.analyze_recordings(recordings, outputs, kinematics_format)
+    except ValueError as e:
+        return flask.jsonify({'error': str(e)}), 400
 
     response = flask.jsonify({'analysis_results': analysis_results})
 
     return response, 200
+
+@recording_bp.route('/recording/analysis', methods=['GET'])
+def get_recordings_analysis():
+    """
+    Analyze a list of recordings, as `POST /recording/analysis` with the arguments as query
+    parameters, so that browsers can cache the response.
+
+    The response of completed recordings is given an ETag without analyzing them, and a request
+    whose If-None-Match holds it gets an empty 304 response.
+
+    Args:
+        recording_ids (str): Query parameter, comma separated IDs of the recordings to analyze.
+        outputs (str, optional): Query parameter, comma separated results to compute. Defaults to
+            all of them.
+        kinematics_format (str, optional): Query parameter, encoding of the kinematics, 'dict'
+            (default), 'columnar' or 'binary'.
+
+    Returns:
+        Response: JSON response with the analysis results, or a 409 response if any recording is
+            not completed yet.
+    """
+    class AnalysisQuerySchema(marshmallow.Schema):
+        recording_ids = marshmallow.fields.Str(
+            required=True,
+            validate=marshmallow.validate.Regexp(r'^\d+(,\d+)*$')
+        )
+        outputs = marshmallow.fields.Str(required=False, load_default=None)
+        kinematics_format = marshmallow.fields.Str(
+            required=False,
+            load_default='dict',
+            validate=marshmallow.validate.OneOf(kinematics.KINEMATICS_FORMATS)
+        )
+
+    try:
+        args = AnalysisQuerySchema().load(flask.request.args)
+    except marshmallow.exceptions.ValidationError as err:
+        return flask.jsonify(err.messages), 400
+
+    recording_ids = args['recording_ids'].split(',')
+    outputs = None
+    if args['outputs'] is not None:
+        outputs = [output for output in args['outputs'].split(',') if output]
+        unknown_outputs = set(outputs) - set(recording_analysis.ANALYSIS_OUTPUTS)
+        if unknown_outputs:
+            return flask.jsonify({'outputs': [f"Unknown analysis outputs: {sorted(unknown_outputs)}"]}), 400
+
+    summaries = recordings_logic.get_recording_summaries(recording_ids)
+    not_completed = _not_completed_error(summaries)
+    if not_completed is not None:
+        return not_completed
+
+    etag = recording_analysis.get_analysis_etag(recording_ids, summaries, outputs, args['kinematics_format'])
+    if etag is not None:
+        not_modified = responses_utils.not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+
+    recordings = recordings_logic.get_recordings(recording_ids)
+    try:
+        analysis_results = recording_analysis.analyze_recordings(recordings, outputs, args['kinematics_format'])
+    except ValueError as e:
+        return flask.jsonify({'error': str(e)}), 400
+
+    return flask.jsonify({'analysis_results': analysis_results}), 200
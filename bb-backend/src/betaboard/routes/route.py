@@ -1,13 +1,67 @@
 import flask
+import marshmallow
 
+import betaboard.business.logic.analytics as analytics
 import betaboard.business.logic.route as route
 
 routes_bp = flask.Blueprint('routes', __name__)
 
 @routes_bp.route('/routes/<id>/recordings', methods=['GET'])
 def get_route_recordings(id):
-    recordings = route.get_route_recordings(id)
+    """
+    Get a page of recording summaries for a route, newest first.
+
+    Sensor readings are not included, fetch them per recording from
+    `/recording/<recording_id>/readings`.
+
+    Args:
+        id (str): The ID of the route.
+        limit (int): Query parameter, maximum number of recordings to return.
+        cursor (str): Query parameter, the `next_cursor` of the previous page.
+
+    Returns:
+        Response: JSON response with the recording summaries and the next page cursor.
+    """
+    class RecordingsQuerySchema(marshmallow.Schema):
+        limit = marshmallow.fields.Int(
+            required=False,
+            load_default=50,
+            validate=marshmallow.validate.Range(min=1, max=500)
+        )
+        cursor = marshmallow.fields.Str(
+            required=False,
+            load_default=None,
+            validate=marshmallow.validate.Regexp(r'^\d+$')
+        )
+
+    try:
+        args = RecordingsQuerySchema().load(flask.request.args)
+    except marshmallow.exceptions.ValidationError as err:
+        return flask.jsonify(err.messages), 400
+
+    recordings, next_cursor = route.get_route_recordings(
+        id,
+        limit=args['limit'],
+        cursor=args['cursor'],
+    )
 
     return flask.jsonify({
-        'recordings': [recording.asdict() for recording in recordings]
+        'recordings': [recording.asdict() for recording in recordings],
+        'next_cursor': next_cursor,
     }), 200
+
+@routes_bp.route('/routes/<id>/analytics', methods=['GET'])
+def get_route_analytics(id):
+    """
+    Get the aggregated analytics of every completed attempt of a route.
+
+    Args:
+        id (str): The ID of the route.
+
+    Returns:
+        Response: JSON response with the attempt count, average and peak metrics, and the usage of
+            each hold: attempts, time on hold, average and peak load, load share and load histogram.
+    """
+    route_analytics = analytics.get_route_analytics(id)
+
+    return flask.jsonify(route_analytics.asdict()), 200
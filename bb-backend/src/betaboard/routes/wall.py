@@ -5,12 +5,42 @@ import io
 import flask
 import marshmallow
 import PIL
+import werkzeug.http
 
+import betaboard.business.logic.analytics as analytics_logic
 import betaboard.business.logic.wall as wall_logic
 import betaboard.utils.encoding as encoding_utils
 
 wall_bp = flask.Blueprint('wall', __name__)
 
+def _mask_format() -> str:
+    """
+    The hold mask format requested, one of `encoding_utils.MASK_FORMATS`.
+
+    It is the `mask_format` query parameter, or else the `mask-format` parameter of the Accept
+    header, e.g. `application/json; mask-format=rle`. Defaults to 'list'.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    @flask.after_this_request
+    def vary_on_accept(response):
+        response.vary.add('Accept')
+        return response
+
+    mask_format = flask.request.args.get('mask_format')
+    if mask_format is None:
+        for media_range in flask.request.headers.get('Accept', '').split(','):
+            _, options = werkzeug.http.parse_options_header(media_range)
+            if 'mask-format' in options:
+                mask_format = options['mask-format']
+                break
+
+    mask_format = mask_format or 'list'
+    if mask_format not in encoding_utils.MASK_FORMATS:
+        raise ValueError(f"Unknown mask format: {mask_format}")
+    return mask_format
+
 @wall_bp.route('/wall', methods=['POST'])
 def register_wall():
     class WallSchema(marshmallow.Schema):
@@ -37,16 +67,62 @@ def register_wall():
 
 @wall_bp.route('/wall', methods=['GET'])
 def get_walls():
+    """
+    Get every wall with its holds and routes.
+
+    Args:
+        mask_format (str): Query parameter, format of the hold masks, 'list' (default), 'rle' or
+            'packed'. Also accepted as the `mask-format` parameter of the Accept header.
+
+    Returns:
+        Response: JSON response with the walls.
+    """
+    try:
+        mask_format = _mask_format()
+    except ValueError as err:
+        return flask.jsonify({'error': str(err)}), http.HTTPStatus.BAD_REQUEST
+
     walls = wall_logic.get_walls()
 
     return flask.jsonify({
-        'walls': [wall_model.asdict() for wall_model in walls]
+        'walls': [wall_model.asdict(mask_format) for wall_model in walls]
     }), http.HTTPStatus.OK
 
 @wall_bp.route('/wall/<id>', methods=['GET'])
 def get_wall(id):
+    """
+    Get a wall with its holds and routes.
+
+    Args:
+        id (str): The ID of the wall.
+        mask_format (str): Query parameter, format of the hold masks, 'list' (default), 'rle' or
+            'packed'. Also accepted as the `mask-format` parameter of the Accept header.
+
+    Returns:
+        Response: JSON response with the wall.
+    """
+    try:
+        mask_format = _mask_format()
+    except ValueError as err:
+        return flask.jsonify({'error': str(err)}), http.HTTPStatus.BAD_REQUEST
+
     wall_model = wall_logic.get_wall(id)
-    return flask.jsonify(wall_model.asdict()), http.HTTPStatus.OK
+    return flask.jsonify(wall_model.asdict(mask_format)), http.HTTPStatus.OK
+
+@wall_bp.route('/wall/<id>/analytics', methods=['GET'])
+def get_wall_analytics(id):
+    """
+    Get the aggregated analytics of every completed attempt of every route on a wall.
+
+    Args:
+        id (str): The ID of the wall.
+
+    Returns:
+        Response: JSON response with the wall-wide attempt metrics and hold usage, e.g. for a
+            hold usage heatmap.
+    """
+    wall_analytics = analytics_logic.get_wall_analytics(id)
+    return flask.jsonify(wall_analytics.asdict()), http.HTTPStatus.OK
 
 @wall_bp.route('/wall/<id>/hold', methods=['POST'])
 def add_hold_to_wall(id):
@@ -55,6 +131,11 @@ def add_hold_to_wall(id):
 
     Args:
         id (str): The ID of the wall.
+        bbox (List[int]): The bounding box of the hold.
+        mask: The mask of the hold within its bounding box, in any mask format: rows of 0/1 ints,
+            or an {'format': 'rle' | 'packed', ...} object as the hold responses give.
+        mask_format (str): Query parameter, format of the mask in the response, 'list' (default),
+            'rle' or 'packed'. Also accepted as the `mask-format` parameter of the Accept header.
 
     Returns:
         Response: JSON response with the added hold.
@@ -65,25 +146,27 @@ def add_hold_to_wall(id):
             required=True,
             validate=marshmallow.validate.Length(equal=4)
         )
-        mask = marshmallow.fields.List(
-            marshmallow.fields.List(marshmallow.fields.Int()),
-            required=True
-        )
+        mask = marshmallow.fields.Raw(required=True)
 
     try:
         data = HoldSchema().load(flask.request.get_json())
     except marshmallow.exceptions.ValidationError as err:
         return flask.jsonify(err.messages), http.HTTPStatus.BAD_REQUEST
 
+    try:
+        mask_format = _mask_format()
+        mask = encoding_utils.mask_from_json(data['mask'])
+    except ValueError as err:
+        return flask.jsonify({'error': str(err)}), http.HTTPStatus.BAD_REQUEST
+
     bbox = data['bbox']
-    mask = data['mask']
 
     try:
         hold = wall_logic.add_hold_to_wall(id, bbox, mask)
     except ValueError as err:
         return flask.jsonify({'error': str(err)}), http.HTTPStatus.BAD_REQUEST
 
-    return flask.jsonify(hold.asdict()), http.HTTPStatus.CREATED
+    return flask.jsonify(hold.asdict(mask_format)), http.HTTPStatus.CREATED
 
 @wall_bp.route('/wall/<id>/hold/<hold_id>', methods=['DELETE'])
 def delete_hold_from_wall(id, hold_id):
@@ -122,6 +205,11 @@ def update_wall_image(id):
     except marshmallow.exceptions.ValidationError as err:
         return flask.jsonify(err.messages), 400
 
+    try:
+        mask_format = _mask_format()
+    except ValueError as err:
+        return flask.jsonify({'error': str(err)}), 400
+
     image = data['image']
 
     with encoding_utils.decode_base64_image(image) as image_file:
@@ -129,7 +217,7 @@ def update_wall_image(id):
 
     wall_model = wall_logic.get_wall(id)
 
-    return flask.jsonify(wall_model.asdict()), http.HTTPStatus.OK
+    return flask.jsonify(wall_model.asdict(mask_format)), http.HTTPStatus.OK
 
 @wall_bp.route('/wall/<id>/route', methods=['POST'])
 def add_route_to_wall(id):
@@ -185,6 +273,11 @@ def update_route_on_wall(id: str, route_id: str):
     except marshmallow.exceptions.ValidationError as err:
         return flask.jsonify(err.messages), http.HTTPStatus.BAD_REQUEST
 
+    try:
+        mask_format = _mask_format()
+    except ValueError as err:
+        return flask.jsonify({'error': str(err)}), http.HTTPStatus.BAD_REQUEST
+
     try:
         updated_route = wall_logic.update_route_on_wall(
             wall_id=id,
@@ -194,13 +287,18 @@ def update_route_on_wall(id: str, route_id: str):
     except ValueError as err:
         return flask.jsonify({'error': str(err)}), http.HTTPStatus.NOT_FOUND
 
-    return flask.jsonify(updated_route.asdict()), http.HTTPStatus.OK
+    return flask.jsonify(updated_route.asdict(mask_format)), http.HTTPStatus.OK
 
 @wall_bp.route('/wall/<id>/routes', methods=['GET'])
 def get_routes_for_wall(id):
+    try:
+        mask_format = _mask_format()
+    except ValueError as err:
+        return flask.jsonify({'error': str(err)}), http.HTTPStatus.BAD_REQUEST
+
     try:
         routes = wall_logic.get_routes_for_wall(id)
     except ValueError as err:
         return flask.jsonify({'error': str(err)}), 404
 
-    return flask.jsonify({'routes': [route.asdict() for route in routes]}), http.HTTPStatus.OK
+    return flask.jsonify({'routes': [route.asdict(mask_format) for route in routes]}), http.HTTPStatus.OK
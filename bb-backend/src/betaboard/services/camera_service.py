@@ -41,4 +41,23 @@ class CameraClient(service.Service):
         if response.status_code != 200:
             print(response.text)
         response.raise_for_status()
-        return response.content
\ No newline at end of file
+        return response.content
+
+    def stop_recording_to_file(self, path: str, chunk_size: int = 1024 * 1024) -> None:
+        """
+        Stop recording video on the camera service and stream the recorded video to a file.
+
+        Args:
+            path: Path of the file to write the video to.
+            chunk_size: Number of bytes to read from the response at a time.
+
+        Raises:
+            requests.RequestException: If the camera service request fails.
+        """
+        with requests.post(f"{self.url}/stop_recording", stream=True) as response:
+            if response.status_code != 200:
+                print(response.text)
+            response.raise_for_status()
+            with open(path, 'wb') as video_file:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    video_file.write(chunk)
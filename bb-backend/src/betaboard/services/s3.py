@@ -1,6 +1,11 @@
 import uuid
 import boto3
+import botocore.exceptions
+import errno
 import os
+import shutil
+import tempfile
+import time
 
 from betaboard.services import service
 
@@ -16,6 +21,9 @@ class S3Client(service.Service):
             aws_secret_access_key=app.config['S3']['AWS_SECRET_ACCESS_KEY'],
         )
         self.bucket = app.config['S3']['BUCKET']
+        self.cache_dir = app.config['S3']['CACHE_DIR']
+        self.cache_max_bytes = app.config['S3']['CACHE_MAX_BYTES']
+        self.cache_min_age_seconds = app.config['S3']['CACHE_MIN_AGE_SECONDS']
 
         self.client.put_bucket_cors(
             Bucket=self.bucket,
@@ -64,4 +72,114 @@ class S3Client(service.Service):
 
     def delete_file(self, uuid):
         response = self.client.delete_object(Bucket=self.bucket, Key=uuid)
-        return uuid
\ No newline at end of file
+        return uuid
+
+    def download_file(self, uuid, path):
+        """
+        Stream a file from S3 to disk in chunks, without holding it in memory.
+
+        Args:
+            uuid: The file key in S3.
+            path: Path to write the file to.
+
+        Returns:
+            str: The path written to.
+            None: If file not found.
+        """
+        try:
+            self.client.download_file(self.bucket, uuid, path)
+            return path
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] not in ('404', 'NoSuchKey'):
+                raise
+            print('No such key: ', uuid)
+            return None
+
+    def get_cached_file(self, uuid):
+        """
+        Get the path of a local copy of a file, downloading it into the cache if needed.
+
+        Keys are generated per upload and never overwritten, so a cached copy never goes stale.
+
+        Args:
+            uuid: The file key in S3.
+
+        Returns:
+            str: Path of the cached file.
+            None: If file not found.
+        """
+        path = os.path.join(self.cache_dir, uuid)
+        if os.path.exists(path):
+            # Mark as recently used for pruning
+            os.utime(path)
+            return path
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Download next to the final path so concurrent readers never see a partial file
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix='.part', delete=False) as part_file:
+            part_path = part_file.name
+        try:
+            if self.download_file(uuid, part_path) is None:
+                return None
+            os.replace(part_path, path)
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+        self._prune_cache(keep=path)
+        return path
+
+    def add_to_cache(self, uuid, path):
+        """
+        Move a local file that was uploaded under a key into the cache, saving a later download.
+
+        Args:
+            uuid: The file key in S3.
+            path: Path of the uploaded file, which is moved into the cache atomically.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cached_path = os.path.join(self.cache_dir, uuid)
+        try:
+            os.replace(path, cached_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # Across filesystems, copy next to the final path so readers never see a partial file
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix='.part', delete=False) as part_file:
+                part_path = part_file.name
+            try:
+                shutil.copyfile(path, part_path)
+                os.replace(part_path, cached_path)
+            finally:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+            os.remove(path)
+
+        # Mark as recently used for pruning
+        os.utime(cached_path)
+        self._prune_cache(keep=cached_path)
+
+    def _prune_cache(self, keep):
+        """
+        Delete the least recently used cached files until the cache fits its size limit.
+
+        Files used within `cache_min_age_seconds` are kept, as a job may still be reading them.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith('.part'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        in_use_after = time.time() - self.cache_min_age_seconds
+        total_bytes = sum(size for _, size, _ in entries)
+        for mtime, size, path in sorted(entries):
+            if total_bytes <= self.cache_max_bytes or mtime >= in_use_after:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
@@ -10,6 +10,12 @@ class Config:
         'AWS_ACCESS_KEY_ID': os.environ.get('S3_AWS_ACCESS_KEY_ID'),
         'AWS_SECRET_ACCESS_KEY': os.environ.get('S3_AWS_SECRET_ACCESS_KEY'),
         'BUCKET': os.environ.get('S3_BUCKET'),
+        # Local copies of downloaded files, e.g. videos for kinematics analysis
+        'CACHE_DIR': os.environ.get('S3_CACHE_DIR', '/tmp/betaboard/s3-cache'),
+        'CACHE_MAX_BYTES': int(os.environ.get('S3_CACHE_MAX_BYTES', 10 * 1024 ** 3)),
+        # Files used more recently are kept even over the size limit, as a job may still be
+        # reading them. At least the job lease, as jobs that run longer renew it
+        'CACHE_MIN_AGE_SECONDS': int(os.environ.get('S3_CACHE_MIN_AGE_SECONDS', 30 * 60)),
     }
 
     IMAGE_PROCESSING = {
@@ -23,3 +29,26 @@ class Config:
     CAMERA_SERVICE = {
         'url': os.environ.get('CAMERA_SERVICE_HOST'),
     }
+
+    JOBS = {
+        # Directory shared by the API and job workers to hand over recorded videos
+        'SPOOL_DIR': os.environ.get('JOB_SPOOL_DIR', '/tmp/betaboard/spool'),
+    }
+
+    ANALYSIS = {
+        # Processes of the pool shared by the app's analyses of several recordings, 1 analyzes
+        # them in the calling thread
+        'WORKERS': int(os.environ.get('ANALYSIS_WORKERS', min(2, os.cpu_count() or 1))),
+    }
+
+    KINEMATICS = {
+        # Processes to split long videos across for pose estimation
+        'WORKERS': int(os.environ.get('KINEMATICS_WORKERS', 1)),
+    }
+
+    COMPRESSION = {
+        # Smaller responses are sent uncompressed
+        'MIN_BYTES': int(os.environ.get('COMPRESSION_MIN_BYTES', 1024)),
+        'GZIP_LEVEL': int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6)),
+        'BROTLI_QUALITY': int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5)),
+    }
@@ -1,6 +1,25 @@
 import base64
+import binascii
+import json
 import os
+import struct
 import tempfile
+import typing
+import zlib
+
+import numpy as np
+
+# Binary masks are a version byte, the uint32 little-endian height and width, then the mask's bits
+# packed row-major by np.packbits. Masks were stored as zlib compressed JSON lists of 0/1 ints
+# before, and a zlib stream starts with 0x78.
+MASK_FORMAT_VERSION = 1
+_MASK_HEADER = struct.Struct('<BII')
+_ZLIB_MASK_FIRST_BYTE = 0x78
+
+# Mask formats in JSON: lists of 0/1 int rows, run-length counts, or the binary format in base64
+MASK_FORMATS = ('list', 'rle', 'packed')
+# Largest mask decoded from JSON, as run-length counts can describe any size
+MAX_JSON_MASK_PIXELS = 4096 * 4096
 
 def base64_to_temp_file(image: str) -> tempfile.NamedTemporaryFile:
     """
@@ -58,4 +77,150 @@ def rle_decode(data: str, delimiter: str = '|') -> str:
         decoding.append(char * count)
         i += 1
     
-    return ''.join(decoding)
\ No newline at end of file
+    return ''.join(decoding)
+
+def encode_mask(mask: np.ndarray) -> bytes:
+    """
+    Encodes a 2D boolean mask in the binary mask format.
+
+    Raises:
+        ValueError: If the mask is not 2D.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    if mask.ndim != 2:
+        raise ValueError(f"Mask must be 2D, got shape {mask.shape}")
+    return _MASK_HEADER.pack(MASK_FORMAT_VERSION, *mask.shape) + np.packbits(mask, axis=None).tobytes()
+
+def decode_mask(data: bytes) -> np.ndarray:
+    """
+    Decodes a stored mask, in the binary mask format or in the zlib compressed JSON format before it.
+
+    Only for masks read from the database, as the legacy format is decompressed without a size
+    limit. Masks received from clients are decoded with `decode_packed_mask`.
+
+    Returns:
+        np.ndarray: The (height, width) boolean mask.
+
+    Raises:
+        ValueError: If the mask format version is unknown.
+    """
+    if data[0] == _ZLIB_MASK_FIRST_BYTE:
+        mask = np.array(json.loads(zlib.decompress(data)), dtype=bool)
+        return mask.reshape(0, 0) if mask.size == 0 else mask
+
+    version, height, width = _MASK_HEADER.unpack_from(data)
+    if version != MASK_FORMAT_VERSION:
+        raise ValueError(f"Unknown mask format version {version}")
+    bits = np.frombuffer(data, dtype=np.uint8, offset=_MASK_HEADER.size)
+    if bits.size * 8 < height * width:
+        raise ValueError(f"Mask data is too short for a {height}x{width} mask")
+    return np.unpackbits(bits, count=height * width).reshape(height, width).view(bool)
+
+def decode_packed_mask(data: bytes, shape: typing.Tuple[int, int]) -> np.ndarray:
+    """
+    Strictly decodes a mask in the binary mask format, of a shape known beforehand.
+
+    The header is checked against `shape` before anything is unpacked, and the legacy zlib
+    format is not accepted, so decoding untrusted data costs at most the size of `shape`.
+
+    Raises:
+        ValueError: If the data is not a binary mask of `shape`.
+    """
+    if len(data) < _MASK_HEADER.size:
+        raise ValueError("Mask data is too short for its header")
+    version, height, width = _MASK_HEADER.unpack_from(data)
+    if version != MASK_FORMAT_VERSION:
+        raise ValueError(f"Unknown mask format version {version}")
+    if (height, width) != tuple(shape):
+        raise ValueError(f"Packed mask of shape {[height, width]} does not match its shape {list(shape)}")
+    if len(data) != _MASK_HEADER.size + (height * width + 7) // 8:
+        raise ValueError(f"Mask data has the wrong size for a {height}x{width} mask")
+    bits = np.frombuffer(data, dtype=np.uint8, offset=_MASK_HEADER.size)
+    return np.unpackbits(bits, count=height * width).reshape(height, width).view(bool)
+
+def rle_encode_mask(mask: np.ndarray) -> np.ndarray:
+    """
+    Run-length counts of a mask in row-major order, alternating runs of 0s and 1s.
+
+    The first run is of 0s, so it is empty if the mask starts with a 1.
+    """
+    flat = np.asarray(mask, dtype=bool).ravel()
+    if flat.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    boundaries = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1, [flat.size]))
+    counts = np.diff(boundaries)
+    if flat[0]:
+        counts = np.concatenate(([0], counts))
+    return counts
+
+def rle_decode_mask(counts: typing.Sequence[int], shape: typing.Tuple[int, int]) -> np.ndarray:
+    """
+    Decodes run-length counts made by `rle_encode_mask` into a mask of `shape`.
+
+    Raises:
+        ValueError: If the counts do not cover the shape exactly.
+    """
+    counts = np.asarray(counts, dtype=np.int64).reshape(-1)
+    height, width = shape
+    if (counts < 0).any() or counts.sum() != height * width:
+        raise ValueError(f"Mask run lengths do not add up to a {height}x{width} mask")
+    values = np.arange(len(counts)) % 2 == 1
+    return np.repeat(values, counts).reshape(height, width)
+
+def mask_to_json(mask: np.ndarray, mask_format: str = 'list') -> typing.Any:
+    """
+    Encodes a mask in a JSON mask format, with arrays left to the app's JSON provider.
+
+    Formats:
+        - list: Rows of 0/1 ints.
+        - rle: {'format': 'rle', 'shape': [height, width], 'counts': [...]}, as `rle_encode_mask`.
+        - packed: {'format': 'packed', 'shape': [height, width], 'data': base64}, the binary
+            mask format of `encode_mask`.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if mask_format == 'list':
+        return np.asarray(mask, dtype=bool).view(np.uint8)
+    if mask_format == 'rle':
+        return {'format': 'rle', 'shape': list(mask.shape), 'counts': rle_encode_mask(mask)}
+    if mask_format == 'packed':
+        return {
+            'format': 'packed',
+            'shape': list(mask.shape),
+            'data': base64.b64encode(encode_mask(mask)).decode('ascii'),
+        }
+    raise ValueError(f"Unknown mask format: {mask_format}")
+
+def mask_from_json(encoded: typing.Any) -> np.ndarray:
+    """
+    Decodes a mask in any JSON mask format of `mask_to_json`.
+
+    Raises:
+        ValueError: If the mask is malformed.
+    """
+    if isinstance(encoded, list):
+        if not encoded:
+            return np.zeros((0, 0), dtype=bool)
+        try:
+            mask = np.asarray(encoded)
+        except ValueError:
+            mask = None
+        if mask is None or mask.ndim != 2 or mask.dtype.kind not in 'biu':
+            raise ValueError("Mask must be a list of rows of 0/1 ints")
+        return mask.astype(bool)
+
+    if not isinstance(encoded, dict):
+        raise ValueError("Mask must be a list of rows or an encoded mask object")
+    mask_format = encoded.get('format')
+    if mask_format not in ('rle', 'packed'):
+        raise ValueError(f"Unknown mask format: {mask_format}")
+    try:
+        height, width = (int(size) for size in encoded['shape'])
+        if height < 0 or width < 0 or height * width > MAX_JSON_MASK_PIXELS:
+            raise ValueError(f"Mask of {height}x{width} pixels is too large")
+        if mask_format == 'rle':
+            return rle_decode_mask(encoded['counts'], (height, width))
+        return decode_packed_mask(base64.b64decode(encoded['data'], validate=True), (height, width))
+    except (KeyError, TypeError, binascii.Error) as err:
+        raise ValueError(f"Malformed {mask_format} mask: {err}") from err
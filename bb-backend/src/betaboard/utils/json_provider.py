@@ -0,0 +1,64 @@
+import datetime
+import decimal
+import typing
+import uuid
+
+import flask
+import flask.json.provider
+import numpy as np
+import orjson
+import werkzeug.http
+
+# Numpy arrays and scalars are serialized natively, NaN and infinities as null. Datetimes are
+# passed to `_default` so they keep Flask's HTTP date format.
+OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+def dumps(obj: typing.Any) -> bytes:
+    """
+    Serialize an object to UTF-8 JSON.
+
+    Dataclasses, numpy arrays and numpy scalars are serialized without converting them to Python
+    lists and types first.
+    """
+    return orjson.dumps(obj, default=_default, option=OPTIONS)
+
+def loads(s: typing.Union[str, bytes]) -> typing.Any:
+    """Deserialize JSON."""
+    return orjson.loads(s)
+
+def _default(obj: typing.Any) -> typing.Any:
+    """Convert the objects orjson does not serialize natively."""
+    if isinstance(obj, np.ndarray):
+        # Only C-contiguous arrays of most numeric and bool dtypes are serialized natively
+        if obj.dtype.kind in 'biuf' and not obj.flags.c_contiguous:
+            return np.ascontiguousarray(obj)
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, datetime.date):
+        return werkzeug.http.http_date(obj)
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class OrjsonProvider(flask.json.provider.JSONProvider):
+    """
+    Flask JSON provider serializing with orjson, so responses holding numpy arrays, numpy scalars
+    and dataclasses are serialized directly, as `dumps` does.
+
+    Types serialized by Flask's default provider keep its format. Keys are not sorted.
+    """
+    mimetype = 'application/json'
+
+    def dumps(self, obj: typing.Any, **kwargs: typing.Any) -> str:
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s: typing.Union[str, bytes], **kwargs: typing.Any) -> typing.Any:
+        return loads(s)
+
+    def response(self, *args: typing.Any, **kwargs: typing.Any) -> flask.Response:
+        """Serialize the arguments as `flask.jsonify` does, straight to the response bytes."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
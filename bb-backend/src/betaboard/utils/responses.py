@@ -0,0 +1,92 @@
+import gzip
+import hashlib
+import typing
+
+import flask
+
+try:
+    import brotli
+except ImportError:
+    # Optional, responses are only gzipped without it
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/plain', 'text/html', 'text/csv')
+
+def init_app(app: flask.Flask) -> None:
+    """
+    Adds weak ETags to the app's successful GET responses and compresses its responses.
+
+    An ETag is the one given to `not_modified` by the view, e.g. derived from row versions, or else
+    a hash of the response body. Requests whose If-None-Match holds it get an empty 304 response.
+    ETags identify the uncompressed body, and the same ETag is sent for every content coding, so
+    they are weak: the bodies of different codings are equivalent but not byte for byte equal.
+
+    Responses of COMPRESSIBLE_MIMETYPES are compressed with brotli or gzip, as the request's
+    Accept-Encoding prefers (brotli on ties).
+    """
+    app.after_request(_finalize_response)
+
+def not_modified(etag: str) -> typing.Optional[flask.Response]:
+    """
+    Checks the request against the ETag of the response it would get, known before building it.
+
+    Args:
+        etag: ETag of the response, without quotes. It is sent as a weak ETag.
+
+    Returns:
+        Optional[Response]: A 304 response if the client's copy is current, otherwise None, and
+            the response built is given the ETag.
+    """
+    flask.g.etag = etag
+    if not flask.request.if_none_match.contains_weak(etag):
+        return None
+
+    response = flask.current_app.response_class(status=304)
+    response.set_etag(etag, weak=True)
+    response.cache_control.no_cache = True
+    return response
+
+def _finalize_response(response: flask.Response) -> flask.Response:
+    if response.direct_passthrough or response.is_streamed:
+        return response
+
+    if flask.request.method in ('GET', 'HEAD') and response.status_code == 200:
+        if response.get_etag()[0] is None:
+            response.set_etag(
+                flask.g.get('etag') or hashlib.blake2b(response.get_data(), digest_size=16).hexdigest(),
+                weak=True,
+            )
+        if not response.cache_control:
+            # Cached copies are revalidated on every use, at the cost of a 304 when unchanged
+            response.cache_control.no_cache = True
+        # If-None-Match is compared weakly. Range requests are not served, as ranges of the
+        # uncompressed body do not apply to the compressed one
+        response.make_conditional(flask.request, accept_ranges=False)
+        if response.status_code == 304:
+            return response
+
+    _compress(response)
+    return response
+
+def _compress(response: flask.Response) -> None:
+    """Compresses the response body in the encoding the request prefers, if any."""
+    if response.status_code in (204, 304) or response.status_code < 200 \
+            or 'Content-Encoding' in response.headers \
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return
+
+    response.vary.add('Accept-Encoding')
+    config = flask.current_app.config['COMPRESSION']
+    data = response.get_data()
+    if len(data) < config['MIN_BYTES']:
+        return
+
+    encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+    encoding = flask.request.accept_encodings.best_match(encodings)
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=config['BROTLI_QUALITY']))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(data, compresslevel=config['GZIP_LEVEL'], mtime=0))
+    else:
+        return
+    response.headers['Content-Encoding'] = encoding
@@ -0,0 +1,48 @@
+"""
+Background job worker.
+
+Runs queued jobs, such as the processing of stopped recordings, until interrupted. Any number of
+workers can run alongside the API against the same database.
+
+Usage:
+    PYTHONPATH=src python -m betaboard.worker [--kinds KIND ...] [--backfill-analytics] [--backfill-playback]
+"""
+import argparse
+
+import betaboard.app as app_module
+import betaboard.business.logic.analytics as analytics
+import betaboard.business.logic.jobs as jobs
+import betaboard.business.logic.recordings as recordings_logic
+
+# Registers the job handlers
+import betaboard.business.logic.recording_analysis.analysis
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--kinds', nargs='+', help='Only run jobs of these kinds')
+    parser.add_argument('--poll-interval', type=float, default=jobs.POLL_INTERVAL)
+    parser.add_argument(
+        '--backfill-analytics',
+        action='store_true',
+        help='First queue the analysis of completed recordings missing from the route analytics',
+    )
+    parser.add_argument(
+        '--backfill-playback',
+        action='store_true',
+        help='First queue building the playback pyramid of recordings ingested without one',
+    )
+    args = parser.parse_args()
+
+    # Handlers use the app's services, e.g. S3
+    app = app_module.create_app()
+    with app.app_context():
+        if args.backfill_analytics:
+            print(f"Queued {analytics.enqueue_missing_summaries()} recordings for analytics")
+        if args.backfill_playback:
+            print(f"Queued {recordings_logic.enqueue_missing_playbacks()} recordings for playback")
+        jobs.run_worker(kinds=args.kinds, poll_interval=args.poll_interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -23,6 +23,16 @@ const POSE_CONNECTIONS = [
   ['right_knee', 'right_ankle'],
 ];
 
+type VisiblePoseLandmark = PoseLandmark & { x: number; y: number };
+
+// Frames cover the whole timeline, with null fields where no pose was detected
+const isVisible = (point: PoseLandmark | undefined): point is VisiblePoseLandmark => (
+  point !== undefined
+  && point.x !== null
+  && point.y !== null
+  && (point.visible ?? (point.visibility !== null && point.visibility >= 0.5))
+);
+
 const KinematicsOverlay: React.FC = () => {
   const { 
     isPlaying,
@@ -44,11 +54,9 @@ const KinematicsOverlay: React.FC = () => {
         {POSE_CONNECTIONS.map(([start, end], index) => {
           const startPoint = landmarks[start];
           const endPoint = landmarks[end];
-          
-          if (!startPoint || !endPoint) return null;
-          
+
           // Only draw if both points are reasonably visible
-          if (startPoint.visibility < 0.5 || endPoint.visibility < 0.5) return null;
+          if (!isVisible(startPoint) || !isVisible(endPoint)) return null;
 
           return (
             <line
@@ -66,7 +74,7 @@ const KinematicsOverlay: React.FC = () => {
 
         {/* Draw landmarks (joints) */}
         {Object.entries(landmarks).map(([name, point]) => {
-          if (point.visibility < 0.5) return null;
+          if (!isVisible(point)) return null;
 
           return (
             <circle
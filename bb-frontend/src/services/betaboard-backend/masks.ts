@@ -0,0 +1,60 @@
+import { Hold, Route, Wall } from '../../types';
+
+// Hold masks as sent with mask_format=rle: row-major run lengths, alternating runs of
+// unmasked and masked pixels, starting with unmasked
+export interface RleMask {
+  format: 'rle';
+  shape: [number, number];
+  counts: number[];
+}
+
+type RleHold = Omit<Hold, 'mask'> & { mask: RleMask };
+type RleRoute = Omit<Route, 'holds'> & { holds: RleHold[] };
+type RleWall = Omit<Wall, 'holds' | 'routes'> & { holds: RleHold[]; routes: RleRoute[] };
+
+export const MASK_FORMAT_PARAMS = { mask_format: 'rle' };
+
+export const decodeRleMask = ({ shape: [height, width], counts }: RleMask): boolean[][] => {
+  const flat = new Array<boolean>(height * width);
+  let offset = 0;
+  counts.forEach((count, index) => {
+    flat.fill(index % 2 === 1, offset, offset + count);
+    offset += count;
+  });
+
+  const mask: boolean[][] = [];
+  for (let y = 0; y < height; y++) {
+    mask.push(flat.slice(y * width, (y + 1) * width));
+  }
+  return mask;
+};
+
+export const encodeRleMask = (mask: boolean[][]): RleMask => {
+  const height = mask.length;
+  const width = height ? mask[0].length : 0;
+  const counts: number[] = [];
+  let value = false;
+  let count = 0;
+  mask.forEach((row) => row.forEach((cell) => {
+    if (Boolean(cell) !== value) {
+      counts.push(count);
+      value = !value;
+      count = 0;
+    }
+    count++;
+  }));
+  if (height * width) {
+    counts.push(count);
+  }
+  return { format: 'rle', shape: [height, width], counts };
+};
+
+export const decodeHold = (hold: RleHold): Hold => ({ ...hold, mask: decodeRleMask(hold.mask) });
+
+export const decodeRoute = (route: RleRoute): Route => ({ ...route, holds: route.holds.map(decodeHold) });
+
+export const decodeWall = (wall: RleWall): Wall => ({
+  ...wall,
+  holds: wall.holds.map(decodeHold),
+  routes: wall.routes.map(decodeRoute),
+});
@@ -1,4 +1,5 @@
 import API from './api';
+import { MASK_FORMAT_PARAMS, decodeRoute, decodeWall, encodeRleMask } from './masks';
 import { Wall, Route, Recording, AnalysisData } from '../../types';
 
 export type CreateRouteBody = {
@@ -11,13 +12,13 @@ export type CreateRouteBody = {
 
 export const wallQueries = {
   getWalls: async (): Promise<Wall[]> => {
-    const response = await API.get('/wall');
-    return response.data.walls;
+    const response = await API.get('/wall', { params: MASK_FORMAT_PARAMS });
+    return response.data.walls.map(decodeWall);
   },
   
   getWall: async (id: string): Promise<Wall> => {
-    const response = await API.get(`/wall/${id}`);
-    return response.data;
+    const response = await API.get(`/wall/${id}`, { params: MASK_FORMAT_PARAMS });
+    return decodeWall(response.data);
   },
 
   deleteHold: async (wallId: string, holdId: string): Promise<void> => {
@@ -28,18 +29,14 @@ export const wallQueries = {
     wallId: string,
     holdData: { bbox: number[]; mask: boolean[][] }
   ): Promise<void> => {
-    const tempfix = {
-      ...holdData,
-      mask: holdData.mask.map((row) => row.map((cell) => cell ? 1 : 0)),
-    };
-    await API.post(`/wall/${wallId}/hold`, tempfix);
+    await API.post(`/wall/${wallId}/hold`, { ...holdData, mask: encodeRleMask(holdData.mask) });
   },
 };
 
 export const routeQueries = {
   getRoutes: async (wallId: string): Promise<Route[]> => {
-    const response = await API.get(`/wall/${wallId}/routes`);
-    return response.data.routes;
+    const response = await API.get(`/wall/${wallId}/routes`, { params: MASK_FORMAT_PARAMS });
+    return response.data.routes.map(decodeRoute);
   },
   
   createRoute: async ({ wallId, routeData }: { wallId: string; routeData: CreateRouteBody }): Promise<Route> => {
@@ -66,10 +63,23 @@ export const routeQueries = {
   },
 };
 
+// Largest page the backend serves
+const RECORDINGS_PAGE_SIZE = 500;
+
 export const recordingQueries = {
   getRecordings: async (routeId: string): Promise<Recording[]> => {
-    const response = await API.get(`/routes/${routeId}/recordings`);
-    return response.data.recordings;
+    // The recordings are paged, newest first, so follow the cursor to the last page
+    const recordings: Recording[] = [];
+    let cursor: string | null = null;
+    do {
+      const response: { data: { recordings: Recording[]; next_cursor: string | null } } = await API.get(
+        `/routes/${routeId}/recordings`,
+        { params: { limit: RECORDINGS_PAGE_SIZE, ...(cursor ? { cursor } : {}) } },
+      );
+      recordings.push(...response.data.recordings);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return recordings;
   },
   
   startRecording: async (routeId: string): Promise<Recording> => {
@@ -83,7 +93,10 @@ export const recordingQueries = {
   },
   
   getAnalysis: async (recordingIds: string[]): Promise<AnalysisData> => {
-    const response = await API.post('/recording/analysis', { recording_ids: recordingIds });
+    // GET, so the browser revalidates its cached copy with the ETag instead of fetching it again
+    const response = await API.get('/recording/analysis', {
+      params: { recording_ids: recordingIds.join(',') },
+    });
     return response.data.analysis_results;
   },
 
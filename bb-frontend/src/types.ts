@@ -67,9 +67,9 @@ export interface Recording {
   route_id: string;
   start_time: string;
   end_time: string | null;
-  sensor_readings: SensorReadingFrame[];
+  sensor_readings?: SensorReadingFrame[];
   video_s3_key: string | null;
-  status: 'recording' | 'completed' | 'failed';
+  status: 'recording' | 'processing' | 'completed' | 'failed';
 }
 
 export interface VisualizationData {
@@ -95,13 +95,30 @@ export interface AnalysisData {
     key_metrics: KeyMetrics;
   };
   recordings: RecordingAnalysis[];
-  comparison: {
-    ai_summary: string;
-    visualizations: {
-      load_time_series: VisualizationData;
-      load_distribution: VisualizationData;
-    };
-  };
+  comparison: RecordingComparison | null;
+}
+
+export interface HoldComparison {
+  hold_id: string;
+  hold_number: number | null;
+  reference_engaged: boolean;
+  engaged: boolean;
+  engage_time_delta: number | null;
+  peak_load_delta: number;
+  stability_delta: number | null;
+  aligned_load_delta: number;
+}
+
+export interface AttemptComparison {
+  recording_id: string;
+  duration_delta: number | null;
+  alignment_cost: number | null;
+  holds: HoldComparison[];
+}
+
+export interface RecordingComparison {
+  reference_recording_id: string;
+  attempts: AttemptComparison[];
 }
 
 export interface KeyMetrics {
@@ -123,11 +140,14 @@ export interface DrawnData {
   mask: boolean[][];
 }
 
+// Fields are null in frames without a detected pose
 export interface PoseLandmark {
-  x: number;
-  y: number;
-  z: number;
-  visibility: number;
+  x: number | null;
+  y: number | null;
+  z: number | null;
+  visibility: number | null;
+  // Set once post-processed, false for missing or low-visibility landmarks
+  visible?: boolean;
 }
 
 export interface KinematicsFrame {